@@ -0,0 +1,166 @@
+"""
+Description: Defines the AccountAgeIndex class, which keeps investment accounts sorted by
+creation date so that management fee eligibility for any date is a binary search and a slice.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from bank_account.investment_account import InvestmentAccount
+from patterns.strategy.management_fee_strategy import ManagementFeeStrategy
+
+class AccountAgeIndex:
+    """
+    Description:
+        The `AccountAgeIndex` class keeps investment accounts in order of creation date. An
+        account is charged the management fee on a date when it was created before
+        ManagementFeeStrategy.ten_years_before that date, so the accounts charged on any date
+        are a prefix of the index, found with one binary search.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, accounts=()) -> None:
+        """
+        Description:
+            Initializes the index with the investment accounts among `accounts`. Other
+            account types are ignored, as they are never charged a management fee.
+
+        Args:
+            accounts (iterable, optional): Bank accounts to index.
+        """
+        investment_accounts = sorted((account for account in accounts if isinstance(account, InvestmentAccount)),
+                                     key=self.__sort_key)
+        self.__keys = [self.__sort_key(account) for account in investment_accounts]
+        self.__accounts = investment_accounts
+
+    @staticmethod
+    def __sort_key(account: InvestmentAccount) -> tuple:
+        """
+        Returns the position of an account in the index: by creation date, then account number.
+
+        Args:
+            account (InvestmentAccount): The account.
+
+        Returns:
+            tuple: The sort key.
+        """
+        return (account.date_created, account.account_number)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of indexed accounts.
+        """
+        return len(self.__accounts)
+
+    def __iter__(self):
+        """
+        Iterates over the indexed accounts, oldest first.
+        """
+        return iter(self.__accounts)
+
+    def add(self, account: InvestmentAccount) -> None:
+        """
+        Adds an account to the index.
+
+        Args:
+            account (InvestmentAccount): The account.
+
+        Raises:
+            TypeError: If the account is not an InvestmentAccount.
+        """
+        if not isinstance(account, InvestmentAccount):
+            raise TypeError("Only investment accounts can be indexed by age.")
+        key = self.__sort_key(account)
+        position = bisect_right(self.__keys, key)
+        self.__keys.insert(position, key)
+        self.__accounts.insert(position, account)
+
+    def remove(self, account: InvestmentAccount) -> None:
+        """
+        Removes an account from the index.
+
+        Args:
+            account (InvestmentAccount): The account.
+
+        Raises:
+            ValueError: If the account is not in the index.
+        """
+        key = self.__sort_key(account)
+        position = bisect_left(self.__keys, key)
+        while position < len(self.__keys) and self.__keys[position] == key:
+            if self.__accounts[position] is account:
+                del self.__keys[position]
+                del self.__accounts[position]
+                return
+            position += 1
+        raise ValueError(f"Account {account.account_number} is not in the index.")
+
+    def __count_created_before(self, cutoff: date) -> int:
+        """
+        Returns the number of indexed accounts created before a date.
+
+        Args:
+            cutoff (date): The date.
+
+        Returns:
+            int: The number of accounts, which are the first in the index.
+        """
+        return bisect_left(self.__keys, (cutoff,))
+
+    def fee_charged(self, as_of: date = None) -> list:
+        """
+        Returns the accounts which are charged the management fee on a date.
+
+        Args:
+            as_of (date, optional): The date. Defaults to today.
+
+        Returns:
+            list: The accounts older than ten years on `as_of`, oldest first.
+        """
+        return self.__accounts[:self.__count_created_before(ManagementFeeStrategy.ten_years_before(as_of))]
+
+    def fee_waived(self, as_of: date = None) -> list:
+        """
+        Returns the accounts which are not charged the management fee on a date.
+
+        Args:
+            as_of (date, optional): The date. Defaults to today.
+
+        Returns:
+            list: The accounts not older than ten years on `as_of`, oldest first.
+        """
+        return self.__accounts[self.__count_created_before(ManagementFeeStrategy.ten_years_before(as_of)):]
+
+    def becoming_charged(self, start: date, end: date) -> list:
+        """
+        Returns the accounts which cross the ten-year mark between two dates: those
+        charged the management fee on `end` but not on `start`.
+
+        Args:
+            start (date): The first date.
+            end (date): The second date.
+
+        Returns:
+            list: The accounts, oldest first.
+        """
+        begin = self.__count_created_before(ManagementFeeStrategy.ten_years_before(start))
+        finish = self.__count_created_before(ManagementFeeStrategy.ten_years_before(end))
+        return self.__accounts[begin:finish]
+
+    def becoming_charged_in_month(self, year: int, month: int) -> list:
+        """
+        Returns the accounts which cross the ten-year mark during a month: those charged
+        the management fee on its last day but not on the day before it began.
+
+        Args:
+            year (int): The year.
+            month (int): The month (1-12).
+
+        Returns:
+            list: The accounts, oldest first.
+        """
+        first_day = date(year, month, 1)
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return self.becoming_charged(first_day - timedelta(days=1), next_month - timedelta(days=1))
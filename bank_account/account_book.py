@@ -0,0 +1,458 @@
+"""
+Description: Defines the AccountBook class, a columnar (structure-of-arrays) store of bank
+accounts backed by NumPy arrays, for applying balance operations to many accounts at once.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from datetime import date
+import numpy as np
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.strategy.batch_service_charges import (management_fee_charges, management_fee_charges_cents,
+                                                     minimum_balance_charges, minimum_balance_charges_cents,
+                                                     overdraft_charges, overdraft_charges_cents)
+from utility.money import to_cents_array
+
+class AccountBook:
+    """
+    Description:
+        The `AccountBook` class stores the state of many bank accounts as parallel NumPy arrays,
+        one element per account. Deposits and withdrawals for many accounts are applied as single
+        array operations rather than one `BankAccount` method call at a time. Books are created
+        from existing `BankAccount` objects with `from_accounts` and converted back with
+        `to_accounts` (or copied back into existing objects with `store_balances`).
+
+        Strategy parameters which do not apply to an account type are stored as NaN. The
+        parameters are the accounts' own (such as ChequingAccount.overdraft_limit), so a book of
+        accounts which were given a fee schedule's strategies still records them; charge such a
+        book with `get_scheduled_charges`.
+
+        A book built from accounts which store cents (see BankAccount.USE_CENTS) keeps its
+        balances in the int64 column `balances_cents`, so that deposits, withdrawals and totals
+        are exact; `balances` then returns them in dollars. Other books keep float64 balances
+        and `balances_cents` is None.
+
+    Attributes:
+        CHEQUING (int): The type code of ChequingAccount.
+        SAVINGS (int): The type code of SavingsAccount.
+        INVESTMENT (int): The type code of InvestmentAccount.
+        TYPE_CLASSES (tuple): The account class of each type code.
+    """
+    CHEQUING = 0
+    SAVINGS = 1
+    INVESTMENT = 2
+    TYPE_CLASSES = (ChequingAccount, SavingsAccount, InvestmentAccount)
+
+    def __init__(self, account_numbers, client_numbers, balances, type_codes, dates_created,
+                 overdraft_limits=None, overdraft_rates=None, minimum_balances=None,
+                 management_fees=None, account_holders=None, balances_cents=None) -> None:
+        """
+        Description:
+            Initializes an AccountBook from column arrays of equal length.
+
+        Args:
+            account_numbers (array-like): The account numbers.
+            client_numbers (array-like): The client numbers.
+            balances (array-like): The balances. Ignored if balances_cents is given.
+            type_codes (array-like): The account type codes (CHEQUING, SAVINGS or INVESTMENT).
+            dates_created (array-like): The account creation dates.
+            overdraft_limits (array-like, optional): Chequing overdraft limits (NaN for other types).
+            overdraft_rates (array-like, optional): Chequing overdraft rates (NaN for other types).
+            minimum_balances (array-like, optional): Savings minimum balances (NaN for other types).
+            management_fees (array-like, optional): Investment management fees (NaN for other types).
+            account_holders (sequence, optional): The account holder names (None if unknown).
+            balances_cents (array-like, optional): The balances in cents, for a book which stores cents.
+
+        Raises:
+            ValueError: If the columns differ in length or a type code is unknown.
+        """
+        self.account_numbers = np.asarray(account_numbers, dtype=np.int64)
+        size = len(self.account_numbers)
+
+        def column(values, dtype, fill):
+            if values is None:
+                return np.full(size, fill, dtype=dtype)
+            return np.asarray(values, dtype=dtype)
+
+        self.client_numbers = column(client_numbers, np.int64, 0)
+        if balances_cents is not None:
+            self.balances_cents = np.asarray(balances_cents, dtype=np.int64)
+            self.__balances = None
+        else:
+            self.balances_cents = None
+            self.__balances = column(balances, np.float64, 0.0)
+        self.type_codes = column(type_codes, np.int8, 0)
+        self.dates_created = column(dates_created, 'datetime64[D]', 'NaT')
+        self.overdraft_limits = column(overdraft_limits, np.float64, np.nan)
+        self.overdraft_rates = column(overdraft_rates, np.float64, np.nan)
+        self.minimum_balances = column(minimum_balances, np.float64, np.nan)
+        self.management_fees = column(management_fees, np.float64, np.nan)
+        self.account_holders = column(account_holders, object, None)
+
+        balance_column = 'balances' if self.balances_cents is None else 'balances_cents'
+        for name in ('client_numbers', balance_column, 'type_codes', 'dates_created', 'overdraft_limits',
+                     'overdraft_rates', 'minimum_balances', 'management_fees', 'account_holders'):
+            if getattr(self, name).shape != (size,):
+                raise ValueError(f"Column {name} must have one value per account.")
+
+        if size and (self.type_codes.min() < 0 or self.type_codes.max() >= len(self.TYPE_CLASSES)):
+            raise ValueError("Unknown account type code.")
+
+        self.__positions = None
+
+    @property
+    def balances(self) -> np.ndarray:
+        """
+        Returns the balances in dollars. For a book which stores cents this is a new array
+        computed from balances_cents, so changes to it do not change the book.
+
+        Returns:
+            ndarray: The balance of each account (float64), in book order.
+        """
+        if self.balances_cents is not None:
+            return self.balances_cents / 100.0
+        return self.__balances
+
+    @property
+    def uses_cents(self) -> bool:
+        """
+        Returns whether the book stores its balances in cents.
+
+        Returns:
+            bool: True if the balances are stored in balances_cents.
+        """
+        return self.balances_cents is not None
+
+    @classmethod
+    def from_accounts(cls, accounts) -> "AccountBook":
+        """
+        Creates an AccountBook from BankAccount objects. If every account stores its balance in
+        cents, so does the book.
+
+        Args:
+            accounts (iterable): ChequingAccount, SavingsAccount and InvestmentAccount objects.
+
+        Returns:
+            AccountBook: A book holding one element per account, in iteration order.
+
+        Raises:
+            TypeError: If an account is not one of the supported account types.
+        """
+        columns = {name: [] for name in ('account_numbers', 'client_numbers', 'balances', 'type_codes',
+                                         'dates_created', 'overdraft_limits', 'overdraft_rates',
+                                         'minimum_balances', 'management_fees', 'account_holders')}
+        balances_cents = []
+
+        for account in accounts:
+            type_code = cls.type_code(account)
+            columns['account_numbers'].append(account.account_number)
+            columns['client_numbers'].append(account.client_number)
+            columns['balances'].append(account.balance)
+            if balances_cents is not None:
+                if account.uses_cents:
+                    balances_cents.append(account.balance_cents)
+                else:
+                    balances_cents = None
+            columns['type_codes'].append(type_code)
+            columns['dates_created'].append(account.date_created)
+            columns['account_holders'].append(account.account_holder)
+            columns['overdraft_limits'].append(account.overdraft_limit if type_code == cls.CHEQUING else np.nan)
+            columns['overdraft_rates'].append(account.overdraft_rate if type_code == cls.CHEQUING else np.nan)
+            columns['minimum_balances'].append(account.minimum_balance if type_code == cls.SAVINGS else np.nan)
+            columns['management_fees'].append(account.management_fee if type_code == cls.INVESTMENT else np.nan)
+
+        if not balances_cents:
+            balances_cents = None
+        return cls(**columns, balances_cents=balances_cents)
+
+    @classmethod
+    def type_code(cls, account: BankAccount) -> int:
+        """
+        Returns the type code of an account.
+
+        Args:
+            account (BankAccount): The account.
+
+        Returns:
+            int: The account's type code.
+
+        Raises:
+            TypeError: If the account is not one of the supported account types.
+        """
+        for type_code, account_class in enumerate(cls.TYPE_CLASSES):
+            if isinstance(account, account_class):
+                return type_code
+        raise TypeError(f"Unsupported account type: {type(account).__name__}")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of accounts in the book.
+        """
+        return len(self.account_numbers)
+
+    def to_accounts(self) -> list:
+        """
+        Creates BankAccount objects from the book.
+
+        Returns:
+            list: One ChequingAccount, SavingsAccount or InvestmentAccount per element, in book order.
+        """
+        accounts = []
+        dates_created = self.dates_created.astype(object)
+        balances = self.balances
+
+        for index in range(len(self)):
+            account_number = int(self.account_numbers[index])
+            client_number = int(self.client_numbers[index])
+            balance = float(balances[index])
+            date_created = dates_created[index] if isinstance(dates_created[index], date) else None
+            type_code = self.type_codes[index]
+
+            if type_code == self.CHEQUING:
+                account = ChequingAccount(account_number, client_number, self.account_holders[index], balance,
+                                          float(self.overdraft_limits[index]), float(self.overdraft_rates[index]),
+                                          date_created)
+            elif type_code == self.SAVINGS:
+                account = SavingsAccount(account_number, client_number, balance, date_created,
+                                         float(self.minimum_balances[index]))
+            else:
+                account = InvestmentAccount(account_number, client_number, balance, date_created,
+                                            float(self.management_fees[index]))
+            accounts.append(account)
+
+        return accounts
+
+    def get_service_charges(self, as_of=None) -> np.ndarray:
+        """
+        Calculates the service charge of every account in the book, with one vectorized
+        expression per account type. The results are identical to each account's
+        get_service_charges while it has its type's built-in strategy.
+
+        Args:
+            as_of (date, optional): The date on which account ages are determined. Defaults to today.
+
+        Returns:
+            ndarray: The service charge of each account, in book order.
+        """
+        charges = np.empty(len(self), dtype=np.float64)
+        balances = self.balances
+
+        mask = self.type_codes == self.CHEQUING
+        charges[mask] = overdraft_charges(balances[mask], self.overdraft_limits[mask],
+                                          self.overdraft_rates[mask])
+        mask = self.type_codes == self.SAVINGS
+        charges[mask] = minimum_balance_charges(balances[mask], self.minimum_balances[mask])
+        mask = self.type_codes == self.INVESTMENT
+        charges[mask] = management_fee_charges(self.dates_created[mask], self.management_fees[mask], as_of)
+
+        return charges
+
+    def get_scheduled_charges(self, schedule, as_of=None) -> np.ndarray:
+        """
+        Calculates the service charge of every account in the book by a fee schedule, with
+        one vectorized evaluation per account type. The accounts' own strategy parameters
+        are not used.
+
+        Args:
+            schedule (FeeSchedule): The compiled fee schedule.
+            as_of (date, optional): The date on which account ages are determined. Defaults to today.
+
+        Returns:
+            ndarray: The service charge of each account, in book order.
+
+        Raises:
+            ValueError: If the schedule has no rule for an account type in the book.
+        """
+        charges = np.empty(len(self), dtype=np.float64)
+        balances = self.balances
+
+        for type_code, account_class in enumerate(self.TYPE_CLASSES):
+            mask = self.type_codes == type_code
+            if mask.any():
+                charges[mask] = schedule.rule(account_class).charges(balances[mask], self.dates_created[mask],
+                                                                      as_of)
+
+        return charges
+
+    def get_service_charges_cents(self, as_of=None) -> np.ndarray:
+        """
+        Calculates the service charge of every account in the book in cents, with exact integer
+        arithmetic. The results are identical to each account's get_service_charges_cents
+        while it has its type's built-in strategy.
+
+        Args:
+            as_of (date, optional): The date on which account ages are determined. Defaults to today.
+
+        Returns:
+            ndarray: The service charge of each account in cents (int64), in book order.
+        """
+        charges = np.empty(len(self), dtype=np.int64)
+        balances = self.get_balances_cents()
+
+        mask = self.type_codes == self.CHEQUING
+        charges[mask] = overdraft_charges_cents(balances[mask], self.overdraft_limits[mask],
+                                                self.overdraft_rates[mask])
+        mask = self.type_codes == self.SAVINGS
+        charges[mask] = minimum_balance_charges_cents(balances[mask], self.minimum_balances[mask])
+        mask = self.type_codes == self.INVESTMENT
+        charges[mask] = management_fee_charges_cents(self.dates_created[mask], self.management_fees[mask], as_of)
+
+        return charges
+
+    def get_balances_cents(self) -> np.ndarray:
+        """
+        Returns the balances in cents. For a book which does not store cents, the balances are
+        rounded to whole cents, which is exact for balances which are whole numbers of cents.
+
+        Returns:
+            ndarray: The balance of each account in cents (int64), in book order.
+        """
+        if self.balances_cents is not None:
+            return self.balances_cents.copy()
+        return to_cents_array(self.__balances)
+
+    def total_balance_cents(self, indices=None) -> int:
+        """
+        Returns the exact total of the balances in cents.
+
+        Args:
+            indices (array-like, optional): The book indices of the accounts to total. Defaults to all accounts.
+
+        Returns:
+            int: The total balance in cents.
+        """
+        balances = self.balances_cents if self.balances_cents is not None else self.get_balances_cents()
+        if indices is not None:
+            balances = balances[np.asarray(indices, dtype=np.intp)]
+        return int(balances.sum())
+
+    def store_balances(self, accounts) -> None:
+        """
+        Copies the book's balances into existing BankAccount objects with the same account numbers.
+        Accounts which are not in the book are left unchanged.
+
+        Args:
+            accounts (iterable): The BankAccount objects to update.
+        """
+        positions = self.__get_positions()
+        for account in accounts:
+            index = positions.get(account.account_number)
+            if index is not None:
+                if self.balances_cents is not None:
+                    account.balance_cents = int(self.balances_cents[index])
+                else:
+                    account.balance = float(self.__balances[index])
+
+    def indices_of(self, account_numbers) -> np.ndarray:
+        """
+        Returns the book indices of accounts.
+
+        Args:
+            account_numbers (iterable): The account numbers to look up.
+
+        Returns:
+            ndarray: The index of each account number.
+
+        Raises:
+            KeyError: If an account number is not in the book.
+        """
+        positions = self.__get_positions()
+        return np.fromiter((positions[int(number)] for number in account_numbers), dtype=np.intp)
+
+    def __get_positions(self) -> dict:
+        """
+        Returns a dictionary mapping account numbers to book indices, building it on first use.
+
+        Returns:
+            dict: The index of each account number.
+        """
+        if self.__positions is None:
+            self.__positions = {int(number): index for index, number in enumerate(self.account_numbers)}
+        return self.__positions
+
+    def __transaction_arrays(self, indices, amounts, message: str):
+        """
+        Validates the indices and amounts of a batch of transactions.
+
+        Args:
+            indices (array-like): The book index of each transaction's account.
+            amounts (array-like): The amount of each transaction.
+            message (str): The error message if an amount is not positive.
+
+        Returns:
+            tuple: The indices and amounts as arrays. For a book which stores cents, the amounts
+            are in cents (int64).
+
+        Raises:
+            ValueError: If the arrays differ in length, an index is out of range or an amount is not
+                        positive (for a book which stores cents, if it is less than half a cent).
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=np.float64)
+
+        if indices.shape != amounts.shape or indices.ndim != 1:
+            raise ValueError("Indices and amounts must be one-dimensional and of equal length.")
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise ValueError("Account index out of range.")
+        # As with BankAccount.deposit and withdraw, a book which stores cents checks the amounts
+        # in cents, so that an amount which rounds to no cents is rejected.
+        if self.balances_cents is not None and np.all(np.isfinite(amounts)):
+            amounts = to_cents_array(amounts)
+        if not np.all(amounts > 0):
+            raise ValueError(message)
+
+        return indices, amounts
+
+    def apply_deposits(self, indices, amounts) -> None:
+        """
+        Deposits amounts into accounts. An account may appear more than once; its deposits are
+        applied in order. No deposit is applied unless all are valid.
+
+        Args:
+            indices (array-like): The book index of each deposit's account.
+            amounts (array-like): The amount of each deposit.
+
+        Raises:
+            ValueError: If the arrays differ in length, an index is out of range or an amount is not positive.
+        """
+        indices, amounts = self.__transaction_arrays(indices, amounts, "Deposit amount must be positive")
+        np.add.at(self.__balance_column(), indices, amounts)
+
+    def apply_withdrawals(self, indices, amounts) -> None:
+        """
+        Withdraws amounts from accounts. An account may appear more than once; its withdrawals
+        are applied in order. As with BankAccount.withdraw, an account's balance may not go below
+        zero. No withdrawal is applied unless all are valid.
+
+        Args:
+            indices (array-like): The book index of each withdrawal's account.
+            amounts (array-like): The amount of each withdrawal.
+
+        Raises:
+            ValueError: If the arrays differ in length, an index is out of range, an amount is not
+                        positive or an account has insufficient funds.
+        """
+        indices, amounts = self.__transaction_arrays(indices, amounts, "Withdrawal amount must be positive")
+
+        # Withdrawals only reduce a balance, so each one is covered if and only if the account's
+        # balance after all of them is not negative.
+        remaining = self.__balance_column().copy()
+        np.subtract.at(remaining, indices, amounts)
+        if np.any(remaining[indices] < 0):
+            raise ValueError("Insufficient funds")
+
+        if self.balances_cents is not None:
+            self.balances_cents = remaining
+        else:
+            self.__balances = remaining
+
+    def __balance_column(self) -> np.ndarray:
+        """
+        Returns the column the balances are stored in.
+
+        Returns:
+            ndarray: balances_cents for a book which stores cents, otherwise the float64 balances.
+        """
+        return self.balances_cents if self.balances_cents is not None else self.__balances
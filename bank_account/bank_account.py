@@ -5,8 +5,12 @@ Author: Jashanpreet Kaur Jattana
 
 from abc import ABC, abstractmethod
 from datetime import date
+from functools import lru_cache
+import math
 from patterns.strategy.service_charge_strategy import ServiceChargeStrategy
+from patterns.observer.event_bus import LARGE_TRANSACTION, LOW_BALANCE, NOTIFICATION, default_bus
 from patterns.observer.subject import Subject
+from utility.money import from_cents, to_cents
 
 class BankAccount(Subject, ABC):
     """
@@ -15,10 +19,28 @@ class BankAccount(Subject, ABC):
 
     Attributes:
         LOW_BALANCE_LEVEL (float): The threshold below which a balance is considered low.
+        LOW_BALANCE_HYSTERESIS (float): How far above LOW_BALANCE_LEVEL a balance must recover before another
+                                        low balance warning can be sent.
+        LOW_BALANCE_EDGE_TRIGGERED (bool): When True, a low balance warning is sent when the balance falls below
+                                           LOW_BALANCE_LEVEL, not again on each transaction while it stays low.
+                                           When False, every transaction which leaves the balance low sends one.
         LARGE_TRANSACTION_THRESHOLD (float): The threshold for large transactions that will trigger notifications.
+        USE_CENTS (bool): When True, accounts created afterwards store their balance as a whole number of
+                          cents, so that deposits, withdrawals and balance updates are exact. The `balance`
+                          property still reads and writes dollars.
+        EVENT_BUS (EventBus): The event bus accounts publish their notifications to. Observers attached to
+                              an account are subscribed to its events on this bus, so accounts hold no
+                              observer lists of their own.
     """
     LOW_BALANCE_LEVEL = 50.00
+    LOW_BALANCE_HYSTERESIS = 25.00
+    LOW_BALANCE_EDGE_TRIGGERED = True
     LARGE_TRANSACTION_THRESHOLD = 10000.00
+    USE_CENTS = False
+    EVENT_BUS = default_bus
+
+    __slots__ = ('account_number', 'client_number', 'account_holder', '__balance', '__in_cents',
+                 '__low_balance_alerted', 'service_charge_strategy', '_date_created')
     
     def __init__(self, account_number, client_number, account_holder, balance, service_charge_strategy: ServiceChargeStrategy, date_created=None):
         """
@@ -30,7 +52,8 @@ class BankAccount(Subject, ABC):
             account_holder (str): The name of the account holder.
             balance (float): The balance of the bank account.
             service_charge_strategy (ServiceChargeStrategy): A ServiceChargeStrategy instance for calculating service charges.
-            date_created (date, optional): The date the account was created (defaults to today's date if not provided).
+            date_created (date or str, optional): The date the account was created, as a date or a 'YYYY-MM-DD' string
+                (defaults to today's date if not provided or invalid).
         
         Returns:
             None
@@ -39,21 +62,196 @@ class BankAccount(Subject, ABC):
             TypeError: If `date_created` is not of type `date`.
         """
         super().__init__()   # Initialize subject
+        self.__in_cents = self.USE_CENTS
+        self.__low_balance_alerted = False
         self.account_number = account_number
         self.client_number = client_number
         self.account_holder = account_holder
         self.balance = balance
         self.service_charge_strategy = service_charge_strategy  # Using strategy pattern for service charges
         
-        # Validate the date_created argument. 
+        # Validate the date_created argument (a date, or a string in 'YYYY-MM-DD' format). 
+        if isinstance(date_created, str):
+            try:
+                date_created = date.fromisoformat(date_created)
+            except ValueError:
+                date_created = None
         self._date_created = date_created if isinstance(date_created, date) else date.today()
 
-    def get_service_charges(self):
+    @property
+    def balance(self):
         """
-        Calculate and return the service charges using the associated ServiceChargeStrategy.
+        Return the balance of the account in dollars.
+
+        Args:
+            None
+
+        Returns:
+            float: The balance of the account.
+
+        Raises:
+            None
+        """
+        return from_cents(self.__balance) if self.__in_cents else self.__balance
+
+    @balance.setter
+    def balance(self, value):
+        """
+        Set the balance of the account in dollars. Accounts which store cents round the value to the nearest cent.
+
+        Args:
+            value (float): The new balance.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the account stores cents and the value is not a number.
+        """
+        self.__balance = to_cents(value) if self.__in_cents else value
+
+    @property
+    def balance_cents(self):
+        """
+        Return the balance of the account as a whole number of cents. This is exact for accounts which store cents.
+
+        Args:
+            None
+
+        Returns:
+            int: The balance of the account in cents.
+
+        Raises:
+            ValueError: If the balance is not a number.
+        """
+        return self.__balance if self.__in_cents else to_cents(self.__balance)
+
+    @balance_cents.setter
+    def balance_cents(self, cents):
+        """
+        Set the balance of the account from a whole number of cents.
+
+        Args:
+            cents (int): The new balance in cents.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.__balance = int(cents) if self.__in_cents else from_cents(cents)
+
+    @property
+    def uses_cents(self):
+        """
+        Return whether the account stores its balance as a whole number of cents.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if the balance is stored in cents.
+
+        Raises:
+            None
+        """
+        return self.__in_cents
+
+    @property
+    def date_created(self):
+        """
+        Return the date the account was created.
+
+        Args:
+            None
+
+        Returns:
+            date: The date the account was created.
+
+        Raises:
+            None
+        """
+        return self._date_created
+
+    def attach(self, observer):
+        """
+        Subscribe an observer to the events of this account on EVENT_BUS.
+
+        Args:
+            observer (Observer): The observer to be added.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.EVENT_BUS.subscribe(observer, account_number=self.account_number)
+
+    def detach(self, observer):
+        """
+        Unsubscribe an observer from the events of this account on EVENT_BUS, if it is subscribed.
+
+        Args:
+            observer (Observer): The observer to be removed.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.EVENT_BUS.unsubscribe(observer, account_number=self.account_number)
+
+    def notify(self, message, event_type=NOTIFICATION):
+        """
+        Publish an event of this account on EVENT_BUS, to the observers subscribed to this account,
+        to its client's accounts or to every account.
+
+        Args:
+            message (str): The message to send to the observers.
+            event_type (str, optional): The event type (see patterns.observer.event_bus).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.EVENT_BUS.publish(event_type, message, self.account_number, self.client_number)
+
+    def snapshot(self):
+        """
+        Return an independent copy of the account, such as for editing in a details window. Only the
+        account's own fields are copied; its strategy, dates and strings are immutable and are shared.
+        Unlike copy.deepcopy, the cost does not depend on the observers subscribed to the account.
+        Observers are subscribed by account number, so events of the copy reach the same observers.
 
         Args:
             None
+
+        Returns:
+            BankAccount: A copy of the account, of the same class.
+
+        Raises:
+            None
+        """
+        clone = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            try:
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            object.__setattr__(clone, name, value)
+        return clone
+
+    def get_service_charges(self, as_of: date = None):
+        """
+        Calculate and return the service charges using the associated ServiceChargeStrategy.
+
+        Args:
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
         
         Returns:
             float: The calculated service charges based on the strategy.
@@ -61,7 +259,22 @@ class BankAccount(Subject, ABC):
         Raises:
             None
         """
-        return self.service_charge_strategy.calculate_service_charges(self)
+        return self.service_charge_strategy.calculate_service_charges(self, as_of)
+
+    def get_service_charges_cents(self, as_of: date = None):
+        """
+        Calculate and return the service charges in cents using the associated ServiceChargeStrategy.
+
+        Args:
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+        
+        Returns:
+            int: The calculated service charges in cents, rounded to the nearest cent.
+        
+        Raises:
+            None
+        """
+        return self.service_charge_strategy.calculate_service_charges_cents(self, as_of)
     
     def update_balance(self, amount):
         """
@@ -76,15 +289,96 @@ class BankAccount(Subject, ABC):
         Raises:
             None
         """
-        self.balance += amount
+        if self.__in_cents:
+            self.__balance += to_cents(amount)
+        else:
+            self.__balance += amount
 
         # Check for low balance
-        if self.balance < self.LOW_BALANCE_LEVEL:
-            self.notify(f"Low balance warning ${self.balance:.2f}: on account {self.account_number}.")
+        self.__check_low_balance()
 
         # Check for large transaction
         if abs(amount) > self.LARGE_TRANSACTION_THRESHOLD:
-            self.notify(f"Large transaction ${amount:.2f}: on account {self.account_number}.")
+            self.notify(f"Large transaction ${amount:.2f}: on account {self.account_number}.", LARGE_TRANSACTION)
+
+    def apply_transactions(self, amounts):
+        """
+        Apply a sequence of balance updates, as update_balance would one at a time, in a single pass.
+        Every amount is validated before any is applied. Observers receive at most one low-balance
+        notification (if the final balance is below LOW_BALANCE_LEVEL and no warning has been sent
+        since the balance was last above it) and at most one notification summarizing the large
+        transactions in the batch.
+
+        Args:
+            amounts (iterable): The amounts to add to the balance (positive for deposits, negative for withdrawals).
+
+        Returns:
+            int: The number of transactions applied.
+
+        Raises:
+            ValueError: If an amount is not a finite number. No amount is applied.
+        """
+        balance = self.__balance
+        count = 0
+        large_count = 0
+        large_total = 0
+        # A balance which passes the re-arm level during the batch re-arms the low balance warning,
+        # as it would have between calls to update_balance.
+        rearm_level = self.LOW_BALANCE_LEVEL + self.LOW_BALANCE_HYSTERESIS
+        if self.__in_cents:
+            rearm_level = to_cents(rearm_level)
+        rearmed = False
+
+        for amount in amounts:
+            if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount):
+                raise ValueError(f"Transaction amount must be a number: {amount!r}")
+            balance += to_cents(amount) if self.__in_cents else amount
+            count += 1
+            if balance >= rearm_level:
+                rearmed = True
+            if abs(amount) > self.LARGE_TRANSACTION_THRESHOLD:
+                large_count += 1
+                large_total += amount
+
+        self.__balance = balance
+        if rearmed:
+            self.__low_balance_alerted = False
+
+        # Check for low balance
+        self.__check_low_balance()
+
+        # Check for large transactions
+        if large_count == 1:
+            self.notify(f"Large transaction ${large_total:.2f}: on account {self.account_number}.", LARGE_TRANSACTION)
+        elif large_count > 1:
+            self.notify(f"{large_count} large transactions totalling ${large_total:.2f}: "
+                        f"on account {self.account_number}.", LARGE_TRANSACTION)
+
+        return count
+
+    def __check_low_balance(self, send=True):
+        """
+        Send a low balance warning if the balance is below LOW_BALANCE_LEVEL. With LOW_BALANCE_EDGE_TRIGGERED,
+        the warning is only sent when the balance falls below the level: it is re-armed once the balance
+        recovers to LOW_BALANCE_LEVEL + LOW_BALANCE_HYSTERESIS, so a balance hovering around the level does
+        not send a warning on every transaction.
+
+        Args:
+            send (bool, optional): False to only re-arm the warning, for changes which do not notify.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        balance = self.balance
+        if balance < self.LOW_BALANCE_LEVEL:
+            if send and not (self.LOW_BALANCE_EDGE_TRIGGERED and self.__low_balance_alerted):
+                self.__low_balance_alerted = True
+                self.notify(f"Low balance warning ${balance:.2f}: on account {self.account_number}.", LOW_BALANCE)
+        elif balance >= self.LOW_BALANCE_LEVEL + self.LOW_BALANCE_HYSTERESIS:
+            self.__low_balance_alerted = False
 
     def deposit(self, amount):
         """
@@ -97,10 +391,16 @@ class BankAccount(Subject, ABC):
             None
         
         Raises:
-            ValueError: If the deposit amount is not positive.
+            ValueError: If the deposit amount is not positive (for accounts which store cents, if it
+                        is less than half a cent).
         """
+        # Accounts which store cents check the amount they would add, so that an amount which
+        # rounds to no cents is rejected rather than ignored.
+        if self.__in_cents:
+            amount = to_cents(amount)
         if amount > 0:
-            self.balance += amount
+            self.__balance += amount
+            self.__check_low_balance(send=False)
         else:
             raise ValueError("Deposit amount must be positive")
 
@@ -115,11 +415,14 @@ class BankAccount(Subject, ABC):
             None
         
         Raises:
-            ValueError: If the withdrawal amount is not positive or if there are insufficient funds.
+            ValueError: If the withdrawal amount is not positive (for accounts which store cents, if it
+                        is less than half a cent) or if there are insufficient funds.
         """
+        if self.__in_cents:
+            amount = to_cents(amount)
         if amount > 0:
-            if self.balance >= amount:
-                self.balance -= amount
+            if self.__balance >= amount:
+                self.__balance -= amount
             else:
                 raise ValueError("Insufficient funds")
         else:
@@ -163,4 +466,24 @@ class BankAccount(Subject, ABC):
         }
 
 
+@lru_cache(maxsize=None)
+def _slot_names(account_class) -> tuple:
+    """
+    Return the attribute names of the slots of a class and its base classes, with private names mangled.
+
+    Args:
+        account_class (type): The class.
 
+    Returns:
+        tuple: The attribute names.
+    """
+    names = []
+    for cls in account_class.__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot in ('__dict__', '__weakref__'):
+                continue
+            if slot.startswith('__') and not slot.endswith('__'):
+                slot = f"_{cls.__name__.lstrip('_')}{slot}"
+            names.append(slot)
+    return tuple(names)
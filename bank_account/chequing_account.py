@@ -5,7 +5,7 @@ Author: Jashanpreet Kaur Jattana
 
 from datetime import date
 from bank_account.bank_account import BankAccount  
-from patterns.strategy.overdraft_strategy import OverdraftStrategy  # Import the OverdraftStrategy
+from patterns.strategy.strategy_factory import overdraft_strategy as shared_overdraft_strategy
 
 class ChequingAccount(BankAccount):
     """
@@ -22,6 +22,8 @@ class ChequingAccount(BankAccount):
 
     BASE_SERVICE_CHARGE = 0.50 
 
+    __slots__ = ('__date_created', '__overdraft_strategy')
+
     def __init__(self, account_number, client_number, account_holder, initial_balance=500.0, overdraft_limit=1000, overdraft_rate=0.05, date_created=None):
         """
         Initializes a new ChequingAccount instance.
@@ -53,15 +55,15 @@ class ChequingAccount(BankAccount):
         except (ValueError, TypeError):
             overdraft_rate = 0.05
 
-        # Create an OverdraftStrategy instance
-        overdraft_strategy = OverdraftStrategy(overdraft_limit, overdraft_rate)
+        # Use the shared OverdraftStrategy instance for these parameters
+        overdraft_strategy = shared_overdraft_strategy(overdraft_limit, overdraft_rate)
 
         # Initialize the superclass with service_charge_strategy
         super().__init__(account_number, client_number, account_holder, initial_balance, overdraft_strategy)
 
-        # Set additional attributes
-        self.__overdraft_limit = overdraft_limit
-        self.__overdraft_rate = overdraft_rate
+        # The overdraft terms stay with the account when another service charge strategy
+        # (such as a fee schedule's) is assigned to it.
+        self.__overdraft_strategy = overdraft_strategy
 
         # Validate and set date_created
         if date_created is None:
@@ -88,7 +90,7 @@ class ChequingAccount(BankAccount):
         Returns:
             float: The overdraft limit for the account.
         """
-        return self.__overdraft_limit
+        return self.__overdraft_strategy.overdraft_limit
 
     @property
     def overdraft_rate(self):
@@ -101,7 +103,7 @@ class ChequingAccount(BankAccount):
         Returns:
             float: The overdraft interest rate for the account.
         """
-        return self.__overdraft_rate
+        return self.__overdraft_strategy.overdraft_rate
 
     @property
     def date_created(self):
@@ -130,19 +132,19 @@ class ChequingAccount(BankAccount):
                 f"Client Number: {self.client_number}\n"
                 f"Account Holder: {self.account_holder}\n"
                 f"Balance: ${self.balance:.2f}\n"
-                f"Overdraft Limit: ${self.__overdraft_limit:.2f}\n"
-                f"Overdraft Rate: {self.__overdraft_rate * 100:.2f}%\n"
+                f"Overdraft Limit: ${self.overdraft_limit:.2f}\n"
+                f"Overdraft Rate: {self.overdraft_rate * 100:.2f}%\n"
                 f"Date Created: {self.__date_created.strftime('%Y-%m-%d')}\n"
                 f"Account Type: Chequing")
 
-    def get_service_charges(self):
+    def get_service_charges(self, as_of: date = None):
         """
         Calculate the service charges using the OverdraftStrategy instance.
         
         Args:
-            None
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
 
         Returns:
             float: The calculated service charges based on the overdraft limit and rate.
         """
-        return self.__overdraft_strategy.calculate_service_charges(self)
+        return self.service_charge_strategy.calculate_service_charges(self, as_of)
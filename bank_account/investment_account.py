@@ -5,7 +5,7 @@ Author: Jashanpreet Kaur Jattana
 
 from datetime import date
 from bank_account.bank_account import BankAccount
-from patterns.strategy.management_fee_strategy import ManagementFeeStrategy  
+from patterns.strategy.strategy_factory import management_fee_strategy
 
 class InvestmentAccount(BankAccount):
     """
@@ -23,6 +23,8 @@ class InvestmentAccount(BankAccount):
     MANAGEMENT_FEE = 0.50        
     WAIVED_FEE = 0               
 
+    __slots__ = ('_balance', 'management_fee', '__management_fee_strategy')
+
     def __init__(self, account_number: int, client_number: int, balance: float, date_created: date, management_fee: float = WAIVED_FEE):
         """
         Initializes an InvestmentAccount object.
@@ -41,17 +43,18 @@ class InvestmentAccount(BankAccount):
             ValueError: If the management fee is negative.
         """
         self._balance = float(balance)
-        self._date_created = date_created
         
         if not isinstance(management_fee, (int, float)) or management_fee < 0:
             raise ValueError("Management fee cannot be negative.")
         
-        super().__init__(account_number, client_number, self._balance, self._date_created)
+        # The strategy needs the validated creation date, so it is set after the superclass is initialized.
+        super().__init__(account_number, client_number, None, self._balance, None, date_created)
 
         self.management_fee = management_fee  
 
         # Define a private attribute for ManagementFeeStrategy
-        self.__management_fee_strategy = ManagementFeeStrategy(date_created, management_fee)
+        self.__management_fee_strategy = management_fee_strategy(self._date_created, management_fee)
+        self.service_charge_strategy = self.__management_fee_strategy
 
     @property
     def date_created(self):
@@ -66,29 +69,42 @@ class InvestmentAccount(BankAccount):
         """
         return self._date_created
 
-    def get_service_charges(self) -> float:
+    def get_service_charges(self, as_of: date = None) -> float:
         """
-        Calculate the service charges using ManagementFeeStrategy.
+        Calculate the service charges using the account's service charge strategy, which is its
+        ManagementFeeStrategy unless another strategy (such as a fee schedule's) was assigned.
 
         Args:
-            None
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
 
         Returns:
             float: The calculated service charges.
         """
-        return self.__management_fee_strategy.calculate_service_charges(self)
+        return self.service_charge_strategy.calculate_service_charges(self, as_of)
+
+    def get_service_charges_cents(self, as_of: date = None) -> int:
+        """
+        Calculate the service charges in cents using the account's service charge strategy.
+
+        Args:
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        return self.service_charge_strategy.calculate_service_charges_cents(self, as_of)
 
-    def calculate_account_age(self) -> int:
+    def calculate_account_age(self, as_of: date = None) -> int:
         """
         Calculates the age of the account in years.
 
         Args:
-            None
+            as_of (date, optional): The date on which the age is determined. Defaults to today.
 
         Returns:
             int: The age of the account in years.
         """
-        age = (date.today() - self._date_created).days // 365
+        age = ((as_of or date.today()) - self._date_created).days // 365
         return age
 
     def __str__(self) -> str:
@@ -5,7 +5,7 @@ Author: Jashanpreet Kaur Jattana
 
 from datetime import date
 from bank_account.bank_account import BankAccount
-from patterns.strategy.minimun_balance_strategy import MinimumBalanceStrategy 
+from patterns.strategy.strategy_factory import minimum_balance_strategy
 
 class SavingsAccount(BankAccount):
     """
@@ -16,6 +16,7 @@ class SavingsAccount(BankAccount):
     Attributes:
         None 
     """
+    __slots__ = ('__minimum_balance_strategy',)
 
     def __init__(self, account_number: int, client_number: int, balance: float, date_created: date, minimum_balance: float):
         """
@@ -32,26 +33,41 @@ class SavingsAccount(BankAccount):
             None
         """
 
-        service_charge_strategy = MinimumBalanceStrategy(minimum_balance)
+        service_charge_strategy = minimum_balance_strategy(minimum_balance)
 
-        super().__init__(account_number, client_number, balance, date_created, service_charge_strategy)
+        super().__init__(account_number, client_number, None, balance, service_charge_strategy, date_created)
         
         self.balance = float(balance)  # Ensure balance is a float
 
         # Define a private attribute for MinimumBalanceStrategy
         self.__minimum_balance_strategy =  service_charge_strategy
 
-    def get_service_charges(self) -> float:
+    @property
+    def minimum_balance(self) -> float:
         """
-        Calculate the service charges for the account.
+        Returns the minimum balance of the account. It is kept when another service charge
+        strategy (such as a fee schedule's) is assigned to the account.
 
         Args:
             None
 
+        Returns:
+            float: The minimum balance required to avoid extra service charges.
+        """
+        return self.__minimum_balance_strategy.minimum_balance
+
+    def get_service_charges(self, as_of: date = None) -> float:
+        """
+        Calculate the service charges for the account using its service charge strategy, which
+        is its MinimumBalanceStrategy unless another strategy was assigned.
+
+        Args:
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
         Returns:
             float: The calculated service charge.
         """
-        return self.__minimum_balance_strategy.calculate_service_charges(self)
+        return self.service_charge_strategy.calculate_service_charges(self, as_of)
 
     def __str__(self) -> str:
         """
@@ -67,6 +83,6 @@ class SavingsAccount(BankAccount):
         return (
             f"Account Number: {self.account_number} "
             f"Balance: ${self.balance:.2f}\n"  
-            f"Minimum Balance: ${self.__minimum_balance_strategy:.2f} "
+            f"Minimum Balance: ${self.minimum_balance:.2f} "
             f"Account Type: Savings"
         )
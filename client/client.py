@@ -4,7 +4,7 @@ Author: Jashanpreet Kaur Jattana
 """
 
 from datetime import datetime
-from email_validator import EmailNotValidError, validate_email
+from client.email_validation import validate_email_address
 from patterns.observer.observer import Observer
 from utility.file_utils import simulate_send_email
 
@@ -18,6 +18,8 @@ class Client:
     Attributes:
         None 
     """
+    __slots__ = ('__client_number', '__first_name', '__last_name', '__email_address')
+
     def __init__(self, client_number, first_name, last_name, email_address):
         """
         Description:
@@ -28,11 +30,11 @@ class Client:
             client_number (int): The unique identifier for the client.
             first_name (str): The client's first name. Cannot be blank.
             last_name (str): The client's last name. Cannot be blank.
-            email_address (str): The client's email address. Validates format and assigns it.
+            email_address (str): The client's email address. Validates format and assigns it. Validation
+                                 is cached and, by default, syntax-only (see client.email_validation).
 
         Raises:
             ValueError: If client number is not an integer, or if first/last name is blank.
-            EmailNotValidError: If the provided email address is invalid.
         """
         # Validate client_number
         if type(client_number) != int:  
@@ -52,12 +54,32 @@ class Client:
         self.__last_name = last_name
         
         # Validate email_address
-        try:
-            valid = validate_email(email_address)
-            self.__email_address = valid.email
-        except EmailNotValidError:
-            self.__email_address = email_address
+        valid_email_address = validate_email_address(email_address)
+        self.__email_address = valid_email_address if valid_email_address is not None else email_address
     
+    @classmethod
+    def from_validated(cls, client_number, first_name, last_name, email_address):
+        """
+        Description:
+            Creates a `Client` from attribute values which have already been validated, such as
+            values read back from a data snapshot, without repeating the validation.
+
+        Args:
+            client_number (int): The unique identifier for the client.
+            first_name (str): The client's validated first name.
+            last_name (str): The client's validated last name.
+            email_address (str): The client's validated email address.
+
+        Returns:
+            Client: The client.
+        """
+        client = cls.__new__(cls)
+        client.__client_number = client_number
+        client.__first_name = first_name
+        client.__last_name = last_name
+        client.__email_address = email_address
+        return client
+
     # Property for client_number
     @property
     def client_number(self):
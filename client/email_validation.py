@@ -0,0 +1,101 @@
+"""
+Description: Cached email address validation for Client objects, with an offline
+(syntax-only) mode and a bulk path which validates many addresses at once.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from email_validator import EmailNotValidError, validate_email
+
+# When False (the default) addresses are only checked for valid syntax, which
+# needs no network access. When True the domain is also checked with DNS
+# queries, as email_validator does by default.
+CHECK_DELIVERABILITY = False
+
+# The number of distinct addresses whose validation results are remembered.
+CACHE_SIZE = 1_000_000
+
+# The number of threads used by validate_many when deliverability is checked.
+DELIVERABILITY_WORKERS = 16
+
+def cache_key(email_address: str) -> str:
+    """
+    Returns the key under which an address's validation result is cached: the address
+    without surrounding whitespace and with its domain in lower case.
+
+    Args:
+        email_address (str): The email address.
+
+    Returns:
+        str: The cache key.
+    """
+    email_address = email_address.strip()
+    local_part, separator, domain = email_address.rpartition('@')
+    if not separator:
+        return email_address
+    return f"{local_part}@{domain.lower()}"
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _validate(key: str, check_deliverability: bool):
+    """
+    Validates a normalized address. Results (including failures) are cached.
+
+    Args:
+        key (str): The address, as returned by cache_key.
+        check_deliverability (bool): Whether to check the domain with DNS queries.
+
+    Returns:
+        str: The normalized address, or None if it is not valid.
+    """
+    try:
+        return validate_email(key, check_deliverability=check_deliverability).normalized
+    except EmailNotValidError:
+        return None
+
+def validate_email_address(email_address: str):
+    """
+    Validates an email address, using the cached result if it has been validated before.
+
+    Args:
+        email_address (str): The email address.
+
+    Returns:
+        str: The normalized address, or None if it is not valid.
+    """
+    if not isinstance(email_address, str):
+        return None
+    return _validate(cache_key(email_address), CHECK_DELIVERABILITY)
+
+def validate_many(email_addresses, max_workers: int = None) -> dict:
+    """
+    Validates many email addresses, filling the cache so that Client objects created
+    afterwards do not wait on validation. Each distinct address is validated once.
+
+    Args:
+        email_addresses (iterable): The email addresses.
+        max_workers (int, optional): The number of threads to validate with. Defaults to
+            DELIVERABILITY_WORKERS when deliverability is checked (the DNS queries wait on the
+            network) and to 1 otherwise (syntax checks are CPU bound, so threads do not help).
+
+    Returns:
+        dict: Maps each address to its normalized address, or None if it is not valid.
+    """
+    addresses = list(dict.fromkeys(email_addresses))
+
+    if max_workers is None:
+        max_workers = DELIVERABILITY_WORKERS if CHECK_DELIVERABILITY else 1
+
+    if max_workers > 1 and len(addresses) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(validate_email_address, addresses))
+    else:
+        results = [validate_email_address(address) for address in addresses]
+
+    return dict(zip(addresses, results))
+
+def clear_cache() -> None:
+    """
+    Forgets all cached validation results.
+    """
+    _validate.cache_clear()
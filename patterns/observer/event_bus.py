@@ -0,0 +1,239 @@
+"""
+Description: A central event bus for account notifications. Subscriptions are indexed by
+account number, client number and event type, so publishing an event looks up only the
+subscriptions which can match it, and subscribing or unsubscribing is a dictionary operation
+rather than a search of a per-account observer list. Accounts without subscribers cost nothing.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import threading
+from .observer import Observer
+
+# Event types published by bank accounts.
+LOW_BALANCE = 'low_balance'
+LARGE_TRANSACTION = 'large_transaction'
+NOTIFICATION = 'notification'
+
+# Subscription scopes.
+ACCOUNT = 'account'
+CLIENT = 'client'
+ALL = 'all'
+
+class EventBus:
+    """
+    Description:
+        The `EventBus` class delivers events to the observers subscribed to them. An observer
+        subscribes to the events of one account, of every account of one client, or of every
+        account, optionally limited to one event type. An observer which matches an event
+        through more than one subscription receives it once.
+
+        Observers must be hashable. Subscriptions hold strong references to their observers
+        until they are unsubscribed.
+
+        Subscriptions belong to the bus, not to account objects: they are keyed by account and
+        client number, so they outlive the account objects which created them, and every object
+        with the same account number (such as a snapshot of an account) publishes to the same
+        observers. Whoever removes an account for good calls unsubscribe_account, as
+        AccountRepository.remove does, or its subscriptions stay on the bus.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self) -> None:
+        """
+        Description:
+            Initializes an event bus with no subscriptions.
+        """
+        # (scope, number) -> event type -> observers, in subscription order. The innermost
+        # dict is used as an ordered set, so removing an observer is O(1).
+        self.__subscriptions = {}
+        # observer -> the keys it is subscribed under, so it can be removed everywhere in O(k).
+        self.__keys_by_observer = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __key(account_number=None, client_number=None, event_type=None) -> tuple:
+        """
+        Returns the index key of a subscription.
+
+        Args:
+            account_number (int, optional): The account whose events are subscribed to.
+            client_number (int, optional): The client whose accounts' events are subscribed to.
+            event_type (str, optional): The event type subscribed to. Defaults to every type.
+
+        Returns:
+            tuple: The key.
+
+        Raises:
+            ValueError: If both an account number and a client number are given.
+        """
+        if account_number is not None and client_number is not None:
+            raise ValueError("Subscribe to an account or to a client, not both.")
+        if account_number is not None:
+            return (ACCOUNT, account_number, event_type)
+        if client_number is not None:
+            return (CLIENT, client_number, event_type)
+        return (ALL, None, event_type)
+
+    def subscribe(self, observer: Observer, account_number=None, client_number=None, event_type: str = None) -> None:
+        """
+        Subscribes an observer to events. Subscribing again with the same arguments has no effect.
+
+        Args:
+            observer (Observer): The observer.
+            account_number (int, optional): Only events of this account.
+            client_number (int, optional): Only events of this client's accounts.
+            event_type (str, optional): Only events of this type. Defaults to every type.
+
+        Raises:
+            ValueError: If both an account number and a client number are given.
+        """
+        key = self.__key(account_number, client_number, event_type)
+        with self.__lock:
+            self.__subscriptions.setdefault(key[:2], {}).setdefault(key[2], {})[observer] = None
+            self.__keys_by_observer.setdefault(observer, {})[key] = None
+
+    def unsubscribe(self, observer: Observer, account_number=None, client_number=None, event_type: str = None) -> bool:
+        """
+        Removes one subscription of an observer.
+
+        Args:
+            observer (Observer): The observer.
+            account_number (int, optional): The account of the subscription.
+            client_number (int, optional): The client of the subscription.
+            event_type (str, optional): The event type of the subscription.
+
+        Returns:
+            bool: True if the subscription existed.
+
+        Raises:
+            ValueError: If both an account number and a client number are given.
+        """
+        key = self.__key(account_number, client_number, event_type)
+        with self.__lock:
+            return self.__remove(observer, key)
+
+    def unsubscribe_all(self, observer: Observer) -> int:
+        """
+        Removes every subscription of an observer.
+
+        Args:
+            observer (Observer): The observer.
+
+        Returns:
+            int: The number of subscriptions removed.
+        """
+        with self.__lock:
+            keys = list(self.__keys_by_observer.get(observer, ()))
+            for key in keys:
+                self.__remove(observer, key)
+            return len(keys)
+
+    def unsubscribe_account(self, account_number) -> int:
+        """
+        Removes every subscription to the events of one account, for example when it is closed.
+
+        Args:
+            account_number (int): The account.
+
+        Returns:
+            int: The number of subscriptions removed.
+        """
+        with self.__lock:
+            by_event_type = self.__subscriptions.get((ACCOUNT, account_number), {})
+            subscriptions = [(observer, (ACCOUNT, account_number, event_type))
+                             for event_type, observers in by_event_type.items() for observer in observers]
+            for observer, key in subscriptions:
+                self.__remove(observer, key)
+            return len(subscriptions)
+
+    def __remove(self, observer: Observer, key: tuple) -> bool:
+        """
+        Removes a subscription, dropping index entries which become empty. Called with the lock held.
+
+        Args:
+            observer (Observer): The observer.
+            key (tuple): The subscription key.
+
+        Returns:
+            bool: True if the subscription existed.
+        """
+        by_event_type = self.__subscriptions.get(key[:2])
+        observers = by_event_type.get(key[2]) if by_event_type else None
+        if not observers or observer not in observers:
+            return False
+        del observers[observer]
+        if not observers:
+            del by_event_type[key[2]]
+            if not by_event_type:
+                del self.__subscriptions[key[:2]]
+        keys = self.__keys_by_observer[observer]
+        del keys[key]
+        if not keys:
+            del self.__keys_by_observer[observer]
+        return True
+
+    def subscribers(self, event_type: str, account_number=None, client_number=None) -> list:
+        """
+        Returns the observers an event would be delivered to.
+
+        Args:
+            event_type (str): The event type.
+            account_number (int, optional): The account the event is about.
+            client_number (int, optional): The client who owns the account.
+
+        Returns:
+            list: The observers, each once, in order of scope (account, client, all) and then
+            of subscription.
+        """
+        scopes = []
+        if account_number is not None:
+            scopes.append((ACCOUNT, account_number))
+        if client_number is not None:
+            scopes.append((CLIENT, client_number))
+        scopes.append((ALL, None))
+
+        matched = {}
+        with self.__lock:
+            for scope in scopes:
+                by_event_type = self.__subscriptions.get(scope)
+                if by_event_type:
+                    matched.update(by_event_type.get(event_type, ()))
+                    matched.update(by_event_type.get(None, ()))
+        return list(matched)
+
+    def publish(self, event_type: str, message: str, account_number=None, client_number=None) -> int:
+        """
+        Delivers an event to its subscribers. Observers are called outside the lock, so they
+        may subscribe and unsubscribe while handling it.
+
+        Args:
+            event_type (str): The event type.
+            message (str): The message passed to each observer's update method.
+            account_number (int, optional): The account the event is about.
+            client_number (int, optional): The client who owns the account.
+
+        Returns:
+            int: The number of observers the event was delivered to.
+        """
+        observers = self.subscribers(event_type, account_number, client_number)
+        for observer in observers:
+            observer.update(message)
+        return len(observers)
+
+    def subscription_count(self) -> int:
+        """
+        Returns the number of subscriptions.
+
+        Returns:
+            int: The number of (observer, key) subscriptions.
+        """
+        with self.__lock:
+            return sum(len(observers) for by_event_type in self.__subscriptions.values()
+                       for observers in by_event_type.values())
+
+# The bus bank accounts publish to unless configured otherwise (see BankAccount.EVENT_BUS). It
+# lives as long as the process, so its account subscriptions must be removed with
+# unsubscribe_account when accounts are removed.
+default_bus = EventBus()
@@ -0,0 +1,266 @@
+"""
+Description: Observers which reduce notification volume before it reaches a client. A
+DuplicateFilter passes each distinct message on at most once per time window, and a
+DigestObserver rolls many messages into one periodic digest. Both wrap another observer,
+such as a Client, and are subscribed to an EventBus in its place.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from collections import OrderedDict
+import threading
+import time
+import weakref
+from .event_bus import EventBus, default_bus
+from .observer import Observer
+from utility.file_utils import at_shutdown
+
+class DuplicateFilter(Observer):
+    """
+    Description:
+        The `DuplicateFilter` class passes a message on to its observer unless the same message
+        was passed on less than `window` seconds ago. Memory is bounded by the number of distinct
+        messages in one window.
+
+    Attributes:
+        observer (Observer): The observer messages are passed on to.
+        window (float): The number of seconds in which repeats of a message are suppressed.
+    """
+
+    def __init__(self, observer: Observer, window: float = 3600.0, clock=time.monotonic) -> None:
+        """
+        Description:
+            Initializes a filter.
+
+        Args:
+            observer (Observer): The observer messages are passed on to.
+            window (float, optional): The number of seconds in which repeats are suppressed. Defaults to an hour.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If the window is negative.
+        """
+        if window < 0:
+            raise ValueError("The duplicate window must not be negative.")
+        self.observer = observer
+        self.window = window
+        self.__clock = clock
+        # message -> when it was last passed on, oldest first.
+        self.__sent = OrderedDict()
+        self.__suppressed = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def suppressed_count(self) -> int:
+        """
+        Returns the number of messages suppressed so far.
+
+        Returns:
+            int: The number of messages.
+        """
+        return self.__suppressed
+
+    def update(self, message: str) -> None:
+        """
+        Passes a message on, unless it is a repeat within the window.
+
+        Args:
+            message (str): The message.
+        """
+        with self.__lock:
+            now = self.__clock()
+            while self.__sent:
+                oldest, sent_at = next(iter(self.__sent.items()))
+                if now - sent_at < self.window:
+                    break
+                del self.__sent[oldest]
+
+            if message in self.__sent:
+                self.__suppressed += 1
+                return
+            self.__sent[message] = now
+
+        self.observer.update(message)
+
+
+class DigestObserver(Observer):
+    """
+    Description:
+        The `DigestObserver` class collects messages and passes them on to its observer as one
+        digest message. Repeats of a message are listed once, with a count. A digest is sent when
+        `max_events` messages have been collected, `interval` seconds after the first message of
+        the digest (by a timer thread, or by the next message if it arrives first), when flush
+        or close is called, or when the interpreter exits.
+
+    Attributes:
+        observer (Observer): The observer digests are passed on to.
+        interval (float): The number of seconds a digest collects messages for.
+        max_events (int): The number of messages which fill a digest.
+    """
+
+    def __init__(self, observer: Observer, interval: float = 3600.0, max_events: int = 100,
+                 clock=time.monotonic) -> None:
+        """
+        Description:
+            Initializes a digest observer.
+
+        Args:
+            observer (Observer): The observer digests are passed on to.
+            interval (float, optional): The number of seconds a digest collects messages for. Defaults to an hour.
+            max_events (int, optional): The number of messages which fill a digest. Defaults to 100.
+            clock (callable, optional): Returns the current time in seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If the interval is negative or max_events is less than 1.
+        """
+        if interval < 0 or max_events < 1:
+            raise ValueError("The digest interval must not be negative and max_events must be at least 1.")
+        self.observer = observer
+        self.interval = interval
+        self.max_events = max_events
+        self.__clock = clock
+        # message -> the number of times it was received, in order of first receipt.
+        self.__pending = {}
+        self.__pending_count = 0
+        self.__started_at = None
+        self.__timer = None
+        # Identifies the digest being collected, so that a timer never sends a later one early.
+        self.__generation = 0
+        self.__closed = False
+        self.__lock = threading.Lock()
+        _digests.add(self)
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Returns the number of messages collected for the next digest.
+
+        Returns:
+            int: The number of messages.
+        """
+        return self.__pending_count
+
+    def update(self, message: str) -> None:
+        """
+        Collects a message, sending the digest if it is due.
+
+        Args:
+            message (str): The message.
+        """
+        with self.__lock:
+            now = self.__clock()
+            if self.__started_at is None:
+                self.__started_at = now
+            self.__pending[message] = self.__pending.get(message, 0) + 1
+            self.__pending_count += 1
+            due = self.__pending_count >= self.max_events or now - self.__started_at >= self.interval
+            if due:
+                digest = self.__take_digest()
+            else:
+                digest = None
+                if self.__timer is None and not self.__closed:
+                    self.__timer = threading.Timer(self.interval, self.__flush_when_due, (self.__generation,))
+                    self.__timer.daemon = True
+                    self.__timer.start()
+
+        if digest:
+            self.observer.update(digest)
+
+    def __flush_when_due(self, generation: int) -> None:
+        """
+        Timer thread: sends the digest which the timer was started for, if it has not been sent.
+
+        Args:
+            generation (int): The generation of the digest.
+        """
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            digest = self.__take_digest()
+
+        if digest:
+            self.observer.update(digest)
+
+    def flush(self) -> int:
+        """
+        Sends the collected messages now, if there are any.
+
+        Returns:
+            int: The number of messages in the digest sent.
+        """
+        with self.__lock:
+            count = self.__pending_count
+            digest = self.__take_digest()
+
+        if digest:
+            self.observer.update(digest)
+        return count
+
+    def close(self) -> int:
+        """
+        Sends the collected messages, if there are any, and stops sending digests on a timer or
+        at exit. Messages collected afterwards are only sent by flush or a later message.
+
+        Returns:
+            int: The number of messages in the digest sent.
+        """
+        _digests.discard(self)
+        with self.__lock:
+            self.__closed = True
+        return self.flush()
+
+    def __take_digest(self):
+        """
+        Builds the digest of the collected messages and starts a new one. Called with the lock held.
+
+        Returns:
+            str: The digest, or None if no messages were collected.
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        self.__generation += 1
+        if not self.__pending:
+            return None
+        lines = [f"- {message} (x{count})" if count > 1 else f"- {message}"
+                 for message, count in self.__pending.items()]
+        digest = f"Digest of {self.__pending_count} notifications:\n" + "\n".join(lines)
+        self.__pending = {}
+        self.__pending_count = 0
+        self.__started_at = None
+        return digest
+
+
+# The digests which are flushed when the interpreter exits.
+_digests = weakref.WeakSet()
+
+def _flush_digests() -> None:
+    """
+    Sends the collected messages of every digest. Runs at exit, before the outbox and the
+    transport are closed, so that the messages of a final, partial digest are delivered.
+    """
+    for digest in list(_digests):
+        digest.flush()
+
+at_shutdown(_flush_digests)
+
+
+def subscribe_client_digest(client, bus: EventBus = None, interval: float = 3600.0, max_events: int = 100,
+                            event_type: str = None) -> DigestObserver:
+    """
+    Subscribes a digest of the events of all of a client's accounts, delivered to the client.
+
+    Args:
+        client (Client): The client, which receives the digests.
+        bus (EventBus, optional): The bus to subscribe to. Defaults to default_bus.
+        interval (float, optional): The number of seconds a digest collects messages for.
+        max_events (int, optional): The number of messages which fill a digest.
+        event_type (str, optional): Only events of this type. Defaults to every type.
+
+    Returns:
+        DigestObserver: The digest, which sends its messages on its own every `interval` seconds;
+        flush sends any collected messages now. Unsubscribe it with bus.unsubscribe_all(digest)
+        and then close it.
+    """
+    digest = DigestObserver(client, interval, max_events)
+    (bus or default_bus).subscribe(digest, client_number=client.client_number, event_type=event_type)
+    return digest
@@ -1,12 +1,16 @@
-from typing import List
+from typing import List, Optional
 from .observer import Observer
 
 class Subject:
+    # Subjects are created in large numbers (one per bank account) and most never have an
+    # observer, so the observer list is only allocated when the first observer is attached.
+    __slots__ = ('_observers',)
+
     def __init__(self) -> None:
         """
-        Initializes a Subject instance with an empty list of observers.
+        Initializes a Subject instance with no observers.
         """
-        self._observers: List[Observer] = []
+        self._observers: Optional[List[Observer]] = None
 
     def attach(self, observer: Observer) -> None:
         """
@@ -15,6 +19,8 @@ class Subject:
         Args:
             observer (Observer): The observer to be added.
         """
+        if self._observers is None:
+            self._observers = []
         self._observers.append(observer)
 
     def detach(self, observer: Observer) -> None:
@@ -24,7 +30,7 @@ class Subject:
         Args:
             observer (Observer): The observer to be removed.
         """
-        if observer in self._observers:
+        if self._observers and observer in self._observers:
             self._observers.remove(observer)
 
     def notify(self, message: str) -> None:
@@ -34,5 +40,7 @@ class Subject:
         Args:
             message (str): The message to send to all observers.
         """
+        if not self._observers:
+            return
         for observer in self._observers:
             observer.update(message)
@@ -0,0 +1,255 @@
+"""
+Description: Vectorized service charge calculation. Accounts are grouped by the class of their
+service charge strategy and each group's charge rule is evaluated as one NumPy expression over
+arrays of balances and strategy parameters. The results are identical to calling each strategy's
+calculate_service_charges method one account at a time.
+
+With account objects, reading balances and parameters out of each object costs about as much
+as the charge rules themselves; for month-end runs over large numbers of accounts, build an
+AccountBook once and use AccountBook.get_service_charges, which works on the arrays directly.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from operator import attrgetter
+import numpy as np
+from .fee_schedule import FeeScheduleStrategy
+from .management_fee_strategy import ManagementFeeStrategy
+from .minimun_balance_strategy import MinimumBalanceStrategy
+from .overdraft_strategy import OverdraftStrategy
+from .service_charge_strategy import ServiceChargeStrategy
+from utility.money import rate_fraction, to_cents
+
+def overdraft_charges(balances, overdraft_limits, overdraft_rates) -> np.ndarray:
+    """
+    Calculates OverdraftStrategy service charges for arrays of accounts.
+
+    Args:
+        balances (array-like): The account balances.
+        overdraft_limits (array-like): The overdraft limit of each account.
+        overdraft_rates (array-like): The overdraft rate of each account.
+
+    Returns:
+        ndarray: The service charge of each account.
+    """
+    balances = np.asarray(balances, dtype=np.float64)
+    overdraft_amounts = -balances - np.asarray(overdraft_limits, dtype=np.float64)
+    # Written as a comparison rather than np.maximum so that it behaves exactly like the
+    # built-in max(0, amount) used by OverdraftStrategy.
+    overdraft_amounts = np.where(overdraft_amounts > 0, overdraft_amounts, 0.0)
+    base = ServiceChargeStrategy.BASE_SERVICE_CHARGE
+    return np.where(balances < 0, base + overdraft_amounts * np.asarray(overdraft_rates, dtype=np.float64), base)
+
+def minimum_balance_charges(balances, minimum_balances) -> np.ndarray:
+    """
+    Calculates MinimumBalanceStrategy service charges for arrays of accounts.
+
+    Args:
+        balances (array-like): The account balances.
+        minimum_balances (array-like): The minimum balance of each account.
+
+    Returns:
+        ndarray: The service charge of each account.
+    """
+    below_minimum = np.asarray(balances, dtype=np.float64) < np.asarray(minimum_balances, dtype=np.float64)
+    base = MinimumBalanceStrategy.BASE_SERVICE_CHARGE
+    return np.where(below_minimum, base + MinimumBalanceStrategy.SERVICE_CHARGE_PREMIUM, base)
+
+def management_fee_charges(dates_created, management_fees, as_of=None) -> np.ndarray:
+    """
+    Calculates ManagementFeeStrategy service charges for arrays of accounts.
+
+    Args:
+        dates_created (array-like): The creation date of each account.
+        management_fees (array-like): The management fee of each account.
+        as_of (date, optional): The date on which the accounts' ages are determined. Defaults to today.
+
+    Returns:
+        ndarray: The service charge of each account.
+    """
+    dates_created = np.asarray(dates_created, dtype='datetime64[D]')
+    older_than_ten_years = dates_created < np.datetime64(ManagementFeeStrategy.ten_years_before(as_of), 'D')
+    base = ManagementFeeStrategy.BASE_SERVICE_CHARGE
+    return np.where(older_than_ten_years, base + np.asarray(management_fees, dtype=np.float64), base)
+
+def cents_of(amounts) -> np.ndarray:
+    """
+    Converts an array of dollar amounts to cents exactly as utility.money.to_cents converts
+    each one. Each distinct amount is converted once, so this is fast for parameter arrays,
+    which hold few distinct values.
+
+    Args:
+        amounts (array-like): The dollar amounts.
+
+    Returns:
+        ndarray: The amounts in cents (int64).
+    """
+    values, inverse = np.unique(np.asarray(amounts, dtype=np.float64), return_inverse=True)
+    cents = np.fromiter((to_cents(float(value)) for value in values), dtype=np.int64, count=len(values))
+    return cents[inverse.reshape(-1)]
+
+def overdraft_charges_cents(balances_cents, overdraft_limits, overdraft_rates) -> np.ndarray:
+    """
+    Calculates OverdraftStrategy service charges in cents for arrays of accounts, with the
+    same integer arithmetic as OverdraftStrategy.calculate_service_charges_cents.
+
+    Args:
+        balances_cents (array-like): The account balances in cents.
+        overdraft_limits (array-like): The overdraft limit of each account, in dollars.
+        overdraft_rates (array-like): The overdraft rate of each account.
+
+    Returns:
+        ndarray: The service charge of each account in cents (int64).
+    """
+    balances_cents = np.asarray(balances_cents, dtype=np.int64)
+    overdraft_amounts = -balances_cents - cents_of(overdraft_limits)
+    overdraft_amounts = np.where(overdraft_amounts > 0, overdraft_amounts, 0)
+
+    rates, inverse = np.unique(np.asarray(overdraft_rates, dtype=np.float64), return_inverse=True)
+    fractions = [rate_fraction(float(rate)) for rate in rates]
+    # Rates with long decimal expansions, such as 0.07 / 12, have numerators and denominators
+    # near 10**17, so the products below would overflow int64; they are then computed with
+    # Python integers instead.
+    largest = (2 * int(overdraft_amounts.max(initial=0)) * max((fraction.numerator for fraction in fractions), default=0)
+               + 2 * max((fraction.denominator for fraction in fractions), default=1))
+    dtype = np.int64 if largest <= np.iinfo(np.int64).max else object
+    numerators = np.array([fraction.numerator for fraction in fractions], dtype=dtype)[inverse.reshape(-1)]
+    denominators = np.array([fraction.denominator for fraction in fractions], dtype=dtype)[inverse.reshape(-1)]
+    # Round half a cent up; overdraft amounts are never negative.
+    overdraft_charges = ((2 * overdraft_amounts.astype(dtype) * numerators + denominators)
+                         // (2 * denominators)).astype(np.int64)
+
+    base = to_cents(ServiceChargeStrategy.BASE_SERVICE_CHARGE)
+    return np.where(balances_cents < 0, base + overdraft_charges, base)
+
+def minimum_balance_charges_cents(balances_cents, minimum_balances) -> np.ndarray:
+    """
+    Calculates MinimumBalanceStrategy service charges in cents for arrays of accounts.
+
+    Args:
+        balances_cents (array-like): The account balances in cents.
+        minimum_balances (array-like): The minimum balance of each account, in dollars.
+
+    Returns:
+        ndarray: The service charge of each account in cents (int64).
+    """
+    below_minimum = np.asarray(balances_cents, dtype=np.int64) < cents_of(minimum_balances)
+    base = to_cents(MinimumBalanceStrategy.BASE_SERVICE_CHARGE)
+    return np.where(below_minimum, base + to_cents(MinimumBalanceStrategy.SERVICE_CHARGE_PREMIUM), base)
+
+def management_fee_charges_cents(dates_created, management_fees, as_of=None) -> np.ndarray:
+    """
+    Calculates ManagementFeeStrategy service charges in cents for arrays of accounts.
+
+    Args:
+        dates_created (array-like): The creation date of each account.
+        management_fees (array-like): The management fee of each account, in dollars.
+        as_of (date, optional): The date on which the accounts' ages are determined. Defaults to today.
+
+    Returns:
+        ndarray: The service charge of each account in cents (int64).
+    """
+    dates_created = np.asarray(dates_created, dtype='datetime64[D]')
+    older_than_ten_years = dates_created < np.datetime64(ManagementFeeStrategy.ten_years_before(as_of), 'D')
+    base = to_cents(ManagementFeeStrategy.BASE_SERVICE_CHARGE)
+    return np.where(older_than_ten_years, base + cents_of(management_fees), base)
+
+_BALANCE = attrgetter('balance')
+
+def strategy_parameters(strategies, *names) -> list:
+    """
+    Reads parameters of many strategies. Shared strategies (see strategy_factory) are read
+    once each, so the work grows with the number of distinct strategies rather than the
+    number of accounts.
+
+    Args:
+        strategies (list): The strategies.
+        *names (str): The names of the parameter properties to read.
+
+    Returns:
+        list: For each name, an array holding the parameter of each strategy.
+    """
+    distinct = {}
+    positions = np.fromiter((distinct.setdefault(strategy, len(distinct)) for strategy in strategies),
+                            dtype=np.intp, count=len(strategies))
+    return [np.array([getattr(strategy, name) for strategy in distinct])[positions] for name in names]
+
+def _overdraft_group(accounts, strategies, as_of) -> np.ndarray:
+    """
+    Evaluates a group of accounts whose strategies are OverdraftStrategy objects.
+    """
+    overdraft_limits, overdraft_rates = strategy_parameters(strategies, 'overdraft_limit', 'overdraft_rate')
+    return overdraft_charges(list(map(_BALANCE, accounts)), overdraft_limits, overdraft_rates)
+
+def _minimum_balance_group(accounts, strategies, as_of) -> np.ndarray:
+    """
+    Evaluates a group of accounts whose strategies are MinimumBalanceStrategy objects.
+    """
+    minimum_balances, = strategy_parameters(strategies, 'minimum_balance')
+    return minimum_balance_charges(list(map(_BALANCE, accounts)), minimum_balances)
+
+def _management_fee_group(accounts, strategies, as_of) -> np.ndarray:
+    """
+    Evaluates a group of accounts whose strategies are ManagementFeeStrategy objects.
+    """
+    dates_created, management_fees = strategy_parameters(strategies, 'date_created', 'management_fee')
+    return management_fee_charges(dates_created, management_fees, as_of)
+
+def _fee_schedule_group(accounts, strategies, as_of) -> np.ndarray:
+    """
+    Evaluates a group of accounts whose strategies are FeeScheduleStrategy objects, with one
+    vectorized evaluation per fee rule.
+    """
+    charges = np.empty(len(accounts), dtype=np.float64)
+    positions_by_strategy = {}
+    for position, strategy in enumerate(strategies):
+        positions_by_strategy.setdefault(strategy, []).append(position)
+
+    for strategy, positions in positions_by_strategy.items():
+        rule = strategy.rule
+        group_accounts = list(map(accounts.__getitem__, positions))
+        dates_created = [account.date_created for account in group_accounts] if rule.uses_age else None
+        charges[positions] = rule.charges(list(map(_BALANCE, group_accounts)), dates_created, as_of)
+    return charges
+
+# The vectorized evaluator of each strategy class. Strategies of any other class, including
+# subclasses of these (which may override calculate_service_charges), are evaluated one
+# account at a time.
+GROUP_EVALUATORS = {
+    OverdraftStrategy: _overdraft_group,
+    MinimumBalanceStrategy: _minimum_balance_group,
+    ManagementFeeStrategy: _management_fee_group,
+    FeeScheduleStrategy: _fee_schedule_group,
+}
+
+def calculate_service_charges(accounts, as_of=None) -> np.ndarray:
+    """
+    Calculates the service charges of many accounts, as get_service_charges would for each.
+
+    Args:
+        accounts (iterable): BankAccount objects.
+        as_of (date, optional): The date on which account ages are determined. Defaults to today.
+
+    Returns:
+        ndarray: The service charge of each account, in iteration order.
+    """
+    accounts = list(accounts)
+    strategies = list(map(attrgetter('service_charge_strategy'), accounts))
+    strategy_classes = list(map(type, strategies))
+    charges = np.empty(len(accounts), dtype=np.float64)
+
+    for strategy_class in dict.fromkeys(strategy_classes):
+        positions = [position for position, group_class in enumerate(strategy_classes)
+                     if group_class is strategy_class]
+        if len(positions) == len(accounts):
+            group_accounts, group_strategies = accounts, strategies
+        else:
+            group_accounts = list(map(accounts.__getitem__, positions))
+            group_strategies = list(map(strategies.__getitem__, positions))
+
+        evaluator = GROUP_EVALUATORS.get(strategy_class)
+        if evaluator is not None:
+            charges[positions] = evaluator(group_accounts, group_strategies, as_of)
+        else:
+            charges[positions] = [strategy.calculate_service_charges(account, as_of)
+                                  for account, strategy in zip(group_accounts, group_strategies)]
+    return charges
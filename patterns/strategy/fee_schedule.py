@@ -0,0 +1,527 @@
+"""
+Description: Table-driven service charges. A fee schedule is a JSON file which describes, for
+each account type, a base charge, balance tiers and account age tiers. It is compiled once into
+FeeRule objects, which evaluate one account with a binary search over the tier thresholds, or
+whole arrays of accounts with numpy.searchsorted, and plug into accounts as a
+FeeScheduleStrategy. Fee changes are then a change to the schedule file rather than to code.
+
+An example schedule, with the rules of the built-in strategies:
+
+    {
+        "ChequingAccount": {"base_charge": 5.0,
+                            "balance_tiers": [{"below": -1000.0, "rate": 0.05}]},
+        "SavingsAccount": {"base_charge": 5.0,
+                           "balance_tiers": [{"below": 50.0, "charge": 2.0}]},
+        "InvestmentAccount": {"base_charge": 5.0,
+                              "age_tiers": [{"older_than_years": 10, "charge": 2.55}]}
+    }
+
+A balance is in the tier with the lowest "below" threshold it is under, and is charged that
+tier's "charge" plus its "rate" times the amount by which the balance is under the threshold.
+An account is in the age tier with the highest "older_than_years" it is older than, using the
+same definition of a year as ManagementFeeStrategy.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from bisect import bisect_right
+from datetime import date, timedelta
+import json
+import math
+import os
+import weakref
+import numpy as np
+from .service_charge_strategy import ServiceChargeStrategy
+from utility.money import multiply_cents, to_cents
+
+# The schedule loaded by FeeSchedule.load when no path is given.
+schedule_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data',
+                             'fee_schedule.json')
+
+RULE_KEYS = {'base_charge', 'balance_tiers', 'age_tiers'}
+BALANCE_TIER_KEYS = {'below', 'charge', 'rate'}
+AGE_TIER_KEYS = {'older_than_years', 'charge'}
+
+# Compiled rules, keyed on their arguments, so that a rule unpickled in the process which
+# compiled it is the same object (and gives the same interned strategy).
+_rules = weakref.WeakValueDictionary()
+
+def _number(value, description: str) -> float:
+    """
+    Validates a number in a fee schedule.
+
+    Args:
+        value: The value from the schedule.
+        description (str): What the value is, for the error message.
+
+    Returns:
+        float: The value.
+
+    Raises:
+        ValueError: If the value is not a finite number.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{description} must be a number: {value!r}")
+    return float(value)
+
+def _tiers(config: dict, name: str, keys: set, account_type: str) -> list:
+    """
+    Validates the list of tiers of one kind in a rule.
+
+    Args:
+        config (dict): The rule.
+        name (str): The name of the list of tiers.
+        keys (set): The keys a tier may have.
+        account_type (str): The account type of the rule, for error messages.
+
+    Returns:
+        list: The tiers (dicts).
+
+    Raises:
+        ValueError: If the tiers are not a list of objects with known keys.
+    """
+    tiers = config.get(name, [])
+    if not isinstance(tiers, list) or not all(isinstance(tier, dict) for tier in tiers):
+        raise ValueError(f"{account_type} {name} must be a list of objects.")
+    for tier in tiers:
+        unknown = set(tier) - keys
+        if unknown:
+            raise ValueError(f"Unknown keys in {account_type} {name}: {', '.join(sorted(unknown))}")
+    return tiers
+
+class FeeRule:
+    """
+    Description:
+        The `FeeRule` class is the compiled fee rule of one account type. Tier thresholds are
+        held sorted, both as tuples for evaluating one account and as arrays for evaluating
+        many. Rules are immutable, so strategies and schedules can share them.
+
+    Attributes:
+        account_type (str): The account type the rule applies to.
+        base_charge (float): The charge applied to every account.
+    """
+    __slots__ = ('account_type', 'base_charge', '__belows', '__below_cents', '__fixed', '__rates',
+                 '__below_array', '__fixed_array', '__rate_array', '__age_years', '__age_charges',
+                 '__age_charge_array', '__arguments', '__frozen', '__weakref__')
+
+    def __init__(self, account_type: str, base_charge: float = ServiceChargeStrategy.BASE_SERVICE_CHARGE,
+                 balance_tiers=(), age_tiers=()) -> None:
+        """
+        Description:
+            Initializes and compiles a fee rule.
+
+        Args:
+            account_type (str): The account type the rule applies to.
+            base_charge (float, optional): The charge applied to every account. Defaults to
+                ServiceChargeStrategy.BASE_SERVICE_CHARGE.
+            balance_tiers (iterable, optional): (below, charge, rate) tuples.
+            age_tiers (iterable, optional): (older_than_years, charge) tuples.
+
+        Raises:
+            ValueError: If a value is not a finite number, an age is negative, or two tiers
+                have the same threshold.
+        """
+        base_charge = _number(base_charge, f"{account_type} base_charge")
+        balance_tiers = sorted((_number(below, f"{account_type} balance tier below"),
+                                _number(charge, f"{account_type} balance tier charge"),
+                                _number(rate, f"{account_type} balance tier rate"))
+                               for below, charge, rate in balance_tiers)
+        age_tiers = sorted((_number(years, f"{account_type} age tier older_than_years"),
+                            _number(charge, f"{account_type} age tier charge"))
+                           for years, charge in age_tiers)
+
+        belows = tuple(below for below, _, _ in balance_tiers)
+        ages = tuple(years for years, _ in age_tiers)
+        if len(set(belows)) != len(belows) or len(set(ages)) != len(ages):
+            raise ValueError(f"{account_type} tiers must have different thresholds.")
+        if ages and ages[0] < 0:
+            raise ValueError(f"{account_type} age tiers must not be negative.")
+
+        # A balance at or above every threshold is in a last, open tier with no extra charge.
+        # Its threshold is only used in 0 * (below - balance).
+        self.account_type = account_type
+        self.base_charge = base_charge
+        self.__belows = belows + (0.0,)
+        self.__fixed = tuple(base_charge + charge for _, charge, _ in balance_tiers) + (base_charge,)
+        self.__rates = tuple(rate for _, _, rate in balance_tiers) + (0.0,)
+        self.__below_cents = tuple(to_cents(below) for below in belows)
+        self.__below_array = np.array(self.__belows, dtype=np.float64)
+        self.__fixed_array = np.array(self.__fixed, dtype=np.float64)
+        self.__rate_array = np.array(self.__rates, dtype=np.float64)
+        self.__age_years = ages
+        # The charge of an account younger than every age tier is first.
+        self.__age_charges = (0.0,) + tuple(charge for _, charge in age_tiers)
+        self.__age_charge_array = np.array(self.__age_charges, dtype=np.float64)
+        self.__arguments = (account_type, base_charge, tuple(balance_tiers), tuple(age_tiers))
+        self.__frozen = True
+        _rules.setdefault(self.__arguments, self)
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute during initialization.
+
+        Raises:
+            AttributeError: If the rule has been initialized.
+        """
+        if getattr(self, '_FeeRule__frozen', False):
+            raise AttributeError("FeeRule objects are immutable.")
+        super().__setattr__(name, value)
+
+    def __repr__(self) -> str:
+        """
+        Returns the rule's arguments, which identify it (month_end fingerprints include it).
+        """
+        return f"FeeRule{self.__arguments!r}"
+
+    def __reduce__(self):
+        """
+        Pickles the rule as its arguments, so that worker processes recompile it.
+        """
+        return (FeeRule._restore, self.__arguments)
+
+    @classmethod
+    def _restore(cls, *arguments) -> "FeeRule":
+        """
+        Returns the compiled rule with the given arguments. Used when unpickling.
+
+        Returns:
+            FeeRule: The existing rule with these arguments, or a newly compiled one.
+        """
+        rule = cls(*arguments)
+        return _rules.get(rule.__arguments, rule)
+
+    @classmethod
+    def from_dict(cls, account_type: str, config: dict) -> "FeeRule":
+        """
+        Compiles a rule from its description in a fee schedule.
+
+        Args:
+            account_type (str): The account type the rule applies to.
+            config (dict): The rule, with the keys 'base_charge', 'balance_tiers' and 'age_tiers'.
+
+        Returns:
+            FeeRule: The compiled rule.
+
+        Raises:
+            ValueError: If the description is invalid.
+        """
+        if not isinstance(config, dict):
+            raise ValueError(f"The {account_type} rule must be an object.")
+        unknown = set(config) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown keys in the {account_type} rule: {', '.join(sorted(unknown))}")
+
+        balance_tiers = []
+        for tier in _tiers(config, 'balance_tiers', BALANCE_TIER_KEYS, account_type):
+            if 'below' not in tier:
+                raise ValueError(f"{account_type} balance tiers must have a 'below' threshold.")
+            balance_tiers.append((tier['below'], tier.get('charge', 0.0), tier.get('rate', 0.0)))
+
+        age_tiers = []
+        for tier in _tiers(config, 'age_tiers', AGE_TIER_KEYS, account_type):
+            if 'older_than_years' not in tier:
+                raise ValueError(f"{account_type} age tiers must have an 'older_than_years' threshold.")
+            age_tiers.append((tier['older_than_years'], tier.get('charge', 0.0)))
+
+        return cls(account_type, config.get('base_charge', ServiceChargeStrategy.BASE_SERVICE_CHARGE),
+                   balance_tiers, age_tiers)
+
+    @property
+    def uses_age(self) -> bool:
+        """
+        Returns whether the charge depends on the account's age.
+
+        Returns:
+            bool: True if the rule has age tiers.
+        """
+        return bool(self.__age_years)
+
+    def __cutoffs(self, as_of: date = None) -> list:
+        """
+        Returns the creation date before which an account is in each age tier, oldest first.
+
+        Args:
+            as_of (date, optional): The date on which ages are determined. Defaults to today.
+
+        Returns:
+            list: The cutoff dates, in ascending order (the highest age tier first).
+        """
+        as_of = as_of or date.today()
+        return [as_of - timedelta(days=years * 365.25) for years in reversed(self.__age_years)]
+
+    def __age_charge(self, date_created: date, as_of: date = None) -> float:
+        """
+        Returns the age charge of one account.
+
+        Args:
+            date_created (date): The date the account was created.
+            as_of (date, optional): The date on which its age is determined. Defaults to today.
+
+        Returns:
+            float: The charge of the account's age tier.
+        """
+        cutoffs = self.__cutoffs(as_of)
+        return self.__age_charges[len(cutoffs) - bisect_right(cutoffs, date_created)]
+
+    def charge(self, balance: float, date_created: date = None, as_of: date = None) -> float:
+        """
+        Calculates the service charge of one account.
+
+        Args:
+            balance (float): The account balance.
+            date_created (date, optional): The date the account was created. Required if
+                the rule has age tiers.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            float: The service charge.
+        """
+        tier = bisect_right(self.__belows, balance, hi=len(self.__belows) - 1)
+        service_charge = self.__fixed[tier] + self.__rates[tier] * (self.__belows[tier] - balance)
+        if self.__age_years:
+            service_charge += self.__age_charge(date_created, as_of)
+        return service_charge
+
+    def charge_cents(self, balance_cents: int, date_created: date = None, as_of: date = None) -> int:
+        """
+        Calculates the service charge of one account in cents, using integer arithmetic only.
+        The rate charge is rounded to the nearest cent.
+
+        Args:
+            balance_cents (int): The account balance in cents.
+            date_created (date, optional): The date the account was created. Required if
+                the rule has age tiers.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            int: The service charge in cents.
+        """
+        tier = bisect_right(self.__below_cents, balance_cents)
+        service_charge = to_cents(self.__fixed[tier])
+        if tier < len(self.__below_cents):
+            service_charge += multiply_cents(self.__below_cents[tier] - balance_cents, self.__rates[tier])
+        if self.__age_years:
+            service_charge += to_cents(self.__age_charge(date_created, as_of))
+        return service_charge
+
+    def charges(self, balances, dates_created=None, as_of: date = None) -> np.ndarray:
+        """
+        Calculates the service charges of arrays of accounts. The results are identical to
+        calling charge for each account.
+
+        Args:
+            balances (array-like): The account balances.
+            dates_created (array-like, optional): The date each account was created. Required
+                if the rule has age tiers.
+            as_of (date, optional): The date on which the accounts' ages are determined. Defaults to today.
+
+        Returns:
+            ndarray: The service charge of each account.
+        """
+        balances = np.asarray(balances, dtype=np.float64)
+        tiers = np.searchsorted(self.__below_array[:-1], balances, side='right')
+        service_charges = (self.__fixed_array[tiers]
+                           + self.__rate_array[tiers] * (self.__below_array[tiers] - balances))
+        if self.__age_years:
+            cutoffs = np.array(self.__cutoffs(as_of), dtype='datetime64[D]')
+            dates_created = np.asarray(dates_created, dtype='datetime64[D]')
+            age_tiers = len(cutoffs) - np.searchsorted(cutoffs, dates_created, side='right')
+            service_charges += self.__age_charge_array[age_tiers]
+        return service_charges
+
+
+class FeeSchedule:
+    """
+    Description:
+        The `FeeSchedule` class holds the compiled fee rule of each account type.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, rules) -> None:
+        """
+        Description:
+            Initializes a schedule from compiled rules.
+
+        Args:
+            rules (iterable): FeeRule objects, one per account type.
+
+        Raises:
+            ValueError: If two rules apply to the same account type.
+        """
+        self.__rules = {}
+        for rule in rules:
+            if rule.account_type in self.__rules:
+                raise ValueError(f"More than one rule for {rule.account_type}.")
+            self.__rules[rule.account_type] = rule
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "FeeSchedule":
+        """
+        Compiles a schedule from its description.
+
+        Args:
+            config (dict): The rule of each account type, keyed by the account class name.
+
+        Returns:
+            FeeSchedule: The compiled schedule.
+
+        Raises:
+            ValueError: If the description is invalid.
+        """
+        if not isinstance(config, dict):
+            raise ValueError("A fee schedule must be an object keyed by account type.")
+        return cls(FeeRule.from_dict(account_type, rule) for account_type, rule in config.items())
+
+    @classmethod
+    def load(cls, path: str = None) -> "FeeSchedule":
+        """
+        Loads and compiles a schedule file.
+
+        Args:
+            path (str, optional): The path of the JSON schedule. Defaults to schedule_path.
+
+        Returns:
+            FeeSchedule: The compiled schedule.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not valid JSON or the schedule is invalid.
+        """
+        with open(path or schedule_path, encoding='utf-8') as file:
+            try:
+                config = json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid fee schedule {path or schedule_path}: {e}") from None
+        return cls.from_dict(config)
+
+    @property
+    def account_types(self) -> tuple:
+        """
+        Returns the account types the schedule has rules for.
+
+        Returns:
+            tuple: The account class names.
+        """
+        return tuple(self.__rules)
+
+    def rule(self, account_type) -> FeeRule:
+        """
+        Returns the rule of an account type.
+
+        Args:
+            account_type (str or type): The account class, or its name.
+
+        Returns:
+            FeeRule: The rule.
+
+        Raises:
+            ValueError: If the schedule has no rule for the account type.
+        """
+        name = account_type if isinstance(account_type, str) else account_type.__name__
+        try:
+            return self.__rules[name]
+        except KeyError:
+            raise ValueError(f"The fee schedule has no rule for {name}.") from None
+
+    def strategy(self, account_type) -> "FeeScheduleStrategy":
+        """
+        Returns the shared strategy which charges accounts by the rule of an account type.
+
+        Args:
+            account_type (str or type): The account class, or its name.
+
+        Returns:
+            FeeScheduleStrategy: The strategy.
+
+        Raises:
+            ValueError: If the schedule has no rule for the account type.
+        """
+        from .strategy_factory import intern_strategy
+        return intern_strategy(FeeScheduleStrategy, self.rule(account_type))
+
+    def apply_to(self, accounts) -> int:
+        """
+        Sets the service charge strategy of accounts to the schedule's rule for their type.
+
+        Args:
+            accounts (iterable): BankAccount objects.
+
+        Returns:
+            int: The number of accounts.
+
+        Raises:
+            ValueError: If the schedule has no rule for an account's type. No strategy is changed.
+        """
+        accounts = list(accounts)
+        strategies = {account_class: self.strategy(account_class) for account_class in map(type, accounts)}
+        for account in accounts:
+            account.service_charge_strategy = strategies[type(account)]
+        return len(accounts)
+
+
+class FeeScheduleStrategy(ServiceChargeStrategy):
+    """
+    Concrete implementation of ServiceChargeStrategy which charges accounts by a compiled
+    fee schedule rule.
+
+    Attributes:
+        __rule (FeeRule): The rule.
+    """
+    __slots__ = ('__rule',)
+
+    def __init__(self, rule: FeeRule):
+        """
+        Initializes the FeeScheduleStrategy with a rule.
+
+        Args:
+            rule (FeeRule): The compiled rule of the account type.
+        """
+        self.__rule = rule
+        self._freeze()
+
+    @property
+    def parameters(self) -> tuple:
+        """
+        Returns the rule.
+
+        Returns:
+            tuple: The parameters the strategy was initialized with.
+        """
+        return (self.__rule,)
+
+    @property
+    def rule(self) -> FeeRule:
+        """
+        Returns the rule.
+
+        Returns:
+            FeeRule: The compiled rule of the account type.
+        """
+        return self.__rule
+
+    def calculate_service_charges(self, account, as_of: date = None):
+        """
+        Calculates the service charges for an account by the rule.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            float: The calculated service charges.
+        """
+        return self.__rule.charge(account.balance, account.date_created, as_of)
+
+    def calculate_service_charges_cents(self, account, as_of: date = None):
+        """
+        Calculates the service charges for an account in cents by the rule.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        return self.__rule.charge_cents(account.balance_cents, account.date_created, as_of)
@@ -5,6 +5,7 @@ Author: Jashanpreet Kaur Jattana
 
 from .service_charge_strategy import ServiceChargeStrategy
 from datetime import date, timedelta
+from utility.money import to_cents
 
 class ManagementFeeStrategy(ServiceChargeStrategy):
     """
@@ -12,11 +13,16 @@ class ManagementFeeStrategy(ServiceChargeStrategy):
     based on a management fee and the age of the account.
 
     Attributes:
-        TEN_YEARS_AGO (date): A constant date representing the date ten years prior to today.
+        TEN_YEARS (timedelta): The account age beyond which the management fee is charged.
+        TEN_YEARS_AGO (date): The date ten years before the day this module was imported. Kept for
+                              compatibility; charges use ten_years_before, which is evaluated on each call.
         __date_created (date): The date when the account was created.
         __management_fee (float): The management fee charged if the account is older than ten years.
     """
-    TEN_YEARS_AGO = date.today() - timedelta(days=10 * 365.25)
+    TEN_YEARS = timedelta(days=10 * 365.25)
+    TEN_YEARS_AGO = date.today() - TEN_YEARS
+
+    __slots__ = ('__date_created', '__management_fee')
 
     def __init__(self, date_created: date, management_fee: float):
         """
@@ -29,18 +35,91 @@ class ManagementFeeStrategy(ServiceChargeStrategy):
         """
         self.__date_created = date_created
         self.__management_fee = management_fee
+        self._freeze()
+
+    @property
+    def parameters(self) -> tuple:
+        """
+        Returns the account creation date and management fee.
+
+        Returns:
+            tuple: The parameters the strategy was initialized with.
+        """
+        return (self.__date_created, self.__management_fee)
+
+    @property
+    def date_created(self) -> date:
+        """
+        Returns the account creation date.
+
+        Returns:
+            date: The date when the account was created.
+        """
+        return self.__date_created
+
+    @property
+    def management_fee(self) -> float:
+        """
+        Returns the management fee.
+
+        Returns:
+            float: The management fee applied if the account is older than ten years.
+        """
+        return self.__management_fee
+
+    @classmethod
+    def ten_years_before(cls, as_of: date = None) -> date:
+        """
+        Returns the cutoff date for the management fee: accounts created before it are charged.
+
+        Args:
+            as_of (date, optional): The date on which eligibility is determined. Defaults to today.
+
+        Returns:
+            date: The date ten years before `as_of`.
+        """
+        return (as_of or date.today()) - cls.TEN_YEARS
+
+    def is_fee_charged(self, as_of: date = None) -> bool:
+        """
+        Returns whether the management fee is charged, i.e. whether the account is older than ten years.
+
+        Args:
+            as_of (date, optional): The date on which eligibility is determined. Defaults to today.
 
-    def calculate_service_charges(self, account):
+        Returns:
+            bool: True if the account was created more than ten years before `as_of`.
+        """
+        return self.__date_created < self.ten_years_before(as_of)
+
+    def calculate_service_charges(self, account, as_of: date = None):
         """
         Calculate service charges based on the management fee.
 
         Args:
             account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
 
         Returns:
             float: The calculated service charges based on whether the account age exceeds ten years.
         """
-        if self.__date_created < self.TEN_YEARS_AGO:
+        if self.is_fee_charged(as_of):
             return self.BASE_SERVICE_CHARGE + self.__management_fee
         else:
             return self.BASE_SERVICE_CHARGE
+
+    def calculate_service_charges_cents(self, account, as_of: date = None):
+        """
+        Calculate service charges based on the management fee, in cents.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined. Defaults to today.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        service_charge = to_cents(self.BASE_SERVICE_CHARGE)
+        if self.is_fee_charged(as_of):
+            service_charge += to_cents(self.__management_fee)
+        return service_charge
@@ -3,6 +3,7 @@ Description:
 Author: Jashanpreet Kaur Jattana
 """
 from .service_charge_strategy import ServiceChargeStrategy
+from utility.money import to_cents
 
 class MinimumBalanceStrategy(ServiceChargeStrategy):
     """
@@ -16,6 +17,8 @@ class MinimumBalanceStrategy(ServiceChargeStrategy):
     """
     SERVICE_CHARGE_PREMIUM = 2.0
 
+    __slots__ = ('__minimum_balance',)
+
     def __init__(self, minimum_balance: float):
         """
         Initializes the MinimumBalanceStrategy with a specified minimum balance.
@@ -25,13 +28,35 @@ class MinimumBalanceStrategy(ServiceChargeStrategy):
                                      to avoid additional service charges.
         """
         self.__minimum_balance = minimum_balance
+        self._freeze()
+
+    @property
+    def parameters(self) -> tuple:
+        """
+        Returns the minimum balance.
+
+        Returns:
+            tuple: The parameters the strategy was initialized with.
+        """
+        return (self.__minimum_balance,)
 
-    def calculate_service_charges(self, account):
+    @property
+    def minimum_balance(self) -> float:
+        """
+        Returns the minimum balance.
+
+        Returns:
+            float: The minimum balance that must be maintained in the account.
+        """
+        return self.__minimum_balance
+
+    def calculate_service_charges(self, account, as_of=None):
         """
         Calculate service charges based on the account balance and minimum balance.
 
         Args:
             account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): Ignored; the charge does not depend on the account's age.
 
         Returns:
             float: The calculated service charges based on whether the account balance
@@ -41,3 +66,19 @@ class MinimumBalanceStrategy(ServiceChargeStrategy):
             return self.BASE_SERVICE_CHARGE + self.SERVICE_CHARGE_PREMIUM
         else:
             return self.BASE_SERVICE_CHARGE
+
+    def calculate_service_charges_cents(self, account, as_of=None):
+        """
+        Calculate service charges in cents, comparing the balance and minimum balance in cents.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): Ignored; the charge does not depend on the account's age.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        service_charge = to_cents(self.BASE_SERVICE_CHARGE)
+        if account.balance_cents < to_cents(self.__minimum_balance):
+            service_charge += to_cents(self.SERVICE_CHARGE_PREMIUM)
+        return service_charge
@@ -4,6 +4,7 @@ Author: Jashanpreet Kaur Jattana
 """
 
 from .service_charge_strategy import ServiceChargeStrategy
+from utility.money import multiply_cents, to_cents
 
 
 class OverdraftStrategy(ServiceChargeStrategy):
@@ -15,6 +16,8 @@ class OverdraftStrategy(ServiceChargeStrategy):
         __overdraft_limit (float): The maximum amount that can be overdrafted.
         __overdraft_rate (float): The rate applied to the overdrafted amount.
     """
+    __slots__ = ('__overdraft_limit', '__overdraft_rate')
+
     def __init__(self, overdraft_limit: float, overdraft_rate: float):
         """
         Initializes the OverdraftStrategy with a specified overdraft limit and rate.
@@ -26,14 +29,46 @@ class OverdraftStrategy(ServiceChargeStrategy):
         # Private attributes based on the diagram's visibility notation
         self.__overdraft_limit = overdraft_limit
         self.__overdraft_rate = overdraft_rate
+        self._freeze()
+
+    @property
+    def parameters(self) -> tuple:
+        """
+        Returns the overdraft limit and rate.
 
-    def calculate_service_charges(self, account):
+        Returns:
+            tuple: The parameters the strategy was initialized with.
+        """
+        return (self.__overdraft_limit, self.__overdraft_rate)
+
+    @property
+    def overdraft_limit(self) -> float:
+        """
+        Returns the overdraft limit.
+
+        Returns:
+            float: The limit for overdraft, below which service charges apply.
+        """
+        return self.__overdraft_limit
+
+    @property
+    def overdraft_rate(self) -> float:
+        """
+        Returns the overdraft rate.
+
+        Returns:
+            float: The rate at which service charges are calculated for the overdraft amount.
+        """
+        return self.__overdraft_rate
+
+    def calculate_service_charges(self, account, as_of=None):
         """
         Calculates the service charges for an account based on the overdraft strategy.
         Uses the same logic as the get_service_charges method in the ChequingAccount class.
 
         Args:
             account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): Ignored; the charge does not depend on the account's age.
 
         Returns:
             float: The calculated service charges based on the account balance and overdraft conditions.
@@ -43,3 +78,22 @@ class OverdraftStrategy(ServiceChargeStrategy):
             overdraft_amount = max(0, -account.balance - self.__overdraft_limit)
             service_charge += overdraft_amount * self.__overdraft_rate
         return service_charge
+
+    def calculate_service_charges_cents(self, account, as_of=None):
+        """
+        Calculates the service charges for an account in cents, using integer arithmetic only.
+        The overdraft charge is rounded to the nearest cent.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): Ignored; the charge does not depend on the account's age.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        service_charge = to_cents(ServiceChargeStrategy.BASE_SERVICE_CHARGE)
+        balance = account.balance_cents
+        if balance < 0:
+            overdraft_amount = max(0, -balance - to_cents(self.__overdraft_limit))
+            service_charge += multiply_cents(overdraft_amount, self.__overdraft_rate)
+        return service_charge
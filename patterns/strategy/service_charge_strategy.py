@@ -4,10 +4,13 @@ Author: Jashanpreet Kaur Jattana
 """
 
 from abc import ABC, abstractmethod
+from utility.money import to_cents
 
 class ServiceChargeStrategy(ABC):
     """
     Abstract base class for defining service charge strategies for bank accounts.
+    Strategies are immutable once initialized, so that accounts with the same parameters can
+    share one instance (see patterns.strategy.strategy_factory).
 
     Attributes:
         BASE_SERVICE_CHARGE (float): A constant representing the base service charge
@@ -15,15 +18,92 @@ class ServiceChargeStrategy(ABC):
     """
     BASE_SERVICE_CHARGE = 5.0  # Example constant; set as needed
 
+    __slots__ = ('__frozen', '__weakref__')
+
+    def _freeze(self) -> None:
+        """
+        Makes the strategy immutable. Called at the end of each concrete strategy's __init__.
+        """
+        self.__frozen = True
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute during initialization.
+
+        Raises:
+            AttributeError: If the strategy has been initialized.
+        """
+        if getattr(self, '_ServiceChargeStrategy__frozen', False):
+            raise AttributeError(f"{type(self).__name__} objects are immutable.")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        """
+        Raises:
+            AttributeError: Strategies are immutable.
+        """
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    @property
+    def parameters(self) -> tuple:
+        """
+        Returns the arguments the strategy was initialized with. Strategies with equal
+        parameters are interchangeable.
+
+        Returns:
+            tuple: The parameters, in the order of the initializer's arguments.
+        """
+        return ()
+
+    def __reduce__(self):
+        """
+        Pickles the strategy as its class and parameters, so that unpickling (and copying)
+        returns the shared instance.
+        """
+        return (_restore_strategy, (type(self), self.parameters))
+
     @abstractmethod
-    def calculate_service_charges(self, account):
+    def calculate_service_charges(self, account, as_of=None):
         """
         Calculate the service charges for a given bank account.
 
         Args:
             account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined, for strategies
+                which depend on it. Defaults to today.
 
         Returns:
             float: The calculated service charges for the specified account.
         """
         pass
+
+    def calculate_service_charges_cents(self, account, as_of=None):
+        """
+        Calculate the service charges for a given bank account as a whole number of cents.
+        Strategies override this to calculate with exact integer arithmetic; by default the
+        result of calculate_service_charges is rounded to the nearest cent.
+
+        Args:
+            account: The bank account object for which service charges are to be calculated.
+            as_of (date, optional): The date on which the account's age is determined, for strategies
+                which depend on it. Defaults to today.
+
+        Returns:
+            int: The calculated service charges in cents.
+        """
+        return to_cents(self.calculate_service_charges(account, as_of))
+
+
+def _restore_strategy(strategy_class, parameters):
+    """
+    Returns the shared strategy for a class and parameters. Used when unpickling.
+
+    Args:
+        strategy_class (type): The strategy class.
+        parameters (tuple): The strategy's parameters.
+
+    Returns:
+        ServiceChargeStrategy: The strategy.
+    """
+    from .strategy_factory import intern_strategy
+    return intern_strategy(strategy_class, *parameters)
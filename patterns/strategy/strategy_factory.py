@@ -0,0 +1,93 @@
+"""
+Description: An interning factory for service charge strategies. Strategies are immutable, so
+accounts whose strategies have the same class and parameters share a single instance. This saves
+memory (most accounts share a handful of parameter combinations) and lets batch code group
+accounts by strategy identity.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import threading
+import weakref
+from datetime import date
+from .management_fee_strategy import ManagementFeeStrategy
+from .minimun_balance_strategy import MinimumBalanceStrategy
+from .overdraft_strategy import OverdraftStrategy
+
+# Interned strategies, keyed on their class and parameters. Strategies no longer used by any
+# account are discarded.
+_strategies = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+def intern_strategy(strategy_class, *parameters):
+    """
+    Returns the shared strategy of a class with the given parameters, creating it on first use.
+
+    Args:
+        strategy_class (type): A ServiceChargeStrategy subclass.
+        *parameters: The arguments to initialize the strategy with.
+
+    Returns:
+        ServiceChargeStrategy: The shared strategy.
+    """
+    # Parameter types are part of the key, so that e.g. 50 and 50.0 give different strategies
+    # and each strategy reports its parameters exactly as they were given.
+    key = (strategy_class,) + tuple((type(parameter), parameter) for parameter in parameters)
+    try:
+        hash(key)
+    except TypeError:
+        return strategy_class(*parameters)
+
+    with _lock:
+        strategy = _strategies.get(key)
+        if strategy is None:
+            strategy = strategy_class(*parameters)
+            _strategies[key] = strategy
+        return strategy
+
+def overdraft_strategy(overdraft_limit: float, overdraft_rate: float) -> OverdraftStrategy:
+    """
+    Returns the shared OverdraftStrategy with the given parameters.
+
+    Args:
+        overdraft_limit (float): The overdraft limit.
+        overdraft_rate (float): The overdraft rate.
+
+    Returns:
+        OverdraftStrategy: The shared strategy.
+    """
+    return intern_strategy(OverdraftStrategy, overdraft_limit, overdraft_rate)
+
+def minimum_balance_strategy(minimum_balance: float) -> MinimumBalanceStrategy:
+    """
+    Returns the shared MinimumBalanceStrategy with the given parameters.
+
+    Args:
+        minimum_balance (float): The minimum balance.
+
+    Returns:
+        MinimumBalanceStrategy: The shared strategy.
+    """
+    return intern_strategy(MinimumBalanceStrategy, minimum_balance)
+
+def management_fee_strategy(date_created: date, management_fee: float) -> ManagementFeeStrategy:
+    """
+    Returns the shared ManagementFeeStrategy with the given parameters.
+
+    Args:
+        date_created (date): The account creation date.
+        management_fee (float): The management fee.
+
+    Returns:
+        ManagementFeeStrategy: The shared strategy.
+    """
+    return intern_strategy(ManagementFeeStrategy, date_created, management_fee)
+
+def interned_count() -> int:
+    """
+    Returns the number of shared strategies currently in use.
+
+    Returns:
+        int: The number of strategies.
+    """
+    with _lock:
+        return len(_strategies)
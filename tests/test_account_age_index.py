@@ -0,0 +1,94 @@
+"""
+Description: Unit tests for the AccountAgeIndex class and as-of dates for management fees.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from datetime import date, timedelta
+from bank_account.account_age_index import AccountAgeIndex
+from bank_account.account_book import AccountBook
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from patterns.strategy.batch_service_charges import calculate_service_charges
+from patterns.strategy.management_fee_strategy import ManagementFeeStrategy
+
+class TestAsOfDate(unittest.TestCase):
+    """Unit tests for management fee eligibility on a given date."""
+
+    def setUp(self):
+        """Create an account which turns ten years old during March 2025."""
+        self.account = InvestmentAccount(1, 1, 1000.0, date(2015, 3, 15), 2.5)
+
+    def test_service_charges_as_of(self):
+        """Test the management fee is charged only once the account is older than ten years."""
+        first_charged = date(2015, 3, 15) + timedelta(days=3653)
+        self.assertEqual(7.5, self.account.get_service_charges(first_charged))
+        self.assertEqual(5.0, self.account.get_service_charges(first_charged - timedelta(days=1)))
+        self.assertEqual(750, self.account.get_service_charges_cents(first_charged + timedelta(days=1)))
+
+    def test_default_is_evaluated_on_each_call(self):
+        """Test the default as-of date is today rather than the day the module was imported."""
+        account = InvestmentAccount(2, 1, 1000.0, ManagementFeeStrategy.ten_years_before() - timedelta(days=1), 2.5)
+        self.assertTrue(account.service_charge_strategy.is_fee_charged())
+        self.assertFalse(account.service_charge_strategy.is_fee_charged(date.today() - timedelta(days=2)))
+
+    def test_account_age_as_of(self):
+        """Test the account age on a given date."""
+        self.assertEqual(9, self.account.calculate_account_age(date(2025, 3, 1)))
+        self.assertEqual(10, self.account.calculate_account_age(date(2025, 3, 20)))
+
+    def test_batch_as_of(self):
+        """Test the vectorized charges use the as-of date."""
+        as_of = date(2025, 4, 1)
+        self.assertEqual([5.0 + 2.5], calculate_service_charges([self.account], as_of).tolist())
+        self.assertEqual([5.0 + 2.5], AccountBook.from_accounts([self.account]).get_service_charges(as_of).tolist())
+        self.assertEqual([5.0], calculate_service_charges([self.account], date(2025, 3, 1)).tolist())
+
+class TestAccountAgeIndex(unittest.TestCase):
+    """Unit tests for the AccountAgeIndex class."""
+
+    def setUp(self):
+        """Index accounts created on the first of each month from 2013 to 2016."""
+        self.accounts = [InvestmentAccount(number, 1, 100.0, date(2013 + number // 12, number % 12 + 1, 1), 1.0)
+                         for number in range(48)]
+        self.index = AccountAgeIndex(reversed(self.accounts + [ChequingAccount(99, 1, "Holder", 10.0)]))
+
+    def scan(self, as_of):
+        """Return the accounts charged on a date, by checking every account."""
+        return [account for account in self.accounts if account.service_charge_strategy.is_fee_charged(as_of)]
+
+    def test_ignores_other_account_types(self):
+        """Test only investment accounts are indexed, oldest first."""
+        self.assertEqual(self.accounts, list(self.index))
+
+    def test_fee_charged_matches_scan(self):
+        """Test the accounts found with the index are those found by checking every account."""
+        for as_of in (date(2022, 1, 1), date(2024, 6, 15), date(2025, 12, 31), date(2030, 1, 1)):
+            self.assertEqual(self.scan(as_of), self.index.fee_charged(as_of))
+            self.assertEqual(len(self.accounts) - len(self.scan(as_of)), len(self.index.fee_waived(as_of)))
+
+    def test_becoming_charged_in_month(self):
+        """Test the accounts crossing the ten-year mark during a month."""
+        crossing = self.index.becoming_charged_in_month(2025, 6)
+        self.assertEqual([account.date_created for account in crossing], [date(2015, 6, 1)])
+        before = set(self.scan(date(2025, 5, 31)))
+        after = set(self.scan(date(2025, 6, 30)))
+        self.assertEqual(after - before, set(crossing))
+        self.assertEqual(1, len(self.index.becoming_charged_in_month(2025, 12)))
+
+    def test_add_and_remove(self):
+        """Test accounts added and removed keep the index in order."""
+        account = InvestmentAccount(100, 1, 100.0, date(2014, 6, 15), 1.0)
+        self.index.add(account)
+        self.assertEqual(self.scan(date(2024, 12, 1)),
+                         [indexed for indexed in self.index.fee_charged(date(2024, 12, 1)) if indexed is not account])
+        self.assertIn(account, self.index.fee_charged(date(2024, 12, 31)))
+        self.index.remove(account)
+        self.assertEqual(48, len(self.index))
+        with self.assertRaises(ValueError):
+            self.index.remove(account)
+        with self.assertRaises(TypeError):
+            self.index.add(ChequingAccount(101, 1, "Holder", 10.0))
+
+if __name__ == "__main__":
+    unittest.main()
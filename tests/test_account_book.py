@@ -0,0 +1,109 @@
+"""
+Description: Unit tests for the AccountBook class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from datetime import date
+import numpy as np
+from bank_account.account_book import AccountBook
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+
+class TestAccountBook(unittest.TestCase):
+    """Unit tests for the AccountBook class."""
+
+    def setUp(self):
+        """Set up one account of each type and a book holding them."""
+        self.chequing = ChequingAccount(1001, 1, "Ann Lee", 500.0, 200.0, 0.05, date(2020, 1, 15))
+        self.savings = SavingsAccount(1002, 1, 1000.0, date(2019, 6, 1), 50.0)
+        self.investment = InvestmentAccount(1003, 2, 2500.0, date(2010, 3, 10), 2.55)
+        self.accounts = [self.chequing, self.savings, self.investment]
+        self.book = AccountBook.from_accounts(self.accounts)
+
+    def test_from_accounts_columns(self):
+        """Test from_accounts copies the state of each account into the columns."""
+        self.assertEqual(len(self.book), 3)
+        np.testing.assert_array_equal(self.book.account_numbers, [1001, 1002, 1003])
+        np.testing.assert_array_equal(self.book.client_numbers, [1, 1, 2])
+        np.testing.assert_array_equal(self.book.balances, [500.0, 1000.0, 2500.0])
+        np.testing.assert_array_equal(self.book.type_codes,
+                                      [AccountBook.CHEQUING, AccountBook.SAVINGS, AccountBook.INVESTMENT])
+        np.testing.assert_array_equal(self.book.dates_created,
+                                      np.array(['2020-01-15', '2019-06-01', '2010-03-10'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(self.book.overdraft_limits, [200.0, np.nan, np.nan])
+        np.testing.assert_array_equal(self.book.minimum_balances, [np.nan, 50.0, np.nan])
+        np.testing.assert_array_equal(self.book.management_fees, [np.nan, np.nan, 2.55])
+
+    def test_to_accounts_round_trip(self):
+        """Test to_accounts rebuilds accounts with the same state."""
+        accounts = self.book.to_accounts()
+        self.assertIsInstance(accounts[0], ChequingAccount)
+        self.assertIsInstance(accounts[1], SavingsAccount)
+        self.assertIsInstance(accounts[2], InvestmentAccount)
+        for original, rebuilt in zip(self.accounts, accounts):
+            self.assertEqual(rebuilt.account_number, original.account_number)
+            self.assertEqual(rebuilt.client_number, original.client_number)
+            self.assertEqual(rebuilt.balance, original.balance)
+            self.assertEqual(rebuilt.date_created, original.date_created)
+        self.assertEqual(accounts[0].overdraft_limit, 200.0)
+        self.assertEqual(accounts[1].service_charge_strategy.minimum_balance, 50.0)
+
+    def test_unsupported_account_type(self):
+        """Test from_accounts raises TypeError for objects which are not supported accounts."""
+        with self.assertRaises(TypeError):
+            AccountBook.from_accounts([object()])
+
+    def test_indices_of(self):
+        """Test indices_of maps account numbers to book indices."""
+        np.testing.assert_array_equal(self.book.indices_of([1003, 1001, 1003]), [2, 0, 2])
+        with self.assertRaises(KeyError):
+            self.book.indices_of([9999])
+
+    def test_apply_deposits_repeated_account(self):
+        """Test apply_deposits adds every deposit, including several to the same account."""
+        self.book.apply_deposits([0, 0, 2], [10.0, 15.0, 100.0])
+        np.testing.assert_array_equal(self.book.balances, [525.0, 1000.0, 2600.0])
+
+    def test_apply_deposits_invalid_amount(self):
+        """Test apply_deposits rejects the whole batch if an amount is not positive."""
+        with self.assertRaises(ValueError):
+            self.book.apply_deposits([0, 1], [10.0, -5.0])
+        np.testing.assert_array_equal(self.book.balances, [500.0, 1000.0, 2500.0])
+
+    def test_apply_withdrawals(self):
+        """Test apply_withdrawals subtracts every withdrawal."""
+        self.book.apply_withdrawals([0, 0, 1], [100.0, 400.0, 1.5])
+        np.testing.assert_array_equal(self.book.balances, [0.0, 998.5, 2500.0])
+
+    def test_apply_withdrawals_insufficient_funds(self):
+        """Test apply_withdrawals rejects the whole batch if an account's withdrawals exceed its balance."""
+        with self.assertRaisesRegex(ValueError, "Insufficient funds"):
+            self.book.apply_withdrawals([1, 0, 0], [10.0, 300.0, 300.0])
+        np.testing.assert_array_equal(self.book.balances, [500.0, 1000.0, 2500.0])
+
+    def test_apply_withdrawals_index_out_of_range(self):
+        """Test apply_withdrawals rejects indices outside the book."""
+        with self.assertRaises(ValueError):
+            self.book.apply_withdrawals([3], [1.0])
+
+    def test_store_balances(self):
+        """Test store_balances copies balances back into the account objects."""
+        self.book.apply_deposits([1], [250.0])
+        self.book.store_balances(self.accounts)
+        self.assertEqual(self.savings.balance, 1250.0)
+        self.assertEqual(self.chequing.balance, 500.0)
+
+    def test_matches_account_methods(self):
+        """Test a batch gives the same balances as calling deposit and withdraw on each account."""
+        rng = np.random.default_rng(7)
+        indices = rng.integers(0, 3, size=200)
+        amounts = np.round(rng.uniform(0.01, 20.0, size=200), 2)
+        self.book.apply_deposits(indices, amounts)
+        for index, amount in zip(indices, amounts):
+            self.accounts[index].deposit(float(amount))
+        np.testing.assert_allclose(self.book.balances, [account.balance for account in self.accounts])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Description: Unit tests for the AccountRepository class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from patterns.observer.event_bus import EventBus
+from user_interface.account_repository import AccountRepository
+
+class TestAccountRepository(unittest.TestCase):
+    """Unit tests for the AccountRepository class."""
+
+    def setUp(self):
+        """Set up a repository holding accounts for two clients."""
+        self.account1 = ChequingAccount(20001, 1001, "John", 100.0)
+        self.account2 = ChequingAccount(20002, 1001, "John", 200.0)
+        self.account3 = ChequingAccount(20003, 1002, "Jane", 300.0)
+        self.repository = AccountRepository({
+            20001: self.account1,
+            20002: self.account2,
+            20003: self.account3,
+        })
+
+    def test_init_populates_accounts(self):
+        """Test that the repository is populated from the accounts dictionary."""
+        self.assertEqual(3, len(self.repository))
+        self.assertIn(20001, self.repository)
+        self.assertIs(self.account3, self.repository[20003])
+
+    def test_accounts_for_client(self):
+        """Test that a client's accounts are returned in insertion order."""
+        self.assertEqual([self.account1, self.account2], self.repository.accounts_for_client(1001))
+        self.assertEqual([self.account3], self.repository.accounts_for_client(1002))
+
+    def test_accounts_for_unknown_client(self):
+        """Test that an unknown client has no accounts."""
+        self.assertEqual([], self.repository.accounts_for_client(9999))
+
+    def test_add_indexes_new_account(self):
+        """Test that an added account is found by its client number."""
+        account = ChequingAccount(20004, 1002, "Jane", 400.0)
+        self.repository.add(account)
+        self.assertEqual([self.account3, account], self.repository.accounts_for_client(1002))
+
+    def test_update_replaces_account(self):
+        """Test that updating an account replaces it without duplicating the index entry."""
+        updated = ChequingAccount(20001, 1001, "John", 999.0)
+        self.repository.update(updated)
+        self.assertIs(updated, self.repository[20001])
+        self.assertEqual([updated, self.account2], self.repository.accounts_for_client(1001))
+
+    def test_update_moves_account_to_new_client(self):
+        """Test that changing an account's client number moves it in the index."""
+        self.account1.client_number = 1002
+        self.repository.update(self.account1)
+        self.assertEqual([self.account2], self.repository.accounts_for_client(1001))
+        self.assertEqual([self.account3, self.account1], self.repository.accounts_for_client(1002))
+
+    def test_remove_unindexes_account(self):
+        """Test that a removed account is no longer returned for its client."""
+        removed = self.repository.remove(20003)
+        self.assertIs(self.account3, removed)
+        self.assertNotIn(20003, self.repository)
+        self.assertEqual([], self.repository.accounts_for_client(1002))
+
+    def test_remove_unsubscribes_account(self):
+        """Test that removing an account removes its subscriptions from the event bus."""
+        bus = EventBus()
+        with mock.patch.object(BankAccount, 'EVENT_BUS', bus):
+            self.account3.attach(mock.Mock())
+            self.account1.attach(mock.Mock())
+            self.repository.remove(20003)
+        self.assertEqual(1, bus.subscription_count())
+        self.assertEqual([], bus.subscribers('notification', account_number=20003))
+
+    def test_remove_unknown_account(self):
+        """Test that removing an unknown account raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.repository.remove(99999)
+
+if __name__ == "__main__":
+    unittest.main()
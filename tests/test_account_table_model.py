@@ -0,0 +1,168 @@
+"""
+Description: Unit tests for the AccountTableModel and AccountFilterProxyModel classes. The tests
+need PySide6 and are skipped without it; they run without a display on the offscreen Qt platform.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import unittest
+from datetime import date
+from bank_account.chequing_account import ChequingAccount
+from bank_account.savings_account import SavingsAccount
+from user_interface.account_repository import AccountRepository
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+    from ui_superclasses.lookup_window import LookupWindow
+    from user_interface.account_table_model import AccountFilterProxyModel, AccountTableModel
+except ImportError:
+    QApplication = None
+
+@unittest.skipUnless(QApplication, "PySide6 is not installed")
+class TestAccountTableModel(unittest.TestCase):
+    """Unit tests for the AccountTableModel class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the Qt application the models and windows need."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a model over the accounts of two clients."""
+        self.repository = AccountRepository({
+            20001: ChequingAccount(20001, 1001, "John", 1234.5, date_created=date(2024, 1, 15)),
+            20002: SavingsAccount(20002, 1001, 50.0, date(2023, 6, 1), 50.0),
+            20003: ChequingAccount(20003, 1002, "Jane", 10.0, date_created=date(2022, 3, 1)),
+        })
+        self.model = AccountTableModel(self.repository)
+
+    def cells(self) -> list:
+        """Return the display text of every cell, row by row."""
+        return [[self.model.data(self.model.index(row, column))
+                 for column in range(self.model.columnCount())]
+                for row in range(self.model.rowCount())]
+
+    def test_set_client(self):
+        """Test that looking up a client shows its accounts, read from the repository."""
+        self.assertEqual(0, self.model.rowCount())
+        self.assertEqual(2, self.model.set_client(1001))
+        self.assertEqual([["20001", "$1,234.50", "2024-01-15", "ChequingAccount"],
+                          ["20002", "$50.00", "2023-06-01", "SavingsAccount"]], self.cells())
+        self.assertEqual("Balance", self.model.headerData(1, Qt.Horizontal))
+        self.assertEqual(int(Qt.AlignRight | Qt.AlignVCenter),
+                         self.model.data(self.model.index(0, 1), Qt.TextAlignmentRole))
+
+        self.assertEqual(1, self.model.set_client(1002))
+        self.assertEqual(0, self.model.row_of(20003))
+        self.assertEqual(-1, self.model.row_of(20001))
+
+    def test_refresh_account(self):
+        """Test that a refreshed account is redrawn from the repository with one dataChanged."""
+        self.model.set_client(1001)
+        changed = []
+        self.model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append(
+            (top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column())))
+
+        account = self.repository[20002]
+        account.deposit(25.0)
+        self.assertTrue(self.model.refresh_account(20002))
+        self.assertFalse(self.model.refresh_account(20003))
+        self.assertEqual([(1, 0, 1, 3)], changed)
+        self.assertEqual("$75.00", self.cells()[1][1])
+
+    def test_remove_rows(self):
+        """Test that removed rows leave the repository and the other rows' positions follow."""
+        self.model.set_client(1001)
+        self.assertFalse(self.model.removeRows(1, 2))
+        self.assertTrue(self.model.removeRows(0, 1))
+        self.assertEqual(0, self.model.row_of(20002))
+        self.assertIn(20001, self.repository)
+        self.assertIsNone(self.model.account(1))
+
+    def test_reset_display_empties_table(self):
+        """Test that the lookup window's reset_display removes every row from the table's model."""
+        window = LookupWindow()
+        self.addCleanup(window.deleteLater)
+        window.account_table.setModel(self.model)
+        self.model.set_client(1001)
+        window.reset_display()
+        self.assertEqual(0, self.model.rowCount())
+        self.assertEqual(2, len(self.repository.accounts_for_client(1001)))
+
+@unittest.skipUnless(QApplication, "PySide6 is not installed")
+class TestAccountFilterProxyModel(unittest.TestCase):
+    """Unit tests for the AccountFilterProxyModel class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the Qt application the models need."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a proxy over a client with four accounts and another with one."""
+        accounts = {number: ChequingAccount(number, 1001, "John", balance, date_created=date(2024, 1, 15))
+                    for number, balance in ((20001, 10.0), (20002, 200.0), (20003, 3000.0))}
+        accounts[20004] = SavingsAccount(20004, 1001, 50.0, date(2023, 6, 1), 50.0)
+        accounts[30001] = SavingsAccount(30001, 1002, 75.0, date(2023, 6, 1), 50.0)
+        self.repository = AccountRepository(accounts)
+        self.model = AccountTableModel(self.repository)
+        self.model.set_client(1001)
+        self.proxy = AccountFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+
+    def shown(self) -> list:
+        """Return the account numbers of the rows the proxy shows."""
+        return [int(self.proxy.data(self.proxy.index(row, 0))) for row in range(self.proxy.rowCount())]
+
+    def test_set_and_clear_filter(self):
+        """Test that a filter shows the matching rows and clearing it shows every row."""
+        self.assertEqual(3, self.proxy.set_filter(3, " CHEQUING"))
+        self.assertEqual([20001, 20002, 20003], self.shown())
+        self.assertEqual(1, self.proxy.set_filter(0, "20002"))
+        self.assertEqual(4, self.proxy.set_filter(0, ""))
+        self.proxy.set_filter(1, "$200")
+        self.assertEqual([20002], self.shown())
+        self.proxy.clear_filter()
+        self.assertFalse(self.proxy.filter_active)
+        self.assertEqual([20001, 20002, 20003, 20004], self.shown())
+
+    def test_reset_drops_filter(self):
+        """Test that looking up another client drops the filter and a new filter uses the new rows."""
+        self.proxy.set_filter(3, "savings")
+        self.model.set_client(1002)
+        self.assertFalse(self.proxy.filter_active)
+        self.assertEqual([30001], self.shown())
+        self.assertEqual(0, self.proxy.set_filter(3, "chequing"))
+        self.assertEqual(1, self.proxy.set_filter(3, "savings"))
+
+    def test_removed_rows_drop_filter(self):
+        """Test that removing source rows drops the filter, and the remaining rows can be filtered again."""
+        self.proxy.set_filter(3, "savings")
+        self.assertTrue(self.model.removeRows(0, 2))
+        self.assertFalse(self.proxy.filter_active)
+        self.assertEqual([20003, 20004], self.shown())
+        self.assertEqual(1, self.proxy.set_filter(3, "savings"))
+        self.assertEqual([20004], self.shown())
+
+    def test_removing_shown_rows_empties_source(self):
+        """Test that removing every row shown also removes the rows the filter hides, as reset_display does."""
+        self.proxy.set_filter(3, "savings")
+        self.assertTrue(self.proxy.removeRows(0, self.proxy.rowCount()))
+        self.assertEqual(0, self.model.rowCount())
+        self.assertEqual(0, self.proxy.rowCount())
+
+    def test_updated_account_keeps_rows_until_filtered_again(self):
+        """Test that an updated account stays shown until the filter is set again."""
+        self.proxy.set_filter(1, "$200")
+        account = self.repository[20002]
+        account.deposit(1000.0)
+        self.model.refresh_account(20002)
+        self.assertEqual([20002], self.shown())
+        self.assertEqual(0, self.proxy.set_filter(1, "$200"))
+        self.assertEqual(1, self.proxy.set_filter(1, "$1,200"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Description: Unit tests for the AccountTextIndex class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from datetime import date
+from bank_account.chequing_account import ChequingAccount
+from bank_account.savings_account import SavingsAccount
+from user_interface.account_text_index import (AccountTextIndex, ACCOUNT_NUMBER_COLUMN, ACCOUNT_TYPE_COLUMN,
+                                               BALANCE_COLUMN, cell_text, normalize)
+
+class TestAccountTextIndex(unittest.TestCase):
+    """Unit tests for the AccountTextIndex class."""
+
+    def setUp(self):
+        """Set up an index of three accounts."""
+        self.accounts = [
+            ChequingAccount(20001, 1001, "John", 1234.5, date_created=date(2024, 1, 15)),
+            SavingsAccount(20002, 1001, 50.0, date(2023, 6, 1), 50.0),
+            ChequingAccount(30003, 1001, "John", 99.99, date_created=date(2024, 1, 15)),
+        ]
+        self.index = AccountTextIndex(self.accounts)
+
+    def test_cell_text(self):
+        """Test that cells are formatted as the account table shows them."""
+        account = self.accounts[0]
+        self.assertEqual("20001", cell_text(account, ACCOUNT_NUMBER_COLUMN))
+        self.assertEqual("$1,234.50", cell_text(account, BALANCE_COLUMN))
+        self.assertEqual("2024-01-15", cell_text(account, 2))
+        self.assertEqual("ChequingAccount", cell_text(account, ACCOUNT_TYPE_COLUMN))
+        with self.assertRaises(IndexError):
+            cell_text(account, 4)
+
+    def test_text_is_normalized(self):
+        """Test that indexed text is stripped and lower case."""
+        self.assertEqual("abc", normalize("  AbC "))
+        self.assertEqual(3, len(self.index))
+        self.assertEqual("savingsaccount", self.index.text(1, ACCOUNT_TYPE_COLUMN))
+
+    def test_match(self):
+        """Test that matching ignores case and surrounding whitespace."""
+        self.assertEqual([True, False, True], self.index.match(ACCOUNT_TYPE_COLUMN, " CHEQUING "))
+        self.assertEqual([True, True, False], self.index.match(ACCOUNT_NUMBER_COLUMN, "2000"))
+        self.assertEqual([False, False, False], self.index.match(BALANCE_COLUMN, "$5,000"))
+
+    def test_empty_text_matches_every_row(self):
+        """Test that an empty filter matches every row."""
+        self.assertEqual([True, True, True], self.index.match(BALANCE_COLUMN, ""))
+
+    def test_match_unknown_column(self):
+        """Test that matching a column which does not exist raises IndexError."""
+        with self.assertRaises(IndexError):
+            self.index.match(4, "x")
+
+    def test_update(self):
+        """Test that updating a row reindexes it from the account."""
+        self.accounts[2].deposit(1000.0)
+        self.assertEqual([True, False, False], self.index.match(BALANCE_COLUMN, "1,"))
+        self.index.update(2, self.accounts[2])
+        self.assertEqual([True, False, True], self.index.match(BALANCE_COLUMN, "1,"))
+
+    def test_remove(self):
+        """Test that removed rows are no longer indexed."""
+        self.index.remove(0, 2)
+        self.assertEqual(1, len(self.index))
+        self.assertEqual("30003", self.index.text(0, ACCOUNT_NUMBER_COLUMN))
+
+    def test_match_after_remove(self):
+        """Test that matching after a removal returns one result per remaining row, in row order."""
+        self.index.remove(1, 1)
+        self.assertEqual([True, True], self.index.match(ACCOUNT_TYPE_COLUMN, "chequing"))
+        self.assertEqual([False, True], self.index.match(ACCOUNT_NUMBER_COLUMN, "3"))
+        self.index.remove(0, 2)
+        self.assertEqual([], self.index.match(ACCOUNT_TYPE_COLUMN, ""))
+
+    def test_match_after_reset(self):
+        """Test that an index of newly shown rows, as built after a reset, matches only those rows."""
+        self.index = AccountTextIndex(self.accounts[1:2])
+        self.assertEqual([True], self.index.match(ACCOUNT_TYPE_COLUMN, "savings"))
+        self.assertEqual([False], self.index.match(ACCOUNT_TYPE_COLUMN, "chequing"))
+        self.assertEqual(0, len(AccountTextIndex()))
+        self.assertEqual([], AccountTextIndex().match(BALANCE_COLUMN, "1"))
+
+if __name__ == "__main__":
+    unittest.main()
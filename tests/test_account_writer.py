@@ -0,0 +1,86 @@
+"""
+Description: Unit tests for the AccountWriter class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import threading
+import unittest
+from bank_account.chequing_account import ChequingAccount
+from user_interface.account_writer import AccountWriter
+
+class TestAccountWriter(unittest.TestCase):
+    """Unit tests for the AccountWriter class."""
+
+    def setUp(self):
+        """Set up a writer which records the batches it writes."""
+        self.batches = []
+        self.written = threading.Event()
+        self.writer = None
+
+    def tearDown(self):
+        """Close the writer if a test left it open."""
+        if self.writer is not None:
+            self.writer.close()
+
+    def record_batch(self, batch):
+        """Record a written batch as (account number, balance) pairs."""
+        self.batches.append([(account.account_number, account.balance) for account in batch])
+        self.written.set()
+
+    def test_invalid_arguments(self):
+        """Test that invalid flush settings raise ValueError."""
+        with self.assertRaises(ValueError):
+            AccountWriter(flush_interval=0, write=self.record_batch)
+        with self.assertRaises(ValueError):
+            AccountWriter(batch_size=0, write=self.record_batch)
+
+    def test_updates_are_coalesced(self):
+        """Test that repeated updates of an account are written once with the latest balance."""
+        self.writer = AccountWriter(flush_interval=60, write=self.record_batch)
+        for balance in (110.0, 120.0, 130.0):
+            self.writer.submit(ChequingAccount(20001, 1001, "John", balance))
+        self.writer.submit(ChequingAccount(20002, 1001, "John", 5.0))
+
+        self.assertEqual(2, self.writer.pending_count())
+        self.writer.flush()
+        self.assertEqual([[(20001, 130.0), (20002, 5.0)]], self.batches)
+        self.assertEqual(0, self.writer.pending_count())
+
+    def test_batch_size_triggers_write(self):
+        """Test that a full batch is written by the background thread."""
+        self.writer = AccountWriter(flush_interval=60, batch_size=2, write=self.record_batch)
+        self.writer.submit_many([ChequingAccount(20001, 1001, "John", 1.0),
+                                 ChequingAccount(20002, 1001, "John", 2.0)])
+        self.assertTrue(self.written.wait(5))
+        self.assertEqual([[(20001, 1.0), (20002, 2.0)]], self.batches)
+
+    def test_interval_triggers_write(self):
+        """Test that pending updates are written after the flush interval."""
+        self.writer = AccountWriter(flush_interval=0.05, batch_size=100, write=self.record_batch)
+        self.writer.submit(ChequingAccount(20001, 1001, "John", 1.0))
+        self.assertTrue(self.written.wait(5))
+        self.assertEqual([[(20001, 1.0)]], self.batches)
+
+    def test_close_flushes_and_rejects_updates(self):
+        """Test that close writes pending updates and later submissions are rejected."""
+        writer = AccountWriter(flush_interval=60, write=self.record_batch)
+        writer.submit(ChequingAccount(20001, 1001, "John", 1.0))
+        writer.close()
+        self.assertEqual([[(20001, 1.0)]], self.batches)
+        with self.assertRaises(RuntimeError):
+            writer.submit(ChequingAccount(20001, 1001, "John", 2.0))
+
+    def test_failed_flush_keeps_updates_pending(self):
+        """Test that updates stay pending when a write fails."""
+        def fail(batch):
+            raise OSError("disk full")
+
+        self.writer = AccountWriter(flush_interval=60, write=fail)
+        self.writer.submit(ChequingAccount(20001, 1001, "John", 1.0))
+        with self.assertRaises(OSError):
+            self.writer.flush()
+        self.assertEqual(1, self.writer.pending_count())
+        self.writer = None
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,13 @@ the following command:python -m unittest tests/test_
 """
 
 import unittest
+from datetime import date
+from unittest import mock
 from bank_account.bank_account import BankAccount  
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.observer.event_bus import EventBus
 
 class TestBankAccount(unittest.TestCase):
 
@@ -136,6 +142,117 @@ class TestBankAccount(unittest.TestCase):
         account = BankAccount(12345, 67890, 500.0)
         self.assertEqual("Account Number: 12345 Balance: $500.00", str(account))
 
+class TestApplyTransactions(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates an account with an observer, on an event bus of its own.
+        """
+        patcher = mock.patch.object(BankAccount, 'EVENT_BUS', EventBus())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.account = ChequingAccount(12345, 67890, "Holder", 500.0)
+        self.observer = mock.Mock()
+        self.account.attach(self.observer)
+
+    def messages(self):
+        return [call.args[0] for call in self.observer.update.call_args_list]
+
+    def test_matches_update_balance(self):
+        """
+        Ensures a batch leaves the same balance as applying each amount with update_balance.
+        """
+        amounts = [0.1, -0.2, 33.33, -12.5, 0.07] * 200
+        other = ChequingAccount(12346, 67890, "Holder", 500.0)
+        for amount in amounts:
+            other.update_balance(amount)
+        self.assertEqual(len(amounts), self.account.apply_transactions(iter(amounts)))
+        self.assertEqual(other.balance, self.account.balance)
+        self.assertEqual([], self.messages())
+
+    def test_one_low_balance_notification(self):
+        """
+        Ensures a batch ending below the low balance level notifies once.
+        """
+        self.account.apply_transactions([-100.0] * 5)
+        self.assertEqual(["Low balance warning $0.00: on account 12345."], self.messages())
+
+    def test_large_transactions_summarized(self):
+        """
+        Ensures large transactions are summarized in one notification.
+        """
+        self.account.apply_transactions([20000.0, 5.0, -15000.0, 12000.0])
+        self.assertEqual(["3 large transactions totalling $17000.00: on account 12345."], self.messages())
+
+    def test_single_large_transaction(self):
+        """
+        Ensures a single large transaction is reported as update_balance reports it.
+        """
+        self.account.apply_transactions([20000.0])
+        self.assertEqual(["Large transaction $20000.00: on account 12345."], self.messages())
+
+    def test_invalid_amount_applies_nothing(self):
+        """
+        Ensures no amount is applied when any amount is invalid.
+        """
+        for invalid in ("10", None, float('nan'), True):
+            with self.assertRaises(ValueError):
+                self.account.apply_transactions([10.0, invalid])
+        self.assertEqual(500.0, self.account.balance)
+        self.assertEqual([], self.messages())
+
+    def test_cents_accounts(self):
+        """
+        Ensures accounts which store cents apply a batch exactly.
+        """
+        with mock.patch.object(BankAccount, 'USE_CENTS', True):
+            account = ChequingAccount(12347, 67890, "Holder", 0.0)
+        account.apply_transactions([0.1] * 1000)
+        self.assertEqual(10000, account.balance_cents)
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates one account of each type.
+        """
+        self.accounts = [ChequingAccount(1001, 1, "Ann Lee", 500.0, 200.0, 0.05, date(2020, 1, 15)),
+                         SavingsAccount(1002, 1, 1000.0, date(2019, 6, 1), 50.0),
+                         InvestmentAccount(1003, 2, 2500.0, date(2010, 3, 10), 2.55)]
+
+    def test_copies_state(self):
+        """
+        Ensures a snapshot has the same class and state, and shares the immutable strategy.
+        """
+        for account in self.accounts:
+            clone = account.snapshot()
+            self.assertIs(type(account), type(clone))
+            self.assertEqual(account.get_account_info(), clone.get_account_info())
+            self.assertIs(account.service_charge_strategy, clone.service_charge_strategy)
+            self.assertEqual(account.get_service_charges(), clone.get_service_charges())
+
+    def test_independent(self):
+        """
+        Ensures transactions on a snapshot do not change the account.
+        """
+        for account in self.accounts:
+            clone = account.snapshot()
+            clone.deposit(100.0)
+            self.assertEqual(account.balance + 100.0, clone.balance)
+
+    def test_does_not_copy_observers(self):
+        """
+        Ensures a snapshot does not copy the observers subscribed to the account.
+        """
+        account = self.accounts[0]
+        observer = mock.Mock()
+        with mock.patch.object(BankAccount, 'EVENT_BUS', EventBus()), \
+                mock.patch('copy.deepcopy', side_effect=AssertionError):
+            account.attach(observer)
+            clone = account.snapshot()
+            clone.update_balance(-480.0)
+        observer.update.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,82 @@
+"""
+Description: Unit tests for the vectorized service charge calculation.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import random
+import unittest
+from datetime import date, timedelta
+from bank_account.account_book import AccountBook
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.strategy.batch_service_charges import calculate_service_charges
+from patterns.strategy.minimun_balance_strategy import MinimumBalanceStrategy
+
+class FlatFeeStrategy(MinimumBalanceStrategy):
+    """A strategy subclass with its own rule, which must not be vectorized as its superclass."""
+
+    def calculate_service_charges(self, account, as_of=None):
+        return 1.25 if as_of is None or as_of.year < 2030 else 2.5
+
+class TestBatchServiceCharges(unittest.TestCase):
+    """Unit tests for calculate_service_charges and AccountBook.get_service_charges."""
+
+    def setUp(self):
+        """Set up a mix of accounts covering each branch of each strategy."""
+        rng = random.Random(11)
+        self.accounts = []
+        for number in range(600):
+            kind = number % 3
+            balance = round(rng.uniform(-3000.0, 3000.0), 2)
+            if kind == 0:
+                account = ChequingAccount(number, number // 4, "Holder", balance,
+                                          rng.choice([0.0, 100.0, 1000.0]), rng.choice([0.05, 0.125, 0.3]),
+                                          date(2020, 1, 1))
+            elif kind == 1:
+                account = SavingsAccount(number, number // 4, balance, date(2021, 5, 5),
+                                         rng.choice([0.0, 50.0, 500.0]))
+            else:
+                age = timedelta(days=rng.randint(0, 20 * 365))
+                account = InvestmentAccount(number, number // 4, abs(balance), date.today() - age,
+                                            rng.choice([0.0, 2.55, 10.5]))
+            self.accounts.append(account)
+        # Balances on the boundaries of each rule.
+        self.accounts.append(ChequingAccount(1000, 1, "Holder", -100.0, 100.0, 0.05, date(2020, 1, 1)))
+        self.accounts.append(ChequingAccount(1001, 1, "Holder", 0.0, 100.0, 0.05, date(2020, 1, 1)))
+        self.accounts.append(SavingsAccount(1002, 1, 50.0, date(2020, 1, 1), 50.0))
+
+    def expected(self):
+        return [account.get_service_charges() for account in self.accounts]
+
+    def test_matches_per_account_charges(self):
+        """Test the batch results equal each account's get_service_charges exactly."""
+        self.assertEqual([float(charge) for charge in calculate_service_charges(self.accounts)], self.expected())
+
+    def test_account_book_matches_per_account_charges(self):
+        """Test AccountBook.get_service_charges equals each account's get_service_charges exactly."""
+        charges = AccountBook.from_accounts(self.accounts).get_service_charges()
+        self.assertEqual([float(charge) for charge in charges], self.expected())
+
+    def test_unregistered_strategy_class_falls_back(self):
+        """Test strategies without a vectorized evaluator are calculated one account at a time."""
+        account = SavingsAccount(2000, 1, 10.0, date(2020, 1, 1), 50.0)
+        account.service_charge_strategy = FlatFeeStrategy(50.0)
+        charges = calculate_service_charges([self.accounts[1], account])
+        self.assertEqual(list(charges), [self.accounts[1].get_service_charges(), 1.25])
+
+    def test_fallback_forwards_as_of(self):
+        """Test the date which account ages are determined on reaches strategies without an evaluator."""
+        account = ChequingAccount(2000, 1, "Holder", 10.0, date_created=date(2020, 1, 1))
+        account.service_charge_strategy = FlatFeeStrategy(50.0)
+        as_of = date(2030, 1, 1)
+        self.assertEqual([2.5], list(calculate_service_charges([account], as_of)))
+        self.assertEqual(2.5, account.get_service_charges(as_of))
+
+    def test_empty(self):
+        """Test an empty batch gives an empty result."""
+        self.assertEqual(len(calculate_service_charges([])), 0)
+        self.assertEqual(len(AccountBook.from_accounts([]).get_service_charges()), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ the following command:
     python -m unittest tests/test_client.py
 """
 import unittest
+from unittest import mock
+from client import email_validation
 from client.client import Client
 from email_validator import EmailNotValidError, validate_email
 
@@ -95,5 +97,64 @@ class TestClient(unittest.TestCase):
         client = Client(101, "Jashanpreet", "Jattana", "jjattana@pixell-river.com")
         self.assertEqual(str(client), "Jattana, Jashanpreet [101] - jjattana@pixell-river.com")
 
+    def test_slotted_storage(self):
+        """
+        Ensures clients have no per-instance __dict__, including clients created with from_validated
+        """
+        for client in (Client(101, "Jashanpreet", "Jattana", "jjattana@pixell-river.com"),
+                       Client.from_validated(101, "Jashanpreet", "Jattana", "jjattana@pixell-river.com")):
+            self.assertFalse(hasattr(client, '__dict__'))
+            self.assertEqual(client.last_name, "Jattana")
+
+class TestEmailValidation(unittest.TestCase):
+    """
+    Unit tests for the cached email validation used by the Client class.
+    """
+
+    def setUp(self):
+        """
+        Starts each test with an empty validation cache.
+        """
+        email_validation.clear_cache()
+        self.addCleanup(email_validation.clear_cache)
+
+    def test_syntax_only_by_default(self):
+        """
+        Ensures that the default validation makes no deliverability (DNS) checks
+        """
+        with mock.patch.object(email_validation, 'validate_email', wraps=validate_email) as validator:
+            email_validation.validate_email_address("jjattana@pixell-river.com")
+        self.assertFalse(validator.call_args.kwargs['check_deliverability'])
+
+    def test_results_are_cached_by_normalized_address(self):
+        """
+        Ensures that an address is validated once, however its domain is capitalized
+        """
+        with mock.patch.object(email_validation, 'validate_email', wraps=validate_email) as validator:
+            first = email_validation.validate_email_address("jjattana@Pixell-River.com")
+            second = email_validation.validate_email_address(" jjattana@pixell-river.com ")
+        self.assertEqual("jjattana@pixell-river.com", first)
+        self.assertEqual(first, second)
+        self.assertEqual(1, validator.call_count)
+
+    def test_invalid_address(self):
+        """
+        Ensures that an invalid address is reported as None and kept as given by Client
+        """
+        self.assertIsNone(email_validation.validate_email_address("invalid-email"))
+        client = Client(101, "Jashanpreet", "Jattana", "invalid-email")
+        self.assertEqual("invalid-email", client.email_address)
+
+    def test_validate_many(self):
+        """
+        Ensures that bulk validation returns a result per distinct address and fills the cache
+        """
+        results = email_validation.validate_many(["a@pixell-river.com", "bad", "a@pixell-river.com"],
+                                                 max_workers=4)
+        self.assertEqual({"a@pixell-river.com": "a@pixell-river.com", "bad": None}, results)
+        with mock.patch.object(email_validation, 'validate_email') as validator:
+            Client(101, "Jashanpreet", "Jattana", "a@pixell-river.com")
+        validator.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Description: Unit tests for the EventBus class and accounts publishing to it.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from datetime import date
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.observer.event_bus import LARGE_TRANSACTION, LOW_BALANCE, EventBus
+from tests.test_subject import RecordingObserver
+
+class TestEventBus(unittest.TestCase):
+    """Unit tests for the EventBus class."""
+
+    def setUp(self):
+        """Set up an empty bus."""
+        self.bus = EventBus()
+        self.observer = RecordingObserver()
+
+    def test_account_subscription(self):
+        """Test an account subscription receives only that account's events."""
+        self.bus.subscribe(self.observer, account_number=1)
+        self.assertEqual(1, self.bus.publish(LOW_BALANCE, "one", account_number=1, client_number=10))
+        self.assertEqual(0, self.bus.publish(LOW_BALANCE, "two", account_number=2, client_number=10))
+        self.assertEqual(["one"], self.observer.messages)
+
+    def test_client_and_event_type_subscriptions(self):
+        """Test client and event type subscriptions receive matching events of any account."""
+        large = RecordingObserver()
+        self.bus.subscribe(self.observer, client_number=10)
+        self.bus.subscribe(large, event_type=LARGE_TRANSACTION)
+        self.bus.publish(LOW_BALANCE, "low", account_number=1, client_number=10)
+        self.bus.publish(LARGE_TRANSACTION, "large", account_number=2, client_number=20)
+        self.assertEqual(["low"], self.observer.messages)
+        self.assertEqual(["large"], large.messages)
+
+    def test_delivered_once(self):
+        """Test an observer matching an event through several subscriptions receives it once."""
+        self.bus.subscribe(self.observer, account_number=1)
+        self.bus.subscribe(self.observer, account_number=1)
+        self.bus.subscribe(self.observer, client_number=10, event_type=LOW_BALANCE)
+        self.bus.subscribe(self.observer)
+        self.assertEqual(3, self.bus.subscription_count())
+        self.bus.publish(LOW_BALANCE, "low", account_number=1, client_number=10)
+        self.assertEqual(["low"], self.observer.messages)
+
+    def test_unsubscribe(self):
+        """Test subscriptions are removed singly, by observer and by account."""
+        other = RecordingObserver()
+        self.bus.subscribe(self.observer, account_number=1)
+        self.bus.subscribe(self.observer, client_number=10)
+        self.bus.subscribe(other, account_number=1, event_type=LOW_BALANCE)
+        self.assertTrue(self.bus.unsubscribe(self.observer, account_number=1))
+        self.assertFalse(self.bus.unsubscribe(self.observer, account_number=1))
+        self.assertEqual(1, self.bus.unsubscribe_account(1))
+        self.assertEqual([self.observer], self.bus.subscribers(LOW_BALANCE, 1, 10))
+        self.assertEqual(1, self.bus.unsubscribe_all(self.observer))
+        self.assertEqual(0, self.bus.subscription_count())
+
+    def test_account_and_client(self):
+        """Test a subscription cannot be to both an account and a client."""
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(self.observer, account_number=1, client_number=10)
+
+class TestAccountEvents(unittest.TestCase):
+    """Unit tests for accounts publishing their notifications to the event bus."""
+
+    def setUp(self):
+        """Give accounts a bus of their own."""
+        self.bus = EventBus()
+        patcher = mock.patch.object(BankAccount, 'EVENT_BUS', self.bus)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.observer = RecordingObserver()
+
+    def test_attach_and_detach(self):
+        """Test attaching subscribes to the account's events without an observer list per account."""
+        account = ChequingAccount(1, 10, "Holder", 100.0, date_created=date(2020, 1, 1))
+        account.attach(self.observer)
+        self.assertIsNone(account._observers)
+        account.update_balance(-60.0)
+        account.detach(self.observer)
+        account.update_balance(-10.0)
+        self.assertEqual(["Low balance warning $40.00: on account 1."], self.observer.messages)
+        self.assertEqual(0, self.bus.subscription_count())
+
+    def test_client_receives_every_account(self):
+        """Test one client subscription covers all of the client's accounts."""
+        self.bus.subscribe(self.observer, client_number=10, event_type=LARGE_TRANSACTION)
+        chequing = ChequingAccount(1, 10, "Holder", 100.0, date_created=date(2020, 1, 1))
+        savings = SavingsAccount(2, 10, 100.0, date(2020, 1, 1), 50.0)
+        unrelated = SavingsAccount(3, 11, 100.0, date(2020, 1, 1), 50.0)
+        chequing.update_balance(-90.0)
+        savings.update_balance(20000.0)
+        unrelated.update_balance(20000.0)
+        self.assertEqual(["Large transaction $20000.00: on account 2."], self.observer.messages)
+
+if __name__ == "__main__":
+    unittest.main()
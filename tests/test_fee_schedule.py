@@ -0,0 +1,189 @@
+"""
+Description: Unit tests for the table-driven fee schedule.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import json
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from bank_account.account_book import AccountBook
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.strategy.batch_service_charges import calculate_service_charges
+from patterns.strategy.fee_schedule import FeeRule, FeeSchedule, FeeScheduleStrategy
+from user_interface import data_snapshot, month_end
+
+AS_OF = date(2024, 6, 30)
+
+class TestFeeRule(unittest.TestCase):
+    """Unit tests for FeeRule."""
+
+    def setUp(self):
+        """Set up a rule with several balance and age tiers."""
+        self.rule = FeeRule.from_dict('ChequingAccount', {
+            'base_charge': 4.0,
+            'balance_tiers': [{'below': 0.0, 'charge': 1.5},
+                              {'below': -500.0, 'charge': 1.5, 'rate': 0.1},
+                              {'below': 1000.0, 'charge': 0.5}],
+            'age_tiers': [{'older_than_years': 20, 'charge': 3.0}, {'older_than_years': 5, 'charge': 1.0}],
+        })
+
+    def test_balance_tiers(self):
+        """Test a balance is charged by the tier with the lowest threshold it is under."""
+        recent = AS_OF - timedelta(days=30)
+        self.assertEqual(4.0, self.rule.charge(1000.0, recent, AS_OF))
+        self.assertEqual(4.5, self.rule.charge(999.99, recent, AS_OF))
+        self.assertEqual(4.5, self.rule.charge(0.0, recent, AS_OF))
+        self.assertEqual(5.5, self.rule.charge(-500.0, recent, AS_OF))
+        self.assertAlmostEqual(15.5, self.rule.charge(-600.0, recent, AS_OF))
+
+    def test_age_tiers(self):
+        """Test an account is charged by the highest age tier it is older than."""
+        self.assertEqual(4.0, self.rule.charge(2000.0, date(2019, 7, 1), AS_OF))
+        self.assertEqual(5.0, self.rule.charge(2000.0, date(2019, 6, 1), AS_OF))
+        self.assertEqual(7.0, self.rule.charge(2000.0, date(2000, 1, 1), AS_OF))
+
+    def test_vectorized_matches_scalar(self):
+        """Test array evaluation gives the same charges as evaluating each account."""
+        rng = random.Random(5)
+        balances = [round(rng.uniform(-2000.0, 2000.0), 2) for _ in range(500)] + [0.0, -500.0, 1000.0]
+        dates = [AS_OF - timedelta(days=rng.randint(0, 30 * 365)) for _ in balances]
+        expected = [self.rule.charge(balance, created, AS_OF) for balance, created in zip(balances, dates)]
+        self.assertEqual(expected, self.rule.charges(balances, dates, AS_OF).tolist())
+
+    def test_charge_cents(self):
+        """Test charges in cents are exact, with the rate charge rounded to the nearest cent."""
+        recent = AS_OF - timedelta(days=30)
+        self.assertEqual(1550, self.rule.charge_cents(-60000, recent, AS_OF))
+        # 0.1 * 0.05 is half a cent, which rounds up.
+        self.assertEqual(551, self.rule.charge_cents(-50005, recent, AS_OF))
+        self.assertEqual(700, self.rule.charge_cents(200000, date(2000, 1, 1), AS_OF))
+
+    def test_invalid_rules(self):
+        """Test invalid rule descriptions are rejected."""
+        for config in ({'base_charge': True},
+                       {'base_charge': 'five'},
+                       {'fee': 1.0},
+                       {'balance_tiers': {'below': 0.0}},
+                       {'balance_tiers': [{'charge': 1.0}]},
+                       {'balance_tiers': [{'below': 0.0, 'fee': 1.0}]},
+                       {'balance_tiers': [{'below': 0.0}, {'below': 0.0, 'charge': 1.0}]},
+                       {'age_tiers': [{'older_than_years': -1, 'charge': 1.0}]},
+                       {'age_tiers': [{'older_than_years': float('nan')}]}):
+            with self.subTest(config=config):
+                with self.assertRaises(ValueError):
+                    FeeRule.from_dict('SavingsAccount', config)
+
+    def test_immutable_and_picklable(self):
+        """Test rules cannot be changed and unpickle as the same compiled rule."""
+        with self.assertRaises(AttributeError):
+            self.rule.base_charge = 0.0
+        self.assertIs(self.rule, pickle.loads(pickle.dumps(self.rule)))  # nosec B301
+
+class TestFeeSchedule(unittest.TestCase):
+    """Unit tests for FeeSchedule and FeeScheduleStrategy."""
+
+    def setUp(self):
+        """Load the default schedule and set up accounts with the matching built-in strategies."""
+        self.schedule = FeeSchedule.load()
+        rng = random.Random(13)
+        self.accounts = []
+        for number in range(300):
+            balance = round(rng.uniform(-3000.0, 3000.0), 2)
+            created = AS_OF - timedelta(days=rng.randint(0, 20 * 365))
+            kind = number % 3
+            if kind == 0:
+                account = ChequingAccount(number, 1, "Holder", balance, 1000.0, 0.05, created)
+            elif kind == 1:
+                account = SavingsAccount(number, 1, balance, created, 50.0)
+            else:
+                account = InvestmentAccount(number, 1, balance, created, 2.55)
+            self.accounts.append(account)
+
+    def test_default_schedule_matches_strategies(self):
+        """Test the default schedule charges as the built-in strategies do."""
+        expected = [account.service_charge_strategy.calculate_service_charges(account, AS_OF)
+                    if isinstance(account, InvestmentAccount) else account.get_service_charges()
+                    for account in self.accounts]
+        self.assertEqual(3, self.schedule.apply_to(self.accounts[:3]))
+        self.schedule.apply_to(self.accounts)
+        self.assertEqual(expected, [account.service_charge_strategy.calculate_service_charges(account, AS_OF)
+                                    for account in self.accounts])
+        self.assertEqual(expected, calculate_service_charges(self.accounts, AS_OF).tolist())
+
+    def test_accounts_after_apply_to(self):
+        """Test accounts charged by a schedule keep their own terms and still describe, snapshot and charge."""
+        schedule = FeeSchedule.from_dict({'ChequingAccount': {'base_charge': 55.0},
+                                          'SavingsAccount': {'base_charge': 99.0},
+                                          'InvestmentAccount': {'base_charge': 77.0}})
+        accounts = self.accounts[:3]
+        fingerprints = [month_end.fingerprint(account) for account in accounts]
+        schedule.apply_to(accounts)
+
+        self.assertEqual([55.0, 99.0, 77.0], [account.get_service_charges(AS_OF) for account in accounts])
+        self.assertEqual([5500, 9900, 7700], [account.get_service_charges_cents(AS_OF) for account in accounts])
+        self.assertEqual([55.0, 99.0, 77.0], calculate_service_charges(accounts, AS_OF).tolist())
+        self.assertIn("Overdraft Limit: $1000.00", str(accounts[0]))
+        self.assertIn("Minimum Balance: $50.00", str(accounts[1]))
+        self.assertIn("Management Fee: $2.55", str(accounts[2]))
+        book = AccountBook.from_accounts(accounts)
+        self.assertEqual([1000.0, 50.0, 2.55],
+                         [book.overdraft_limits[0], book.minimum_balances[1], book.management_fees[2]])
+        self.assertTrue(all(before != month_end.fingerprint(account)
+                            for before, account in zip(fingerprints, accounts)))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'snapshot.bin')
+            data_snapshot.write_snapshot(path, [], [], accounts)
+            _, restored = data_snapshot.read_snapshot(path, [])
+        self.assertEqual([(account.balance, str(account)) for account in accounts],
+                         [(account.balance, str(account)) for account in restored])
+
+    def test_account_book(self):
+        """Test a whole book is charged by the schedule, ignoring the accounts' own parameters."""
+        book = AccountBook.from_accounts(self.accounts)
+        self.schedule.apply_to(self.accounts)
+        expected = [account.service_charge_strategy.calculate_service_charges(account, AS_OF)
+                    for account in self.accounts]
+        self.assertEqual(expected, book.get_scheduled_charges(self.schedule, AS_OF).tolist())
+
+    def test_shared_strategies(self):
+        """Test accounts of one type share a strategy, which survives pickling."""
+        strategy = self.schedule.strategy(ChequingAccount)
+        self.assertIsInstance(strategy, FeeScheduleStrategy)
+        self.assertIs(strategy, self.schedule.strategy('ChequingAccount'))
+        self.assertIs(strategy, pickle.loads(pickle.dumps(strategy)))  # nosec B301
+        account = ChequingAccount(1, 1, "Holder", -1100.1, date_created=AS_OF)
+        account.service_charge_strategy = strategy
+        self.assertEqual(1001, account.get_service_charges_cents())
+
+    def test_missing_rule(self):
+        """Test an account type without a rule is rejected without changing any strategy."""
+        schedule = FeeSchedule.from_dict({'SavingsAccount': {}})
+        strategies = [account.service_charge_strategy for account in self.accounts]
+        with self.assertRaises(ValueError):
+            schedule.apply_to(self.accounts)
+        self.assertEqual(strategies, [account.service_charge_strategy for account in self.accounts])
+
+    def test_load_errors(self):
+        """Test files which are not valid schedules are rejected."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'schedule.json')
+            with open(path, 'w') as file:
+                file.write('{"SavingsAccount": ')
+            with self.assertRaises(ValueError):
+                FeeSchedule.load(path)
+            with open(path, 'w') as file:
+                json.dump([{'base_charge': 5.0}], file)
+            with self.assertRaises(ValueError):
+                FeeSchedule.load(path)
+            with self.assertRaises(FileNotFoundError):
+                FeeSchedule.load(os.path.join(temp_dir, 'missing.json'))
+
+if __name__ == "__main__":
+    unittest.main()
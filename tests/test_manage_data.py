@@ -0,0 +1,499 @@
+"""
+Description: Unit tests for the manage_data module.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import csv
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from user_interface import manage_data
+
+CLIENT_ROWS = [
+    {'client_number': '1001', 'first_name': 'John', 'last_name': 'Doe', 'email': 'johndoe@pixell.com'},
+    {'client_number': '1002', 'first_name': 'Jane', 'last_name': 'Smith', 'email': 'janesmith@pixell.com'},
+]
+
+ACCOUNT_FIELDS = ['account_number', 'client_number', 'account_holder', 'balance', 'date_created',
+                  'account_type', 'overdraft_limit', 'overdraft_rate', 'minimum_balance', 'management_fee']
+
+ACCOUNT_ROWS = [
+    {'account_number': '20001', 'client_number': '1001', 'account_holder': 'John', 'balance': '150.0',
+     'date_created': '2023-01-10', 'account_type': 'ChequingAccount', 'overdraft_limit': '100',
+     'overdraft_rate': '0.05', 'minimum_balance': '', 'management_fee': ''},
+    {'account_number': '20002', 'client_number': '1001', 'account_holder': 'John', 'balance': '250.0',
+     'date_created': '2023-01-15', 'account_type': 'ChequingAccount', 'overdraft_limit': '100',
+     'overdraft_rate': '0.05', 'minimum_balance': '', 'management_fee': ''},
+    {'account_number': '20003', 'client_number': '1002', 'account_holder': 'Jane', 'balance': '350.0',
+     'date_created': '2023-02-01', 'account_type': 'ChequingAccount', 'overdraft_limit': '200',
+     'overdraft_rate': '0.035', 'minimum_balance': '', 'management_fee': ''},
+]
+
+class ManageDataTestCase(unittest.TestCase):
+    """Base test case which points manage_data at temporary data files."""
+
+    def setUp(self):
+        """Write the sample data files to a temporary directory and patch the data paths."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.clients_path = os.path.join(self.temp_dir.name, 'clients.csv')
+        self.accounts_path = os.path.join(self.temp_dir.name, 'accounts.csv')
+        self.journal_path = os.path.join(self.temp_dir.name, 'accounts_journal.csv')
+        self.snapshot_path = os.path.join(self.temp_dir.name, 'snapshot.bin')
+
+        self.write_csv(self.clients_path, list(CLIENT_ROWS[0]), CLIENT_ROWS)
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, ACCOUNT_ROWS)
+
+        for name, value in (('clients_csv_path', self.clients_path),
+                            ('accounts_csv_path', self.accounts_path),
+                            ('accounts_journal_path', self.journal_path),
+                            ('snapshot_path', self.snapshot_path)):
+            patcher = mock.patch.object(manage_data, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def write_csv(path, fields, rows):
+        """Write rows to a CSV file."""
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def read_balances(self):
+        """Return the balances stored in the accounts CSV file, keyed by account number."""
+        with open(self.accounts_path, newline='') as file:
+            return {row['account_number']: row['balance'] for row in csv.DictReader(file)}
+
+class TestLoadData(ManageDataTestCase):
+    """Unit tests for load_data."""
+
+    def test_load_data(self):
+        """Test that clients and accounts are loaded and keyed by number."""
+        clients, accounts = manage_data.load_data()
+        self.assertEqual([1001, 1002], list(clients))
+        self.assertEqual([20001, 20002, 20003], list(accounts))
+        self.assertEqual(250.0, accounts[20002].balance)
+
+    def test_load_account_repository(self):
+        """Test that the loaded repository is indexed by client number."""
+        _, repository = manage_data.load_account_repository()
+        self.assertEqual([20001, 20002],
+                         [account.account_number for account in repository.accounts_for_client(1001)])
+
+class TestIterators(ManageDataTestCase):
+    """Unit tests for the iter_clients and iter_accounts generators."""
+
+    def test_iter_clients_is_lazy(self):
+        """Test that iter_clients yields clients one at a time."""
+        clients = manage_data.iter_clients()
+        self.assertEqual(1001, next(clients).client_number)
+        self.assertEqual(1002, next(clients).client_number)
+        with self.assertRaises(StopIteration):
+            next(clients)
+
+    def test_iter_accounts(self):
+        """Test that iter_accounts yields every valid account in file order."""
+        self.assertEqual([20001, 20002, 20003],
+                         [account.account_number for account in manage_data.iter_accounts()])
+
+    def test_iter_accounts_filters_unknown_clients(self):
+        """Test that accounts of unknown clients are skipped when client numbers are given."""
+        with self.assertLogs(level='ERROR'):
+            accounts = list(manage_data.iter_accounts(client_numbers={1002}))
+        self.assertEqual([20003], [account.account_number for account in accounts])
+
+    def test_iter_accounts_skips_invalid_records(self):
+        """Test that invalid records are logged and skipped."""
+        rows = ACCOUNT_ROWS + [dict(ACCOUNT_ROWS[0], account_number='20004', balance='abc'),
+                               dict(ACCOUNT_ROWS[0], account_number='20005', account_type='Unknown')]
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, rows)
+        with self.assertLogs(level='ERROR') as logs:
+            accounts = list(manage_data.iter_accounts())
+        self.assertEqual(3, len(accounts))
+        self.assertEqual(2, len(logs.output))
+
+    def test_null_optional_values(self):
+        """Test that 'Null' optional values are treated as missing."""
+        rows = [dict(ACCOUNT_ROWS[0], overdraft_limit='Null', overdraft_rate='Null', minimum_balance='Null')]
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, rows)
+        account, = manage_data.iter_accounts()
+        self.assertEqual(1000.0, account.overdraft_limit)
+
+class TestParallelLoad(ManageDataTestCase):
+    """Unit tests for the parallel accounts.csv loader."""
+
+    def setUp(self):
+        """Write a larger accounts file containing some invalid records."""
+        super().setUp()
+        patcher = mock.patch.object(manage_data, 'SNAPSHOT_ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        rows = []
+        for number in range(30000, 30200):
+            row = dict(ACCOUNT_ROWS[number % 3], account_number=str(number), balance=f"{number / 7:.2f}")
+            if number % 50 == 0:
+                row['account_type'] = 'Unknown'
+            rows.append(row)
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, rows)
+
+    def test_parallel_matches_serial(self):
+        """Test that the parallel loader returns the same accounts and errors as the serial path."""
+        with self.assertLogs(level='ERROR') as serial_logs:
+            _, serial_accounts = manage_data.load_data()
+
+        with mock.patch.object(manage_data, 'PARALLEL_MIN_BYTES', 0):
+            with self.assertLogs(level='ERROR') as parallel_logs:
+                _, parallel_accounts = manage_data.load_data(workers=3)
+
+        self.assertEqual(list(serial_accounts), list(parallel_accounts))
+        self.assertEqual([account.balance for account in serial_accounts.values()],
+                         [account.balance for account in parallel_accounts.values()])
+        self.assertEqual(serial_logs.output, parallel_logs.output)
+
+    def test_large_files_are_parsed_in_parallel_by_default(self):
+        """Test that load_data uses a process per CPU once accounts.csv reaches PARALLEL_MIN_BYTES."""
+        with mock.patch.object(manage_data, '_iter_account_records_parallel',
+                               wraps=manage_data._iter_account_records_parallel) as parallel:
+            with mock.patch.object(manage_data.os, 'cpu_count', return_value=2):
+                with self.assertLogs(level='ERROR'):
+                    manage_data.load_data()
+                parallel.assert_not_called()
+
+                with mock.patch.object(manage_data, 'PARALLEL_MIN_BYTES', 0):
+                    with self.assertLogs(level='ERROR'):
+                        _, accounts = manage_data.load_data()
+        parallel.assert_called_once_with(mock.ANY, 2)
+        self.assertEqual(196, len(accounts))
+
+    def test_ranges_are_line_aligned(self):
+        """Test that every byte range starts at the beginning of a line and the ranges cover the file."""
+        with open(self.accounts_path, 'rb') as file:
+            data = file.read()
+            file.seek(0)
+            with manage_data.mmap.mmap(file.fileno(), 0, access=manage_data.mmap.ACCESS_READ) as mapped:
+                header_end = data.index(b'\n') + 1
+                ranges = manage_data._line_aligned_ranges(mapped, header_end, 4)
+
+        self.assertEqual(4, len(ranges))
+        self.assertEqual(header_end, ranges[0][0])
+        self.assertEqual(len(data), ranges[-1][1])
+        for (_, end), (begin, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, begin)
+            self.assertEqual(ord('\n'), data[begin - 1])
+
+class TestSnapshot(ManageDataTestCase):
+    """Unit tests for the binary snapshot used by load_data."""
+
+    def load_from_snapshot(self):
+        """Load the data, failing if the CSV files are parsed."""
+        with mock.patch.object(manage_data, 'iter_clients', side_effect=AssertionError("CSV parsed")):
+            return manage_data.load_data()
+
+    def test_load_data_writes_snapshot(self):
+        """Test that a successful load writes the snapshot."""
+        manage_data.load_data()
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+    def test_snapshot_matches_csv(self):
+        """Test that data loaded from the snapshot matches data parsed from the CSV files."""
+        clients, accounts = manage_data.load_data()
+        snapshot_clients, snapshot_accounts = self.load_from_snapshot()
+
+        self.assertEqual([str(client) for client in clients.values()],
+                         [str(client) for client in snapshot_clients.values()])
+        self.assertEqual([(type(account), account.balance, account.overdraft_limit) for account in accounts.values()],
+                         [(type(account), account.balance, account.overdraft_limit) for account in snapshot_accounts.values()])
+
+    def test_snapshot_includes_journal(self):
+        """Test that journaled balances are part of the snapshot and journal changes invalidate it."""
+        manage_data.update_data(ChequingAccount(20001, 1001, "John", 5.0))
+        manage_data.load_data()
+        _, accounts = self.load_from_snapshot()
+        self.assertEqual(5.0, accounts[20001].balance)
+
+        manage_data.update_data(ChequingAccount(20001, 1001, "John", 6.0))
+        _, accounts = manage_data.load_data()
+        self.assertEqual(6.0, accounts[20001].balance)
+
+    def test_changed_csv_invalidates_snapshot(self):
+        """Test that the CSV files are parsed again after they change."""
+        manage_data.load_data()
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, ACCOUNT_ROWS[:1])
+        _, accounts = manage_data.load_data()
+        self.assertEqual([20001], list(accounts))
+
+    def test_snapshot_stores_every_account_type(self):
+        """Test that savings and investment accounts are recreated from the snapshot with their parameters."""
+        rows = ACCOUNT_ROWS[:1] + [
+            {'account_number': '20004', 'client_number': '1002', 'account_holder': '', 'balance': '75.25',
+             'date_created': '2022-05-01', 'account_type': 'SavingsAccount', 'overdraft_limit': 'Null',
+             'overdraft_rate': 'Null', 'minimum_balance': '50', 'management_fee': 'Null'},
+            {'account_number': '20005', 'client_number': '1002', 'account_holder': 'Jané', 'balance': '9000',
+             'date_created': '2010-12-31', 'account_type': 'InvestmentAccount', 'overdraft_limit': 'Null',
+             'overdraft_rate': 'Null', 'minimum_balance': 'Null', 'management_fee': '2.55'},
+        ]
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, rows)
+
+        def describe(accounts):
+            return [(type(account), account.account_number, account.client_number, account.account_holder,
+                     account.balance, account.date_created, account.service_charge_strategy)
+                    for account in accounts.values()]
+
+        _, accounts = manage_data.load_data()
+        _, snapshot_accounts = self.load_from_snapshot()
+        self.assertEqual(describe(accounts), describe(snapshot_accounts))
+
+    def test_snapshot_is_not_used_for_cents_accounts(self):
+        """Test that a snapshot of float balances is not used when accounts store cents."""
+        manage_data.load_data()
+        with mock.patch.object(BankAccount, 'USE_CENTS', True):
+            self.assertIsNone(manage_data.data_snapshot.read_snapshot(
+                self.snapshot_path, [self.clients_path, self.accounts_path, self.journal_path], True))
+
+    def test_touched_csv_invalidates_snapshot(self):
+        """Test that a changed modification time makes the snapshot stale without hashing the file."""
+        manage_data.load_data()
+        stat = os.stat(self.accounts_path)
+        os.utime(self.accounts_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        with mock.patch.object(manage_data, 'iter_clients', wraps=manage_data.iter_clients) as iter_clients:
+            manage_data.load_data()
+        iter_clients.assert_called_once()
+
+    def test_rewritten_csv_invalidates_snapshot(self):
+        """Test that changed contents make the snapshot stale even with the same size and modification time."""
+        manage_data.load_data()
+        stat = os.stat(self.accounts_path)
+        with open(self.accounts_path, 'r+b') as file:
+            contents = file.read()
+            file.seek(0)
+            file.write(contents.replace(b'20001', b'20009'))
+        os.utime(self.accounts_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(stat.st_size, os.stat(self.accounts_path).st_size)
+
+        _, accounts = manage_data.load_data()
+        self.assertIn(20009, accounts)
+        self.assertNotIn(20001, accounts)
+
+    def test_corrupt_snapshot_is_ignored(self):
+        """Test that an unreadable snapshot falls back to parsing the CSV files."""
+        manage_data.load_data()
+        with open(self.snapshot_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.snapshot_path) - 3)
+        _, accounts = manage_data.load_data()
+        self.assertEqual([20001, 20002, 20003], list(accounts))
+
+class TestSqliteBackend(ManageDataTestCase):
+    """Unit tests for the sqlite storage backend."""
+
+    def setUp(self):
+        """Select the sqlite backend with a database in the temporary directory."""
+        super().setUp()
+        self.database_path = os.path.join(self.temp_dir.name, 'pixell_river.db')
+        for name, value in (('STORAGE_BACKEND', 'sqlite'),
+                            ('sqlite_db_path', self.database_path),
+                            ('_sqlite_connection', None)):
+            patcher = mock.patch.object(manage_data, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(manage_data.close_sqlite_connection)
+
+    def test_database_is_imported_from_csv(self):
+        """Test that a new database is populated from the data files."""
+        clients, accounts = manage_data.load_data()
+        self.assertTrue(os.path.exists(self.database_path))
+        self.assertEqual([1001, 1002], list(clients))
+        self.assertEqual([20001, 20002, 20003], list(accounts))
+        self.assertEqual(350.0, accounts[20003].balance)
+
+    def test_wal_mode(self):
+        """Test that the database uses write-ahead logging."""
+        connection = manage_data.get_sqlite_connection()
+        self.assertEqual('wal', connection.execute("PRAGMA journal_mode").fetchone()[0])
+
+    def test_update_data_updates_row(self):
+        """Test that update_data updates the database and leaves the data files untouched."""
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 12.5))
+        _, accounts = manage_data.load_data()
+        self.assertEqual(12.5, accounts[20002].balance)
+        self.assertEqual('250.0', self.read_balances()['20002'])
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_load_client_accounts(self):
+        """Test that a client's accounts are loaded with an indexed query."""
+        accounts = manage_data.load_client_accounts(1001)
+        self.assertEqual([20001, 20002], [account.account_number for account in accounts])
+
+        plan = manage_data.get_sqlite_connection().execute(
+            "EXPLAIN QUERY PLAN " + manage_data.sqlite_storage.SELECT_CLIENT_ACCOUNTS, (1001,)).fetchall()
+        self.assertIn('accounts_client_number', ' '.join(row[-1] for row in plan))
+
+    def test_load_clients(self):
+        """Test that clients are loaded from the database without reading any accounts."""
+        manage_data.get_sqlite_connection()
+        with mock.patch.object(manage_data.sqlite_storage, 'iter_account_records',
+                               side_effect=AssertionError("accounts read")):
+            self.assertEqual([1001, 1002], list(manage_data.load_clients()))
+
+    def test_import_csv_to_sqlite(self):
+        """Test that re-importing replaces stored records with the data file contents."""
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 12.5))
+        manage_data.import_csv_to_sqlite()
+        _, accounts = manage_data.load_data()
+        self.assertEqual(250.0, accounts[20002].balance)
+
+    def test_import_skips_invalid_numbers(self):
+        """Test that records with a non-integer number are skipped and the others imported in account order."""
+        bad_account = dict(ACCOUNT_ROWS[0], account_number='2000X')
+        self.write_csv(self.accounts_path, ACCOUNT_FIELDS, [ACCOUNT_ROWS[2], bad_account, ACCOUNT_ROWS[0]])
+        self.write_csv(self.clients_path, list(CLIENT_ROWS[0]), CLIENT_ROWS + [dict(CLIENT_ROWS[0], client_number='')])
+        manage_data.get_sqlite_connection()
+        with self.assertLogs(level='ERROR') as logs:
+            manage_data.import_csv_to_sqlite()
+        self.assertEqual(2, len(logs.records))
+        clients, accounts = manage_data.load_data()
+        self.assertEqual([1001, 1002], list(clients))
+        self.assertEqual([20001, 20003], list(accounts))
+
+    def test_csv_backend_still_selectable(self):
+        """Test that the csv backend ignores the database."""
+        with mock.patch.object(manage_data, 'STORAGE_BACKEND', 'csv'):
+            manage_data.load_data()
+            self.assertEqual([20003], [account.account_number for account in manage_data.load_client_accounts(1002)])
+            self.assertEqual([1001, 1002], list(manage_data.load_clients()))
+        self.assertFalse(os.path.exists(self.database_path))
+
+class TestJournal(ManageDataTestCase):
+    """Unit tests for the journaled update_data persistence."""
+
+    def test_update_data_appends_to_journal(self):
+        """Test that update_data appends to the journal and leaves accounts.csv untouched."""
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 999.5))
+        self.assertEqual({20002: '999.5'}, manage_data.read_journal())
+        self.assertEqual('250.0', self.read_balances()['20002'])
+
+    def test_load_data_replays_journal(self):
+        """Test that the latest journaled balance is applied on load."""
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 999.5))
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 10.25))
+        _, accounts = manage_data.load_data()
+        self.assertEqual(10.25, accounts[20002].balance)
+        self.assertEqual(150.0, accounts[20001].balance)
+
+    def test_compact_journal(self):
+        """Test that compaction folds the journal into accounts.csv and empties it."""
+        manage_data.update_data(ChequingAccount(20001, 1001, "John", 1.5))
+        manage_data.update_data(ChequingAccount(20003, 1002, "Jane", 3.5))
+        manage_data.compact_journal()
+        self.assertEqual({'20001': '1.5', '20002': '250.0', '20003': '3.5'}, self.read_balances())
+        self.assertEqual({}, manage_data.read_journal())
+
+    def test_update_during_compaction_is_kept(self):
+        """Test that a balance written by another thread while the journal is compacted is not lost."""
+        manage_data.update_data(ChequingAccount(20001, 1001, "John", 1.5))
+        rewrite_accounts = manage_data._rewrite_accounts
+        rewriting = threading.Event()
+
+        def slow_rewrite(balances):
+            rewriting.set()
+            time.sleep(0.2)
+            rewrite_accounts(balances)
+
+        def update():
+            rewriting.wait(5)
+            manage_data.update_data(ChequingAccount(20002, 1001, "John", 999.5))
+
+        writer = threading.Thread(target=update)
+        writer.start()
+        with mock.patch.object(manage_data, '_rewrite_accounts', side_effect=slow_rewrite):
+            manage_data.compact_journal()
+        writer.join(5)
+        _, accounts = manage_data.load_data()
+        self.assertEqual(1.5, accounts[20001].balance)
+        self.assertEqual(999.5, accounts[20002].balance)
+
+    def test_update_data_compacts_large_journal(self):
+        """Test that update_data compacts the journal once it exceeds the size limit."""
+        with mock.patch.object(manage_data, 'JOURNAL_COMPACT_BYTES', 1):
+            manage_data.update_data(ChequingAccount(20001, 1001, "John", 7.0))
+        self.assertEqual('7.0', self.read_balances()['20001'])
+        self.assertEqual({}, manage_data.read_journal())
+
+    def test_update_many_appends_once(self):
+        """Test that update_many journals the last balance of each account."""
+        manage_data.update_many([ChequingAccount(20001, 1001, "John", 1.0),
+                                 ChequingAccount(20002, 1001, "John", 2.0),
+                                 ChequingAccount(20001, 1001, "John", 3.0)])
+        self.assertEqual({20001: '3.0', 20002: '2.0'}, manage_data.read_journal())
+        with open(self.journal_path) as file:
+            self.assertEqual(3, len(file.readlines()))
+
+    def test_update_many_without_journal(self):
+        """Test that update_many rewrites accounts.csv once for the whole batch."""
+        with mock.patch.object(manage_data, 'JOURNAL_ENABLED', False), \
+             mock.patch.object(manage_data, '_rewrite_accounts', wraps=manage_data._rewrite_accounts) as rewrite:
+            manage_data.update_many([ChequingAccount(20001, 1001, "John", 1.0),
+                                     ChequingAccount(20003, 1002, "Jane", 3.0)])
+        rewrite.assert_called_once()
+        self.assertEqual({'20001': '1.0', '20002': '250.0', '20003': '3.0'}, self.read_balances())
+
+    def test_update_data_without_journal(self):
+        """Test that disabling the journal rewrites accounts.csv directly."""
+        with mock.patch.object(manage_data, 'JOURNAL_ENABLED', False):
+            manage_data.update_data(ChequingAccount(20003, 1002, "Jane", 42.0))
+        self.assertEqual('42.0', self.read_balances()['20003'])
+        self.assertFalse(os.path.exists(self.journal_path))
+
+class TestCents(ManageDataTestCase):
+    """Unit tests for loading and saving accounts which store their balance in cents."""
+
+    def setUp(self):
+        """Create accounts which store cents, without a snapshot from float accounts."""
+        super().setUp()
+        patcher = mock.patch.object(BankAccount, 'USE_CENTS', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(manage_data, 'SNAPSHOT_ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_and_update(self):
+        """Test balances load as cents and are written back with two decimal places."""
+        _, accounts = manage_data.load_data()
+        account = accounts[20001]
+        self.assertTrue(account.uses_cents)
+        self.assertEqual(15000, account.balance_cents)
+        for _ in range(3):
+            account.deposit(0.1)
+        manage_data.update_data(account)
+        self.assertEqual({20001: '150.30'}, manage_data.read_journal())
+        _, accounts = manage_data.load_data()
+        self.assertEqual(15030, accounts[20001].balance_cents)
+
+    def test_parse_range_restores_flag(self):
+        """Test parsing a range in this process does not leave BankAccount.USE_CENTS changed."""
+        with open(self.accounts_path, 'rb') as file:
+            data = file.read()
+        header_end = data.index(b'\n') + 1
+        with mock.patch.object(BankAccount, 'USE_CENTS', False):
+            pairs, errors = manage_data._parse_account_range(self.accounts_path, ACCOUNT_FIELDS,
+                                                             (header_end, len(data)), {}, None, True)
+            self.assertFalse(BankAccount.USE_CENTS)
+        self.assertEqual([], errors)
+        self.assertTrue(all(account.uses_cents for _, account in pairs))
+
+    def test_parallel_load(self):
+        """Test worker processes create accounts which store cents."""
+        with mock.patch.object(manage_data, 'PARALLEL_MIN_BYTES', 0):
+            _, accounts = manage_data.load_data(workers=2)
+        self.assertTrue(all(account.uses_cents for account in accounts.values()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Description: Unit tests for the money module and accounts which store their balance in cents.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from fractions import Fraction
+from unittest import mock
+import numpy as np
+from bank_account.account_book import AccountBook
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from utility import money
+
+class TestMoney(unittest.TestCase):
+    """Unit tests for the money conversion functions."""
+
+    def test_to_cents(self):
+        """Test amounts of each supported type convert to the expected cents."""
+        self.assertEqual(money.to_cents(12), 1200)
+        self.assertEqual(money.to_cents(19.99), 1999)
+        self.assertEqual(money.to_cents(0.1), 10)
+        self.assertEqual(money.to_cents(" -12.3 "), -1230)
+        self.assertEqual(money.to_cents(Decimal("1.005")), 101)
+        self.assertEqual(money.to_cents(-0.005), -1)
+        self.assertEqual(money.to_cents(Fraction(1, 8)), 13)
+
+    def test_to_cents_invalid(self):
+        """Test values which are not finite numbers raise ValueError."""
+        for value in ("abc", "", float('nan'), float('inf'), None, True):
+            with self.assertRaises(ValueError):
+                money.to_cents(value)
+
+    def test_format_cents(self):
+        """Test cents are formatted with two decimal places."""
+        self.assertEqual(money.format_cents(123456), "1234.56")
+        self.assertEqual(money.format_cents(-5), "-0.05")
+        self.assertEqual(money.format_cents(0), "0.00")
+
+    def test_multiply_cents(self):
+        """Test multiplication by a rate rounds half a cent away from zero."""
+        self.assertEqual(money.multiply_cents(10, 0.05), 1)
+        self.assertEqual(money.multiply_cents(9, 0.05), 0)
+        self.assertEqual(money.multiply_cents(-10, 0.05), -1)
+        self.assertEqual(money.multiply_cents(12345, 0.035), 432)
+
+    def test_to_cents_array(self):
+        """Test arrays of amounts convert to int64 cents."""
+        cents = money.to_cents_array([1.15, -0.01, 1234567.89])
+        self.assertEqual(cents.dtype, np.int64)
+        self.assertEqual(cents.tolist(), [115, -1, 123456789])
+
+    def test_to_cents_array_matches_to_cents(self):
+        """Test arrays round half a cent away from zero from each amount's decimal value, as to_cents does."""
+        amounts = [0.125, -0.125, 1.005, -1.005, 2.675, 0.005, 0.0, -0.0, 12.345, 1e15 + 0.5]
+        amounts += [index / 1000 - 500 for index in range(0, 1000000, 37)]
+        self.assertEqual(money.to_cents_array(amounts).tolist(), [money.to_cents(amount) for amount in amounts])
+        with self.assertRaises(ValueError):
+            money.to_cents_array([1.0, float('nan')])
+
+class TestCentsAccounts(unittest.TestCase):
+    """Unit tests for accounts created with BankAccount.USE_CENTS set."""
+
+    def setUp(self):
+        """Create accounts which store cents."""
+        patcher = mock.patch.object(BankAccount, 'USE_CENTS', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.chequing = ChequingAccount(1001, 1, "Ann Lee", 0.0, 100.0, 0.05, date(2020, 1, 15))
+        self.savings = SavingsAccount(1002, 1, 50.0, date(2019, 6, 1), 50.0)
+        self.investment = InvestmentAccount(1003, 2, 2500.0, date.today() - timedelta(days=4000), 2.55)
+
+    def test_exact_arithmetic(self):
+        """Test repeated deposits and withdrawals of cent amounts are exact."""
+        self.assertTrue(self.chequing.uses_cents)
+        for _ in range(10):
+            self.chequing.deposit(0.1)
+        self.assertEqual(self.chequing.balance_cents, 100)
+        self.assertEqual(self.chequing.balance, 1.0)
+        self.chequing.withdraw(0.3)
+        self.chequing.update_balance(-0.2)
+        self.assertEqual(self.chequing.balance_cents, 50)
+
+    def test_amounts_below_half_a_cent_rejected(self):
+        """Test deposits and withdrawals which round to no cents raise ValueError instead of doing nothing."""
+        self.chequing.deposit(1.0)
+        for method in (self.chequing.deposit, self.chequing.withdraw):
+            with self.assertRaises(ValueError):
+                method(0.004)
+        self.chequing.withdraw(0.005)
+        self.assertEqual(self.chequing.balance_cents, 99)
+
+    def test_withdraw_insufficient_funds(self):
+        """Test withdrawing more than the balance raises ValueError and leaves the balance."""
+        with self.assertRaises(ValueError):
+            self.savings.withdraw(50.01)
+        self.assertEqual(self.savings.balance_cents, 5000)
+
+    def test_balance_setters(self):
+        """Test the balance can be set in dollars or cents."""
+        self.savings.balance = 12.345
+        self.assertEqual(self.savings.balance_cents, 1235)
+        self.savings.balance_cents = 4999
+        self.assertEqual(self.savings.balance, 49.99)
+
+    def test_float_accounts_unchanged(self):
+        """Test accounts created without USE_CENTS keep float balances."""
+        with mock.patch.object(BankAccount, 'USE_CENTS', False):
+            account = SavingsAccount(1004, 1, 0.0, date(2019, 6, 1), 50.0)
+        account.deposit(0.1)
+        account.deposit(0.2)
+        self.assertFalse(account.uses_cents)
+        self.assertEqual(account.balance, 0.1 + 0.2)
+        self.assertEqual(account.balance_cents, 30)
+
+    def test_service_charges_cents(self):
+        """Test each strategy's charges in cents."""
+        self.assertEqual(self.savings.get_service_charges_cents(), 500)
+        self.savings.withdraw(0.01)
+        self.assertEqual(self.savings.get_service_charges_cents(), 700)
+        self.assertEqual(self.investment.get_service_charges_cents(), 755)
+        self.chequing.update_balance(-123.45)
+        # 500 cents plus 5% of the 23.45 beyond the overdraft limit, rounded to the cent.
+        self.assertEqual(self.chequing.get_service_charges_cents(), 617)
+
+    def test_account_book_cents(self):
+        """Test the vectorized charges in cents and the exact total match the accounts."""
+        accounts = []
+        for number in range(300):
+            balance = money.from_cents((number * 7919) % 400000 - 200000)
+            accounts.append(ChequingAccount(number, 1, "Holder", balance, (0.0, 100.0, 1000.0)[number % 3],
+                                            (0.05, 0.125, 0.035)[number % 3], date(2020, 1, 1)))
+            accounts.append(SavingsAccount(number + 1000, 1, abs(balance), date(2020, 1, 1), 500.0))
+            accounts.append(InvestmentAccount(number + 2000, 1, abs(balance),
+                                              date.today() - timedelta(days=number * 30), 2.55))
+        book = AccountBook.from_accounts(accounts)
+        self.assertEqual(book.get_service_charges_cents().tolist(),
+                         [account.get_service_charges_cents() for account in accounts])
+        self.assertEqual(book.total_balance_cents(), sum(account.balance_cents for account in accounts))
+
+    def test_account_book_stores_cents(self):
+        """Test a book built from accounts which store cents keeps exact int64 balances."""
+        book = AccountBook.from_accounts([self.chequing, self.savings, self.investment])
+        self.assertTrue(book.uses_cents)
+        self.assertEqual(book.balances_cents.dtype, np.int64)
+        self.assertEqual(book.balances_cents.tolist(), [0, 5000, 250000])
+
+        for _ in range(10):
+            book.apply_deposits([0], [0.1])
+        book.apply_withdrawals([1, 1], [0.3, 0.2])
+        self.assertEqual(book.balances_cents.tolist(), [100, 4950, 250000])
+        self.assertEqual(book.balances.tolist(), [1.0, 49.5, 2500.0])
+        with self.assertRaises(ValueError):
+            book.apply_deposits([0], [0.004])
+
+        book.store_balances([self.chequing, self.savings])
+        self.assertEqual((self.chequing.balance_cents, self.savings.balance_cents), (100, 4950))
+        self.assertEqual(book.total_balance_cents(), 100 + 4950 + 250000)
+
+    def test_account_book_of_mixed_accounts_stores_floats(self):
+        """Test a book is not built with cents unless every account stores cents."""
+        with mock.patch.object(BankAccount, 'USE_CENTS', False):
+            account = SavingsAccount(1004, 1, 0.5, date(2019, 6, 1), 50.0)
+        book = AccountBook.from_accounts([self.savings, account])
+        self.assertFalse(book.uses_cents)
+        self.assertIsNone(book.balances_cents)
+        self.assertEqual(book.get_balances_cents().tolist(), [5000, 50])
+
+    def test_account_book_rate_with_long_expansion(self):
+        """Test overdraft charges at a rate whose exact fraction overflows int64 products."""
+        accounts = [ChequingAccount(number, 1, "Holder", -100.0 * number, 0.0, 0.07 / 12, date(2020, 1, 1))
+                    for number in range(1, 4)]
+        book = AccountBook.from_accounts(accounts)
+        self.assertEqual(book.get_service_charges_cents().tolist(),
+                         [account.get_service_charges_cents() for account in accounts])
+        self.assertEqual(accounts[0].get_service_charges_cents(), 558)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Description: Unit tests for the month-end batch job.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import csv
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from tests.test_manage_data import ManageDataTestCase
+from user_interface import manage_data
+from user_interface import month_end
+
+class TestMonthEnd(ManageDataTestCase):
+    """Unit tests for run_month_end."""
+
+    def setUp(self):
+        """Point the results at the temporary directory."""
+        super().setUp()
+        patcher = mock.patch.object(month_end, 'output_dir', self.temp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def balances(self):
+        """Return the persisted balances, keyed by account number."""
+        _, accounts = manage_data.load_data()
+        return {number: account.balance for number, account in accounts.items()}
+
+    def test_charges_every_account(self):
+        """Test every account is charged once and the balances are persisted."""
+        summary = month_end.run_month_end('2024-01', workers=1)
+        self.assertEqual(3, summary['charged'])
+        self.assertEqual(15.0, summary['total_charges'])
+        self.assertEqual({20001: 145.0, 20002: 245.0, 20003: 345.0}, self.balances())
+        self.assertEqual({20001, 20002, 20003},
+                         set(month_end.read_results(month_end.results_path('2024-01'))))
+
+    def test_rerun_skips_unchanged_accounts(self):
+        """Test a rerun of the same period charges nothing again."""
+        month_end.run_month_end('2024-01', workers=1)
+        summary = month_end.run_month_end('2024-01', workers=1)
+        self.assertEqual({'charged': 0, 'recalculated': 0, 'restored': 0, 'skipped': 3, 'total_charges': 0.0},
+                         summary)
+        self.assertEqual({20001: 145.0, 20002: 245.0, 20003: 345.0}, self.balances())
+
+    def test_rerun_recalculates_dirty_accounts(self):
+        """Test a rerun recalculates only accounts which changed after they were charged."""
+        month_end.run_month_end('2024-01', workers=1)
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", -395.0, 100, 0.05))
+        summary = month_end.run_month_end('2024-01', workers=1)
+        self.assertEqual(1, summary['recalculated'])
+        self.assertEqual(2, summary['skipped'])
+        # The 5.00 charge is reversed; -390.00 is 290.00 beyond the overdraft limit,
+        # so the new charge is 5.00 + 14.50.
+        self.assertEqual({20001: 145.0, 20002: -409.5, 20003: 345.0}, self.balances())
+
+    def test_rerun_refunds_without_notifying(self):
+        """Test a dirty account's charge is refunded by a recorded row which posts no transaction."""
+        month_end.run_month_end('2024-01', workers=1)
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", -395.0, 100, 0.05))
+        update_balance = BankAccount.update_balance
+        with mock.patch.object(BankAccount, 'update_balance', autospec=True,
+                               side_effect=update_balance) as updates:
+            month_end.run_month_end('2024-01', workers=1)
+        self.assertEqual([-19.5], [call.args[1] for call in updates.call_args_list])
+
+        with open(month_end.results_path('2024-01'), newline='') as file:
+            entries = [row['entry'] for row in csv.DictReader(file)]
+        self.assertEqual([month_end.CHARGE] * 3 + [month_end.COMMIT, month_end.REFUND, month_end.CHARGE,
+                                                      month_end.COMMIT], entries)
+
+    def test_committed_charge_is_not_restored(self):
+        """Test a deposit which returns a charged account to its balance before the charge is kept."""
+        month_end.run_month_end('2024-01', workers=1)
+        manage_data.update_data(ChequingAccount(20002, 1001, "John", 250.0, 100, 0.05))
+        summary = month_end.run_month_end('2024-01', workers=1)
+        self.assertEqual(0, summary['restored'])
+        self.assertEqual(1, summary['recalculated'])
+        # The 5.00 charge is refunded and charged again, so the deposit is not reversed.
+        self.assertEqual({20001: 145.0, 20002: 250.0, 20003: 345.0}, self.balances())
+
+    def test_resumes_after_interruption(self):
+        """Test a run stopped partway resumes without charging any account twice."""
+        update_many = manage_data.update_many
+        calls = []
+
+        def fail_on_second_chunk(accounts):
+            calls.append(accounts)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            update_many(accounts)
+
+        with mock.patch.object(manage_data, 'update_many', side_effect=fail_on_second_chunk):
+            with self.assertRaises(KeyboardInterrupt):
+                month_end.run_month_end('2024-01', workers=1, chunk_size=1)
+        self.assertEqual({20001: 145.0, 20002: 250.0, 20003: 350.0}, self.balances())
+
+        summary = month_end.run_month_end('2024-01', workers=1, chunk_size=1)
+        self.assertEqual(1, summary['restored'])
+        self.assertEqual(1, summary['charged'])
+        self.assertEqual(1, summary['skipped'])
+        self.assertEqual({20001: 145.0, 20002: 245.0, 20003: 345.0}, self.balances())
+
+    def test_process_pool(self):
+        """Test charges calculated across worker processes are posted in account order."""
+        with mock.patch.object(manage_data, 'PARALLEL_MIN_BYTES', 1 << 30):
+            summary = month_end.run_month_end('2024-01', workers=2, chunk_size=1)
+        self.assertEqual(3, summary['charged'])
+        self.assertEqual({20001: 145.0, 20002: 245.0, 20003: 345.0}, self.balances())
+
+    def test_period_end(self):
+        """Test account ages are determined on the last day of the period."""
+        self.assertEqual(date(2024, 2, 29), month_end.period_end('2024-02'))
+        self.assertEqual(date(2024, 12, 31), month_end.period_end('2024-12'))
+
+    def test_invalid_period(self):
+        """Test periods which are not YYYY-MM months are rejected."""
+        for period in ('2024-13', '2024-1', '../2024-01'):
+            with self.assertRaises(ValueError):
+                month_end.run_month_end(period, workers=1)
+
+    def test_main(self):
+        """Test the command line prints a summary."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = month_end.main(['--period', '2024-02', '--workers', '1'])
+        self.assertEqual(0, status)
+        self.assertIn("Month-end 2024-02: 3 charged", output.getvalue())
+        self.assertTrue(os.path.exists(month_end.results_path('2024-02')))
+
+if __name__ == "__main__":
+    unittest.main()
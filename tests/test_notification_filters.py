@@ -0,0 +1,172 @@
+"""
+Description: Unit tests for edge-triggered low balance warnings, duplicate suppression and digests.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import subprocess  # nosec B404
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from patterns.observer.event_bus import EventBus
+from patterns.observer import notification_filters
+from patterns.observer.notification_filters import DigestObserver, DuplicateFilter, subscribe_client_digest
+from tests.test_subject import RecordingObserver
+
+class FakeClock:
+    """A clock which only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestLowBalanceWarnings(unittest.TestCase):
+    """Unit tests for edge-triggered low balance warnings."""
+
+    def setUp(self):
+        """Set up an account with an observer on a bus of its own."""
+        patcher = mock.patch.object(BankAccount, 'EVENT_BUS', EventBus())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.account = ChequingAccount(1, 10, "Holder", 100.0, date_created=date(2020, 1, 1))
+        self.observer = RecordingObserver()
+        self.account.attach(self.observer)
+
+    def test_warns_once_while_low(self):
+        """Test a balance which stays low sends one warning."""
+        for _ in range(20):
+            self.account.update_balance(-5.0)
+        self.assertEqual(["Low balance warning $45.00: on account 1."], self.observer.messages)
+
+    def test_hysteresis(self):
+        """Test the warning is re-armed only when the balance recovers past the hysteresis band."""
+        self.account.update_balance(-60.0)
+        self.account.update_balance(30.0)   # 70.00: above the level, within the band
+        self.account.update_balance(-30.0)
+        self.account.deposit(40.0)           # 80.00: past the band
+        self.account.update_balance(-40.0)
+        self.account.apply_transactions([50.0, -60.0])
+        self.assertEqual(["Low balance warning $40.00: on account 1.",
+                          "Low balance warning $40.00: on account 1.",
+                          "Low balance warning $30.00: on account 1."], self.observer.messages)
+
+    def test_level_triggered(self):
+        """Test every low transaction warns when edge triggering is turned off."""
+        with mock.patch.object(BankAccount, 'LOW_BALANCE_EDGE_TRIGGERED', False):
+            for _ in range(3):
+                self.account.update_balance(-30.0)
+        self.assertEqual(2, len(self.observer.messages))
+
+class TestDuplicateFilter(unittest.TestCase):
+    """Unit tests for the DuplicateFilter class."""
+
+    def test_suppresses_repeats_within_window(self):
+        """Test a message is passed on once per window."""
+        clock = FakeClock()
+        observer = RecordingObserver()
+        duplicates = DuplicateFilter(observer, window=60.0, clock=clock)
+        for message in ("a", "a", "b", "a"):
+            duplicates.update(message)
+        clock.now = 59.0
+        duplicates.update("a")
+        clock.now = 60.0
+        duplicates.update("a")
+        duplicates.update("b")
+        self.assertEqual(["a", "b", "a", "b"], observer.messages)
+        self.assertEqual(3, duplicates.suppressed_count)
+
+class TestDigestObserver(unittest.TestCase):
+    """Unit tests for the DigestObserver class."""
+
+    def setUp(self):
+        """Set up a digest with a fake clock."""
+        self.clock = FakeClock()
+        self.observer = RecordingObserver()
+        self.digest = DigestObserver(self.observer, interval=300.0, max_events=5, clock=self.clock)
+
+    def test_flush(self):
+        """Test collected messages are sent as one digest, with repeats counted."""
+        for message in ("a", "b", "a"):
+            self.digest.update(message)
+        self.assertEqual([], self.observer.messages)
+        self.assertEqual(3, self.digest.flush())
+        self.assertEqual(0, self.digest.flush())
+        self.assertEqual(["Digest of 3 notifications:\n- a (x2)\n- b"], self.observer.messages)
+
+    def test_sent_when_full_or_due(self):
+        """Test a digest is sent when it is full, or when a message arrives after the interval."""
+        for _ in range(5):
+            self.digest.update("a")
+        self.digest.update("b")
+        self.clock.now = 300.0
+        self.digest.update("c")
+        self.assertEqual(["Digest of 5 notifications:\n- a (x5)", "Digest of 2 notifications:\n- b\n- c"],
+                         self.observer.messages)
+        self.assertEqual(0, self.digest.pending_count)
+
+    def test_sent_by_timer(self):
+        """Test a digest is sent when its interval passes, without another message arriving."""
+        digest = DigestObserver(self.observer, interval=0.01)
+        self.addCleanup(digest.close)
+        sent = threading.Event()
+        self.observer.update = mock.Mock(side_effect=lambda message: sent.set())
+        digest.update("a")
+        self.assertTrue(sent.wait(5.0))
+        self.observer.update.assert_called_once_with("Digest of 1 notifications:\n- a")
+        self.assertEqual(0, digest.pending_count)
+
+    def test_flushed_at_exit(self):
+        """Test collected messages are sent at exit, unless the digest was closed."""
+        self.digest.update("a")
+        closed = DigestObserver(self.observer, clock=self.clock)
+        closed.close()
+        closed.update("b")
+        notification_filters._flush_digests()
+        self.assertEqual(["Digest of 1 notifications:\n- a"], self.observer.messages)
+
+    def test_digest_written_at_exit(self):
+        """Test a pending digest reaches the outbox file when the interpreter exits."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys\n"
+            "from patterns.observer.notification_filters import DigestObserver\n"
+            "from utility import file_utils\n"
+            "class Sender:\n"
+            "    def update(self, message):\n"
+            "        file_utils.simulate_send_email('ann@pixell-river.com', 'Digest', message)\n"
+            "if sys.argv[1] == 'outbox first':\n"
+            "    file_utils.get_outbox()\n"
+            "digest = DigestObserver(Sender())\n"
+            "digest.update('Low balance on account 1.')\n"
+        )
+        for order in ('outbox first', 'no outbox'):
+            with self.subTest(order=order), tempfile.TemporaryDirectory() as temp_dir:
+                environment = dict(os.environ, PYTHONPATH=root)
+                subprocess.run([sys.executable, '-c', script, order], cwd=temp_dir, env=environment,
+                               check=True, timeout=60)  # nosec B603
+                with open(os.path.join(temp_dir, 'output', 'observer_emails.txt')) as file:
+                    self.assertIn("Message: Digest of 1 notifications:\n- Low balance on account 1.", file.read())
+
+    def test_client_digest(self):
+        """Test a client digest collects the events of all of the client's accounts."""
+        bus = EventBus()
+        client = mock.Mock(client_number=10)
+        with mock.patch.object(BankAccount, 'EVENT_BUS', bus):
+            digest = subscribe_client_digest(client, bus)
+            for number in range(3):
+                account = ChequingAccount(number, 10, "Holder", 100.0, date_created=date(2020, 1, 1))
+                account.update_balance(-60.0)
+                account.update_balance(20000.0)
+        self.assertEqual(6, digest.flush())
+        client.update.assert_called_once()
+        self.assertEqual(1, bus.unsubscribe_all(digest))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Description: Unit tests for the NotificationStore class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest import mock
+from utility.notification_store import NotificationStore
+
+class TestNotificationStore(unittest.TestCase):
+    """Unit tests for the NotificationStore class."""
+
+    def setUp(self):
+        """Set up a store with small segments in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.directory = os.path.join(self.temp_dir.name, "observer_emails")
+        self.today = date(2024, 3, 1)
+        self.store = self.open_store()
+
+    def open_store(self) -> NotificationStore:
+        """Open a store on the test directory."""
+        store = NotificationStore(self.directory, max_bytes=400, today=lambda: self.today)
+        self.addCleanup(store.close)
+        return store
+
+    def send(self, count: int, store: NotificationStore = None) -> None:
+        """Send messages alternately to two clients and wait until they are written."""
+        store = store or self.store
+        for number in range(count):
+            client_number = 1001 + number % 2
+            store.send(f"client{client_number}@pixell-river.com", "ALERT",
+                       f"Notification for {client_number}: Ann Lee: Low balance {number}.")
+        self.assertTrue(store.flush(5))
+
+    def test_written_by_writer_thread(self):
+        """Test messages are written by the writer thread, in the segment of the day they were sent."""
+        writers = []
+        write = NotificationStore._NotificationStore__write
+
+        def record(store, *args):
+            writers.append(threading.current_thread())
+            write(store, *args)
+
+        with mock.patch.object(NotificationStore, '_NotificationStore__write', record):
+            self.store.send("client1001@pixell-river.com", "ALERT", "Notification for 1001: Ann Lee: Low balance.")
+            self.today = date(2024, 3, 2)
+            self.assertTrue(self.store.flush(5))
+        self.assertEqual(1, len(writers))
+        self.assertIsNot(threading.current_thread(), writers[0])
+        self.assertEqual(["observer_emails-20240301-0001"], self.store.segments())
+
+    def test_written_without_a_thread(self):
+        """Test messages are written by flush and close when no writer thread could be started."""
+        with mock.patch.object(threading.Thread, 'start', side_effect=RuntimeError):
+            store = self.open_store()
+        self.send(2, store)
+        self.assertEqual(1, len(store.find(client_number=1001)))
+        store.send("client1001@pixell-river.com", "ALERT", "Notification for 1001: Ann Lee: Low balance.")
+        store.close()
+        self.assertEqual(2, len(self.open_store().find(client_number=1001)))
+
+    def test_rotates_by_size_and_date(self):
+        """Test segments are rotated when full and when the date changes."""
+        self.send(10)
+        self.today = date(2024, 3, 2)
+        self.send(1)
+        segments = self.store.segments()
+        self.assertGreater(len(segments), 2)
+        self.assertEqual("observer_emails-20240302-0001", segments[-1])
+        for segment in segments[:-2]:
+            self.assertLessEqual(os.path.getsize(os.path.join(self.directory, segment + ".txt")), 400)
+
+    def test_find_by_client_and_email(self):
+        """Test one client's messages are found across segments, in order."""
+        self.send(10)
+        messages = self.store.find(client_number=1002)
+        self.assertEqual(5, len(messages))
+        self.assertTrue(messages[0].startswith("---\nTo: client1002@pixell-river.com\n"))
+        self.assertIn("Low balance 9.", messages[-1])
+        self.assertEqual(messages, self.store.find(email_address="client1002@pixell-river.com"))
+        self.assertEqual([], self.store.find(client_number=9999))
+        with self.assertRaises(ValueError):
+            self.store.find()
+
+    def test_closed_segments_are_searched_by_sorted_index(self):
+        """Test closed segments are searched through their sorted index alone."""
+        self.send(10)
+        expected = self.store.find(client_number=1002)
+        self.store.close()
+        for segment in self.store.segments():
+            with open(os.path.join(self.directory, segment + ".key"), 'rb') as key_file:
+                keys = [line.split(b"\t")[0] for line in key_file]
+            self.assertEqual(sorted(keys), keys)
+            os.remove(os.path.join(self.directory, segment + ".idx"))
+        self.assertEqual(expected, self.store.find(client_number=1002))
+        self.assertEqual(expected, self.store.find(email_address="client1002@pixell-river.com"))
+        self.assertEqual([], self.store.find(client_number=100))
+
+    def test_continues_after_reopening(self):
+        """Test a reopened store continues the current segment and finds earlier messages."""
+        self.send(1)
+        self.store.close()
+        store = self.open_store()
+        self.send(1, store)
+        self.assertEqual(["observer_emails-20240301-0001"], store.segments())
+        self.assertEqual(2, len(store.find(client_number=1001)))
+
+    def test_compress_and_archive(self):
+        """Test closed segments are compressed or archived, and compressed ones can still be searched."""
+        self.send(6)
+        self.today = date(2024, 3, 2)
+        self.send(4)
+        expected = self.store.find(client_number=1001)
+
+        compressed = self.store.compress(before=date(2024, 3, 2))
+        self.assertTrue(compressed)
+        self.assertTrue(all(segment.startswith("observer_emails-20240301") for segment in compressed))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, compressed[0] + ".txt.gz")))
+        self.assertEqual(expected, self.store.find(client_number=1001))
+
+        self.store.close()
+        self.assertEqual([], self.store.compress(), "Segments from today can be reopened")
+
+        archive = os.path.join(self.temp_dir.name, "archive")
+        archived = self.store.archive(archive, before=date(2024, 3, 2))
+        self.assertEqual(compressed, archived)
+        archived_messages = NotificationStore(archive).find(client_number=1001)
+        self.assertEqual(expected, archived_messages + self.store.find(client_number=1001))
+
+if __name__ == "__main__":
+    unittest.main()
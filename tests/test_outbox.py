@@ -0,0 +1,90 @@
+"""
+Description: Unit tests for the Outbox class.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from utility import file_utils
+from utility.outbox import Outbox
+
+class TestOutbox(unittest.TestCase):
+    """Unit tests for the Outbox class."""
+
+    def setUp(self):
+        """Set up an outbox writing to a file in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "output", "observer_emails.txt")
+        self.outbox = Outbox(self.path, max_batch=100, flush_interval=60)
+        self.addCleanup(self.outbox.close)
+
+    def read_output(self):
+        """Return the contents of the output file."""
+        with open(self.path) as file:
+            return file.read()
+
+    def test_send_does_not_wait_for_file_io(self):
+        """Test that send returns while the writer thread is still blocked on the file."""
+        gate = threading.Event()
+        real_open = Outbox._Outbox__open
+
+        def blocked_open(outbox):
+            gate.wait(5)
+            return real_open(outbox)
+
+        with mock.patch.object(Outbox, '_Outbox__open', blocked_open):
+            self.outbox.send("a@pixell-river.com", "Subject", "Body")
+            self.assertFalse(os.path.exists(self.path))
+            gate.set()
+            self.assertTrue(self.outbox.flush(5))
+        self.assertIn("Message: Body", self.read_output())
+
+    def test_flush_writes_messages_in_order(self):
+        """Test that flush writes every queued message in the simulated email format."""
+        self.outbox.send("a@pixell-river.com", "First", "One")
+        self.outbox.send("b@pixell-river.com", "Second", "Two")
+        self.assertTrue(self.outbox.flush(5))
+        self.assertEqual("---\nTo: a@pixell-river.com\nSubject: First\nMessage: One\n---\n"
+                         "---\nTo: b@pixell-river.com\nSubject: Second\nMessage: Two\n---\n",
+                         self.read_output())
+
+    def test_interval_flushes_messages(self):
+        """Test that messages are flushed once the flush interval expires."""
+        outbox = Outbox(self.path, flush_interval=0.05)
+        self.addCleanup(outbox.close)
+        outbox.send("a@pixell-river.com", "Subject", "Body")
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not (os.path.exists(self.path) and self.read_output()):
+            time.sleep(0.01)
+        self.assertIn("Message: Body", self.read_output())
+
+    def test_close_writes_pending_messages(self):
+        """Test that close writes queued messages and rejects new ones."""
+        self.outbox.send("a@pixell-river.com", "Subject", "Body")
+        self.outbox.close()
+        self.assertIn("To: a@pixell-river.com", self.read_output())
+        with self.assertRaises(RuntimeError):
+            self.outbox.send("a@pixell-river.com", "Subject", "Body")
+
+    def test_simulate_send_email_uses_outbox(self):
+        """Test that simulate_send_email queues the message on the shared outbox."""
+        with mock.patch.object(file_utils, '_outbox', self.outbox):
+            file_utils.simulate_send_email("a@pixell-river.com", "Subject", "Body")
+        self.outbox.flush(5)
+        self.assertIn("Subject: Subject", self.read_output())
+
+    def test_written_by_close_without_a_thread(self):
+        """Test messages are written by close when the writer thread cannot be started."""
+        with mock.patch.object(threading.Thread, 'start', side_effect=RuntimeError("interpreter shutdown")):
+            outbox = Outbox(self.path)
+        outbox.send("ann@pixell-river.com", "ALERT", "Low balance.")
+        outbox.close()
+        self.assertIn("Message: Low balance.", self.read_output())
+
+if __name__ == "__main__":
+    unittest.main()
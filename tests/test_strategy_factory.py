@@ -0,0 +1,89 @@
+"""
+Description: Unit tests for the strategy interning factory and immutable strategies.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import copy
+import gc
+import pickle
+import unittest
+import weakref
+from datetime import date
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.strategy import strategy_factory
+from patterns.strategy.batch_service_charges import strategy_parameters
+from patterns.strategy.minimun_balance_strategy import MinimumBalanceStrategy
+from patterns.strategy.overdraft_strategy import OverdraftStrategy
+
+class TestStrategyFactory(unittest.TestCase):
+    """Unit tests for the strategy_factory module."""
+
+    def test_equal_parameters_share_an_instance(self):
+        """Test strategies with the same class and parameters are the same object."""
+        self.assertIs(strategy_factory.overdraft_strategy(100.0, 0.05), strategy_factory.overdraft_strategy(100.0, 0.05))
+        self.assertIsNot(strategy_factory.overdraft_strategy(100.0, 0.05),
+                         strategy_factory.overdraft_strategy(200.0, 0.05))
+        self.assertIs(strategy_factory.management_fee_strategy(date(2015, 1, 1), 2.5),
+                      strategy_factory.intern_strategy(strategy_factory.ManagementFeeStrategy, date(2015, 1, 1), 2.5))
+
+    def test_parameter_types_are_part_of_the_key(self):
+        """Test parameters which are equal but of different types give different strategies."""
+        integer = strategy_factory.minimum_balance_strategy(50)
+        real = strategy_factory.minimum_balance_strategy(50.0)
+        self.assertIsNot(integer, real)
+        self.assertIsInstance(real.minimum_balance, float)
+
+    def test_unused_strategies_are_discarded(self):
+        """Test the factory does not keep strategies which are no longer used."""
+        strategy = strategy_factory.minimum_balance_strategy(12345.67)
+        released = weakref.ref(strategy)
+        gc.collect()
+        count = strategy_factory.interned_count()
+        del strategy
+        gc.collect()
+        self.assertIsNone(released())
+        self.assertEqual(count - 1, strategy_factory.interned_count())
+
+    def test_accounts_share_strategies(self):
+        """Test accounts with the same parameters share one strategy."""
+        first = ChequingAccount(1, 1, "Holder", 10.0, 500.0, 0.05)
+        second = ChequingAccount(2, 2, "Holder", 20.0, 500.0, 0.05)
+        self.assertIs(first.service_charge_strategy, second.service_charge_strategy)
+        self.assertEqual(500.0, second.overdraft_limit)
+        self.assertIs(SavingsAccount(3, 1, 1.0, date(2020, 1, 1), 50.0).service_charge_strategy,
+                      SavingsAccount(4, 1, 2.0, date(2020, 1, 1), 50.0).service_charge_strategy)
+        self.assertIs(InvestmentAccount(5, 1, 1.0, date(2020, 1, 1), 1.5).service_charge_strategy,
+                      InvestmentAccount(6, 1, 2.0, date(2020, 1, 1), 1.5).service_charge_strategy)
+
+    def test_strategy_parameters(self):
+        """Test parameters read once per distinct strategy are returned for every strategy."""
+        strategies = [strategy_factory.overdraft_strategy(limit, 0.05) for limit in (100.0, 200.0, 100.0)]
+        limits, rates = strategy_parameters(strategies, 'overdraft_limit', 'overdraft_rate')
+        self.assertEqual([100.0, 200.0, 100.0], limits.tolist())
+        self.assertEqual([0.05] * 3, rates.tolist())
+
+class TestImmutableStrategies(unittest.TestCase):
+    """Unit tests for the immutability of strategies."""
+
+    def test_attributes_cannot_be_changed(self):
+        """Test strategies reject attribute assignment and deletion after initialization."""
+        strategy = OverdraftStrategy(100.0, 0.05)
+        with self.assertRaises(AttributeError):
+            strategy._OverdraftStrategy__overdraft_limit = 0.0
+        with self.assertRaises(AttributeError):
+            strategy.note = "changed"
+        with self.assertRaises(AttributeError):
+            del strategy._OverdraftStrategy__overdraft_rate
+        self.assertEqual((100.0, 0.05), strategy.parameters)
+
+    def test_copies_are_shared(self):
+        """Test pickling and copying return the shared instance."""
+        strategy = strategy_factory.minimum_balance_strategy(75.0)
+        self.assertIs(strategy, pickle.loads(pickle.dumps(strategy)))  # nosec B301
+        self.assertIs(strategy, copy.deepcopy(strategy))
+        self.assertIs(strategy, copy.deepcopy(MinimumBalanceStrategy(75.0)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Description: Unit tests for the Subject class and the slotted storage of its subclasses.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import copy
+import pickle
+import unittest
+from datetime import date
+from unittest import mock
+from bank_account.bank_account import BankAccount
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+from patterns.observer.event_bus import EventBus
+from patterns.observer.observer import Observer
+from patterns.observer.subject import Subject
+
+class RecordingObserver(Observer):
+    """An observer which records the messages it receives."""
+
+    def __init__(self):
+        self.messages = []
+
+    def update(self, message: str) -> None:
+        self.messages.append(message)
+
+class TestSubject(unittest.TestCase):
+    """Unit tests for the Subject class."""
+
+    def test_observer_list_allocated_on_first_attach(self):
+        """Test no observer list is allocated until an observer is attached."""
+        subject = Subject()
+        self.assertIsNone(subject._observers)
+        subject.notify("Nobody is listening")
+        subject.detach(RecordingObserver())
+        self.assertIsNone(subject._observers)
+
+        observer = RecordingObserver()
+        subject.attach(observer)
+        subject.notify("Hello")
+        self.assertEqual(observer.messages, ["Hello"])
+
+        subject.detach(observer)
+        subject.notify("Goodbye")
+        self.assertEqual(observer.messages, ["Hello"])
+
+class TestSlottedAccounts(unittest.TestCase):
+    """Unit tests for the slotted storage of bank accounts."""
+
+    def setUp(self):
+        """Set up one account of each type."""
+        self.accounts = [
+            ChequingAccount(1001, 1, "Ann Lee", 500.0, 200.0, 0.05, date(2020, 1, 15)),
+            SavingsAccount(1002, 1, 1000.0, date(2019, 6, 1), 50.0),
+            InvestmentAccount(1003, 2, 2500.0, date(2010, 3, 10), 2.55),
+        ]
+
+    def test_no_instance_dictionary(self):
+        """Test accounts have no per-instance __dict__ and reject unknown attributes."""
+        for account in self.accounts:
+            self.assertFalse(hasattr(account, '__dict__'))
+            with self.assertRaises(AttributeError):
+                account.nickname = "Rainy day"
+
+    def test_copy_and_pickle(self):
+        """Test slotted accounts can still be deep copied and pickled."""
+        for account in self.accounts:
+            for clone in (copy.deepcopy(account), pickle.loads(pickle.dumps(account))):  # nosec B301
+                self.assertEqual(clone.account_number, account.account_number)
+                self.assertEqual(clone.balance, account.balance)
+                self.assertEqual(clone.date_created, account.date_created)
+                self.assertEqual(clone.get_service_charges(), account.get_service_charges())
+
+    def test_notifications(self):
+        """Test accounts notify observers attached after creation."""
+        account = self.accounts[0]
+        observer = RecordingObserver()
+        with mock.patch.object(BankAccount, 'EVENT_BUS', EventBus()):
+            account.attach(observer)
+            account.update_balance(-480.0)
+        self.assertEqual(len(observer.messages), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Description: Unit tests for the notification transports, run against a local stand-in SMTP server.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from email import message_from_bytes
+from unittest import mock
+from utility import file_utils
+from utility.transports import FileTransport, SmtpTransport
+
+class FakeSmtpServer(socketserver.ThreadingTCPServer):
+    """A minimal SMTP server on localhost which records the messages and connections it receives."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after: int = None, reject: str = None):
+        super().__init__(('127.0.0.1', 0), FakeSmtpHandler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        # Close each connection after this many messages, as an idle-timeout server would.
+        self.drop_after = drop_after
+        # Refuse messages to this recipient.
+        self.reject = reject
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+class FakeSmtpHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        received = 0
+        recipient = None
+        self.reply("220 localhost fake ESMTP")
+        for raw in self.rfile:
+            command = raw.decode('ascii').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif verb in ('HELO', 'MAIL', 'RSET', 'NOOP'):
+                self.reply("250 OK")
+            elif verb == 'RCPT':
+                recipient = command.split(':', 1)[1].strip('<> ')
+                if recipient == server.reject:
+                    self.reply("550 No such user")
+                else:
+                    self.reply("250 OK")
+            elif verb == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                    lines.append(data)
+                with server.lock:
+                    server.messages.append(message_from_bytes(b"".join(lines)))
+                self.reply("250 OK")
+                received += 1
+                if server.drop_after and received >= server.drop_after:
+                    return
+            elif verb == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+class TestSmtpTransport(unittest.TestCase):
+    """Unit tests for the SmtpTransport class."""
+
+    def start_server(self, **kwargs) -> FakeSmtpServer:
+        """Start a fake SMTP server for the test."""
+        server = FakeSmtpServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_reuses_pooled_connections(self):
+        """Test many messages are sent over no more connections than the pool holds."""
+        server = self.start_server()
+        transport = SmtpTransport('127.0.0.1', server.port, pool_size=2, batch_size=25)
+        self.addCleanup(transport.close)
+        transport.send_many((f"client{number}@pixell-river.com", "Alert", f"Message {number}")
+                            for number in range(200))
+        self.assertTrue(transport.flush(10))
+        transport.close()
+        self.assertEqual(200, transport.sent_count)
+        self.assertLessEqual(transport.connection_count, 2)
+        self.assertEqual(transport.connection_count, server.connections)
+        self.assertEqual({f"Message {number}" for number in range(200)},
+                         {message.get_payload().strip() for message in server.messages})
+        self.assertEqual("alerts@pixell-river.com", server.messages[0]['From'])
+
+    def test_reconnects_when_dropped(self):
+        """Test a connection closed by the server is reopened and the message retried."""
+        server = self.start_server(drop_after=3)
+        transport = SmtpTransport('127.0.0.1', server.port, pool_size=1)
+        self.addCleanup(transport.close)
+        for number in range(10):
+            transport.send("a@pixell-river.com", "Alert", f"Message {number}")
+        self.assertTrue(transport.flush(10))
+        self.assertEqual(10, transport.sent_count)
+        self.assertEqual(0, transport.failed_count)
+        self.assertEqual(4, server.connections)
+
+    def test_refused_message_is_logged(self):
+        """Test a message the server refuses is counted as failed without closing the connection."""
+        server = self.start_server(reject="nobody@pixell-river.com")
+        transport = SmtpTransport('127.0.0.1', server.port, pool_size=1)
+        self.addCleanup(transport.close)
+        with self.assertLogs(level='ERROR'):
+            transport.send("nobody@pixell-river.com", "Alert", "Lost")
+            transport.send("a@pixell-river.com", "Alert", "Delivered")
+            self.assertTrue(transport.flush(10))
+        self.assertEqual((1, 1, 1), (transport.sent_count, transport.failed_count, server.connections))
+
+    def test_closed(self):
+        """Test a closed transport refuses messages."""
+        transport = SmtpTransport('127.0.0.1', 1)
+        transport.close()
+        with self.assertRaises(RuntimeError):
+            transport.send("a@pixell-river.com", "Alert", "Late")
+
+class TestFileTransport(unittest.TestCase):
+    """Unit tests for the FileTransport class and the configurable transport of simulate_send_email."""
+
+    def setUp(self):
+        """Set up a transport writing to a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.transport = FileTransport(os.path.join(self.temp_dir.name, "emails.txt"), flush_interval=60)
+        self.addCleanup(self.transport.close)
+
+    def test_simulate_send_email_uses_transport(self):
+        """Test simulate_send_email delivers through the configured transport."""
+        with mock.patch.object(file_utils, '_transport', None):
+            self.assertIsNone(file_utils.set_transport(self.transport))
+            file_utils.simulate_send_email("a@pixell-river.com", "Subject", "Body")
+            self.assertIs(self.transport, file_utils.set_transport(None))
+        self.assertTrue(self.transport.flush(5))
+        with open(self.transport.path) as file:
+            self.assertEqual("---\nTo: a@pixell-river.com\nSubject: Subject\nMessage: Body\n---\n", file.read())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QComboBox
+from PySide6.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton, QTableView, QComboBox
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
@@ -38,7 +38,7 @@ class LookupWindow(QMainWindow):
         self.lookup_button.setDefault(True)
 
         self.client_info_label = QLabel()
-        self.account_table = QTableWidget()
+        self.account_table = QTableView()
         self.prompt_label.setAlignment(Qt.AlignCenter)
         self.client_number_edit.setAlignment(Qt.AlignCenter)
         self.client_info_label.setAlignment(Qt.AlignCenter)
@@ -71,11 +71,8 @@ class LookupWindow(QMainWindow):
         layout.addWidget(self.filter_edit, 6, 1)
         layout.addWidget(self.filter_button, 6, 2)
 
-        self.account_table.setColumnCount(4)
-        self.account_table.setHorizontalHeaderLabels(COLUMN_HEADERS)                
+        # The column headers come from the table's model, which subclasses set.
         self.account_table.horizontalHeader().setFont(bold_font)
-        self.account_table.resizeColumnsToContents()
-        self.account_table.resizeRowsToContents()
         self.reset_display()
 
 
@@ -90,7 +87,9 @@ class LookupWindow(QMainWindow):
 
         Note that the function does not return anything.
         """
-        self.account_table.setRowCount(0)
+        model = self.account_table.model()
+        if model is not None:
+            model.removeRows(0, model.rowCount())
         self.client_number_edit.clear()
         self.client_info_label.setText("")
         self.client_info_label.setFocus()
@@ -2,7 +2,6 @@ from ui_superclasses.details_window import DetailsWindow
 from PySide6.QtWidgets import QMessageBox, QTableWidgetItem
 from PySide6.QtCore import Signal
 from bank_account.bank_account import BankAccount
-import copy
 
 class AccountDetailsWindow(DetailsWindow):
     """
@@ -36,7 +35,7 @@ class AccountDetailsWindow(DetailsWindow):
         super().__init__()
 
         if isinstance(account, BankAccount):
-            self.account = copy.deepcopy(account)
+            self.account = account.snapshot()
             
             self.account_number_label.setText(str(self.account.account_number))
             self.balance_label.setText(f"${self.account.balance:,.2f}")
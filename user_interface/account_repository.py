@@ -0,0 +1,213 @@
+"""
+Description: Defines the AccountRepository class, an account store indexed by account number
+and by client number so that a client's accounts can be retrieved without scanning the whole book.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from bank_account.bank_account import BankAccount
+
+class AccountRepository:
+    """
+    Description:
+        The `AccountRepository` class holds bank accounts keyed by account number and keeps a
+        secondary index from client number to that client's accounts. The index is maintained
+        on every add, update and removal, so looking up a client's accounts costs
+        O(accounts for that client) instead of O(all accounts).
+
+        The repository behaves like the accounts dictionary returned by `load_data`
+        (`in`, `[]`, `len`, iteration, `values()`), so it can be used wherever that
+        dictionary was used.
+
+    Attributes:
+        None
+    """
+    def __init__(self, accounts: dict = None) -> None:
+        """
+        Description:
+            Initializes the repository, optionally populating it from an accounts dictionary.
+
+        Args:
+            accounts (dict, optional): A dictionary mapping account numbers to BankAccount objects.
+
+        Returns:
+            None
+        """
+        self.__accounts = {}
+        self.__client_index = {}
+        # The client number each account was indexed under, so re-indexing still finds the
+        # old entry when an account's client_number was changed in place.
+        self.__indexed_client = {}
+
+        if accounts:
+            for account_number, account in accounts.items():
+                self.__store(account_number, account)
+
+    def __store(self, account_number, account: BankAccount) -> None:
+        """
+        Stores an account under the given account number and re-indexes it by client number.
+
+        Args:
+            account_number: The key to store the account under.
+            account (BankAccount): The account to store.
+
+        Returns:
+            None
+        """
+        if self.__indexed_client.get(account_number, account.client_number) != account.client_number:
+            self.__unindex(account_number)
+        self.__accounts[account_number] = account
+        self.__indexed_client[account_number] = account.client_number
+        self.__client_index.setdefault(account.client_number, {})[account_number] = account
+
+    def __unindex(self, account_number) -> None:
+        """
+        Removes an account number from the client index, if it is stored.
+
+        Args:
+            account_number: The account number to remove from the index.
+
+        Returns:
+            None
+        """
+        if account_number not in self.__indexed_client:
+            return
+
+        client_number = self.__indexed_client.pop(account_number)
+        client_accounts = self.__client_index.get(client_number)
+        if client_accounts is not None:
+            client_accounts.pop(account_number, None)
+            if not client_accounts:
+                del self.__client_index[client_number]
+
+    def add(self, account: BankAccount) -> None:
+        """
+        Adds an account to the repository, or replaces the stored account with the same
+        account number. The client index is updated to reflect the account's client number.
+
+        Args:
+            account (BankAccount): The account to add or update.
+
+        Returns:
+            None
+        """
+        self.__store(account.account_number, account)
+
+    def update(self, account: BankAccount) -> None:
+        """
+        Updates a stored account. Equivalent to `add`; provided for readability at call sites
+        that replace an existing account.
+
+        Args:
+            account (BankAccount): The updated account.
+
+        Returns:
+            None
+        """
+        self.add(account)
+
+    def remove(self, account_number) -> BankAccount:
+        """
+        Removes and returns the account stored under the given account number. Its subscriptions
+        on the event bus are removed too, so observers of a removed account are released.
+
+        Args:
+            account_number: The account number of the account to remove.
+
+        Returns:
+            BankAccount: The removed account.
+
+        Raises:
+            KeyError: If no account is stored under the account number.
+        """
+        self.__unindex(account_number)
+        account = self.__accounts.pop(account_number)
+        account.EVENT_BUS.unsubscribe_account(account_number)
+        return account
+
+    def get(self, account_number, default=None):
+        """
+        Retrieves the account stored under the given account number.
+
+        Args:
+            account_number: The account number to look up.
+            default: The value to return if the account is not found.
+
+        Returns:
+            BankAccount: The stored account, or `default` if not found.
+        """
+        return self.__accounts.get(account_number, default)
+
+    def accounts_for_client(self, client_number) -> list:
+        """
+        Retrieves the accounts belonging to a client, in the order they were added.
+
+        Args:
+            client_number: The client number to look up.
+
+        Returns:
+            list: The client's BankAccount objects (empty if the client has none).
+        """
+        return list(self.__client_index.get(client_number, {}).values())
+
+    def values(self):
+        """
+        Returns a view of all stored accounts.
+
+        Returns:
+            ValuesView: The stored BankAccount objects.
+        """
+        return self.__accounts.values()
+
+    def keys(self):
+        """
+        Returns a view of all stored account numbers.
+
+        Returns:
+            KeysView: The stored account numbers.
+        """
+        return self.__accounts.keys()
+
+    def items(self):
+        """
+        Returns a view of all (account number, account) pairs.
+
+        Returns:
+            ItemsView: The stored (account number, BankAccount) pairs.
+        """
+        return self.__accounts.items()
+
+    def __getitem__(self, account_number) -> BankAccount:
+        """
+        Retrieves the account stored under the given account number.
+        """
+        return self.__accounts[account_number]
+
+    def __setitem__(self, account_number, account: BankAccount) -> None:
+        """
+        Stores an account under the given account number and re-indexes it.
+        """
+        self.__store(account_number, account)
+
+    def __delitem__(self, account_number) -> None:
+        """
+        Removes the account stored under the given account number.
+        """
+        self.remove(account_number)
+
+    def __contains__(self, account_number) -> bool:
+        """
+        Checks whether an account is stored under the given account number.
+        """
+        return account_number in self.__accounts
+
+    def __iter__(self):
+        """
+        Iterates over the stored account numbers.
+        """
+        return iter(self.__accounts)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored accounts.
+        """
+        return len(self.__accounts)
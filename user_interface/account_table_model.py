@@ -0,0 +1,369 @@
+"""
+Description: Defines the AccountTableModel class, the Qt table model behind the account table
+of the lookup window. The model keeps only the account numbers of the client being shown and
+reads each cell from the account repository when the view asks for it, so the view renders only
+the visible rows and looking up another client replaces one list rather than building a table
+item for every cell. Also defines the AccountFilterProxyModel class, which filters the table
+through the model's text index without touching the view's rows.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from user_interface.account_repository import AccountRepository
+from user_interface.account_text_index import AccountTextIndex, BALANCE_COLUMN, COLUMN_HEADERS, cell_text
+
+class AccountTableModel(QAbstractTableModel):
+    """
+    Description:
+        The `AccountTableModel` class presents one client's accounts, one row per account, in
+        the order the repository holds them. Rows refer to accounts by account number, so an
+        account replaced in the repository is shown as it now is.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, repository: AccountRepository = None, parent=None) -> None:
+        """
+        Description:
+            Initializes an empty model.
+
+        Args:
+            repository (AccountRepository, optional): The accounts shown. Defaults to an empty repository.
+            parent (QObject, optional): The Qt parent of the model.
+        """
+        super().__init__(parent)
+        self.__repository = repository if repository is not None else AccountRepository()
+        self.__account_numbers = []
+        # account number -> row, so an updated account is found without a scan.
+        self.__rows = {}
+        # Built when first filtered on, and dropped whenever the rows are replaced.
+        self.__text_index = None
+
+    @property
+    def repository(self) -> AccountRepository:
+        """
+        Returns the repository the accounts are read from.
+
+        Returns:
+            AccountRepository: The repository.
+        """
+        return self.__repository
+
+    @property
+    def text_index(self) -> AccountTextIndex:
+        """
+        Returns the normalized text of the rows, indexing them if they have not been yet.
+
+        Returns:
+            AccountTextIndex: The index, in row order.
+        """
+        if self.__text_index is None:
+            self.__text_index = AccountTextIndex(self.account(row) for row in range(len(self.__account_numbers)))
+        return self.__text_index
+
+    def set_repository(self, repository: AccountRepository) -> None:
+        """
+        Replaces the repository and clears the table.
+
+        Args:
+            repository (AccountRepository): The repository.
+        """
+        self.beginResetModel()
+        self.__repository = repository
+        self.__account_numbers = []
+        self.__rows = {}
+        self.__text_index = None
+        self.endResetModel()
+
+    def set_client(self, client_number) -> int:
+        """
+        Shows the accounts of a client in place of those shown before.
+
+        Args:
+            client_number: The client number.
+
+        Returns:
+            int: The number of accounts shown.
+        """
+        self.beginResetModel()
+        self.__account_numbers = [account.account_number
+                                  for account in self.__repository.accounts_for_client(client_number)]
+        self.__rows = {account_number: row for row, account_number in enumerate(self.__account_numbers)}
+        self.__text_index = None
+        self.endResetModel()
+        return len(self.__account_numbers)
+
+    def clear(self) -> None:
+        """
+        Removes every row.
+        """
+        self.beginResetModel()
+        self.__account_numbers = []
+        self.__rows = {}
+        self.__text_index = None
+        self.endResetModel()
+
+    def account(self, row: int):
+        """
+        Returns the account shown in a row.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            BankAccount: The account, or None if the row does not exist or the account is no
+            longer in the repository.
+        """
+        if 0 <= row < len(self.__account_numbers):
+            return self.__repository.get(self.__account_numbers[row])
+        return None
+
+    def row_of(self, account_number) -> int:
+        """
+        Returns the row in which an account is shown.
+
+        Args:
+            account_number: The account number.
+
+        Returns:
+            int: The row, or -1 if the account is not shown.
+        """
+        return self.__rows.get(account_number, -1)
+
+    def refresh_account(self, account_number) -> bool:
+        """
+        Tells the view that an account has changed, so its row is drawn again.
+
+        Args:
+            account_number: The account number.
+
+        Returns:
+            bool: True if the account is shown.
+        """
+        row = self.row_of(account_number)
+        if row < 0:
+            return False
+        if self.__text_index is not None:
+            self.__text_index.update(row, self.account(row))
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMN_HEADERS) - 1),
+                              [Qt.DisplayRole])
+        return True
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Removes rows from the table. The accounts stay in the repository.
+
+        Args:
+            row (int): The first row removed.
+            count (int): The number of rows removed.
+            parent (QModelIndex, optional): Always invalid for a table.
+
+        Returns:
+            bool: True if the rows were removed, False if they do not all exist.
+        """
+        if parent.isValid() or row < 0 or count < 0 or row + count > len(self.__account_numbers):
+            return False
+        if count == 0:
+            return True
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.__account_numbers[row:row + count]
+        if self.__text_index is not None:
+            self.__text_index.remove(row, count)
+        self.__rows = {account_number: row for row, account_number in enumerate(self.__account_numbers)}
+        self.endRemoveRows()
+        return True
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Returns the number of rows.
+
+        Args:
+            parent (QModelIndex, optional): Always invalid for a table.
+
+        Returns:
+            int: The number of accounts shown.
+        """
+        return 0 if parent.isValid() else len(self.__account_numbers)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Returns the number of columns.
+
+        Args:
+            parent (QModelIndex, optional): Always invalid for a table.
+
+        Returns:
+            int: The number of columns.
+        """
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """
+        Returns the text or alignment of a cell.
+
+        Args:
+            index (QModelIndex): The cell.
+            role (int, optional): The Qt item data role. Defaults to Qt.DisplayRole.
+
+        Returns:
+            The cell text for Qt.DisplayRole, its alignment for Qt.TextAlignmentRole, and None
+            otherwise.
+        """
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            account = self.account(index.row())
+            if account is None:
+                return None
+            return cell_text(account, index.column())
+
+        if role == Qt.TextAlignmentRole:
+            if index.column() == BALANCE_COLUMN:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return int(Qt.AlignCenter)
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        """
+        Returns the column headers.
+
+        Args:
+            section (int): The column or row.
+            orientation (Qt.Orientation): Qt.Horizontal for column headers.
+            role (int, optional): The Qt item data role. Defaults to Qt.DisplayRole.
+
+        Returns:
+            The header text of a column for Qt.DisplayRole, and otherwise the default header data.
+        """
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(COLUMN_HEADERS):
+            return COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+class AccountFilterProxyModel(QSortFilterProxyModel):
+    """
+    Description:
+        The `AccountFilterProxyModel` class shows the rows of an AccountTableModel which contain
+        a text in one column. The rows matching are worked out once, from the source model's
+        text index, when the filter is set; deciding whether a row is shown is then a list
+        lookup. The rows shown do not change when an account is updated, until the filter is
+        set again.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, parent=None) -> None:
+        """
+        Description:
+            Initializes a proxy which shows every row.
+
+        Args:
+            parent (QObject, optional): The Qt parent of the proxy.
+        """
+        super().__init__(parent)
+        # One bool per source row, or None when no filter is set.
+        self.__accepted = None
+
+    @property
+    def filter_active(self) -> bool:
+        """
+        Returns whether a filter is set.
+
+        Returns:
+            bool: True if rows may be hidden.
+        """
+        return self.__accepted is not None
+
+    def setSourceModel(self, source_model: AccountTableModel) -> None:
+        """
+        Sets the model being filtered and clears the filter.
+
+        Args:
+            source_model (AccountTableModel): The model.
+        """
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.modelAboutToBeReset.disconnect(self.__drop_filter)
+            previous.rowsAboutToBeRemoved.disconnect(self.__drop_filter)
+            previous.rowsRemoved.disconnect(self.__refilter)
+        self.__accepted = None
+        super().setSourceModel(source_model)
+        if source_model is not None:
+            # The filter describes the rows it was set on, so it is dropped when they change.
+            source_model.modelAboutToBeReset.connect(self.__drop_filter)
+            source_model.rowsAboutToBeRemoved.connect(self.__drop_filter)
+            source_model.rowsRemoved.connect(self.__refilter)
+
+    def __drop_filter(self, *args) -> None:
+        """
+        Forgets the filter without filtering again; the source model is about to change.
+        """
+        self.__accepted = None
+
+    def __refilter(self, *args) -> None:
+        """
+        Filters the remaining rows again once the source model has removed some.
+        """
+        self.invalidateFilter()
+
+    def set_filter(self, column: int, text: str) -> int:
+        """
+        Shows only the rows containing a text in a column. Case and surrounding whitespace are ignored.
+
+        Args:
+            column (int): The source model column.
+            text (str): The text.
+
+        Returns:
+            int: The number of rows shown.
+
+        Raises:
+            IndexError: If the column does not exist.
+        """
+        self.__accepted = self.sourceModel().text_index.match(column, text)
+        self.invalidateFilter()
+        return self.rowCount()
+
+    def clear_filter(self) -> None:
+        """
+        Shows every row.
+        """
+        if self.__accepted is not None:
+            self.__accepted = None
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        """
+        Returns whether a source row is shown.
+
+        Args:
+            source_row (int): The source row.
+            source_parent (QModelIndex): Always invalid for a table.
+
+        Returns:
+            bool: True if no filter is set or the row matches it.
+        """
+        accepted = self.__accepted
+        return accepted is None or source_row >= len(accepted) or accepted[source_row]
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Removes rows. Removing every row shown empties the source model, including the rows
+        the filter hides.
+
+        Args:
+            row (int): The first row removed.
+            count (int): The number of rows removed.
+            parent (QModelIndex, optional): Always invalid for a table.
+
+        Returns:
+            bool: True if the rows were removed.
+        """
+        source_model = self.sourceModel()
+        if source_model is not None and not parent.isValid() and row == 0 and count == self.rowCount():
+            return source_model.removeRows(0, source_model.rowCount())
+        return super().removeRows(row, count, parent)
@@ -0,0 +1,139 @@
+"""
+Description: Defines the AccountTextIndex class, which holds the text of each column of the
+account table normalized for filtering. The text is built once for the rows loaded, so applying
+a filter is one substring test per row rather than formatting and lowercasing every cell again.
+Also defines the column headers and the cell text of the account table, which the table model
+and the index share.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from bank_account.bank_account import BankAccount
+
+COLUMN_HEADERS = ["Account Number", "Balance", "Date Created", "Account Type"]
+
+ACCOUNT_NUMBER_COLUMN = 0
+BALANCE_COLUMN = 1
+DATE_CREATED_COLUMN = 2
+ACCOUNT_TYPE_COLUMN = 3
+
+def cell_text(account: BankAccount, column: int) -> str:
+    """
+    Returns the text shown for an account in a column of the account table.
+
+    Args:
+        account (BankAccount): The account.
+        column (int): The column.
+
+    Returns:
+        str: The text.
+
+    Raises:
+        IndexError: If the column does not exist.
+    """
+    if column == ACCOUNT_NUMBER_COLUMN:
+        return str(account.account_number)
+    if column == BALANCE_COLUMN:
+        return f"${account.balance:,.2f}"
+    if column == DATE_CREATED_COLUMN:
+        return str(account.date_created)
+    if column == ACCOUNT_TYPE_COLUMN:
+        return account.__class__.__name__
+    raise IndexError(f"The account table has no column {column}.")
+
+def normalize(text: str) -> str:
+    """
+    Returns text as it is compared when filtering: without surrounding whitespace and in lower case.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The normalized text.
+    """
+    return text.strip().lower()
+
+
+class AccountTextIndex:
+    """
+    Description:
+        The `AccountTextIndex` class holds the normalized cell text of a list of accounts, one
+        list per column, in row order.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, accounts=()) -> None:
+        """
+        Description:
+            Initializes an index of the given accounts.
+
+        Args:
+            accounts (iterable, optional): The accounts, in row order.
+        """
+        accounts = list(accounts)
+        self.__columns = [[normalize(cell_text(account, column)) for account in accounts]
+                          for column in range(len(COLUMN_HEADERS))]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows indexed.
+
+        Returns:
+            int: The number of rows.
+        """
+        return len(self.__columns[0])
+
+    def text(self, row: int, column: int) -> str:
+        """
+        Returns the normalized text of a cell.
+
+        Args:
+            row (int): The row.
+            column (int): The column.
+
+        Returns:
+            str: The text.
+        """
+        return self.__columns[column][row]
+
+    def update(self, row: int, account: BankAccount) -> None:
+        """
+        Indexes the account now shown in a row.
+
+        Args:
+            row (int): The row.
+            account (BankAccount): The account.
+        """
+        for column, texts in enumerate(self.__columns):
+            texts[row] = normalize(cell_text(account, column))
+
+    def remove(self, row: int, count: int) -> None:
+        """
+        Removes rows from the index.
+
+        Args:
+            row (int): The first row removed.
+            count (int): The number of rows removed.
+        """
+        for texts in self.__columns:
+            del texts[row:row + count]
+
+    def match(self, column: int, text: str) -> list:
+        """
+        Returns which rows contain text in a column.
+
+        Args:
+            column (int): The column.
+            text (str): The text looked for; it is normalized first. Empty text matches every row.
+
+        Returns:
+            list of bool, one per row, True if the row matches.
+
+        Raises:
+            IndexError: If the column does not exist.
+        """
+        if not 0 <= column < len(self.__columns):
+            raise IndexError(f"The account table has no column {column}.")
+        text = normalize(text)
+        return [text in value for value in self.__columns[column]]
@@ -0,0 +1,204 @@
+"""
+Description: Defines the AccountWriter class, which batches account balance updates and
+persists them in the background with manage_data.update_many.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import logging
+import threading
+import time
+from bank_account.bank_account import BankAccount
+from user_interface import manage_data
+
+class AccountWriter:
+    """
+    Description:
+        The `AccountWriter` class collects updated accounts and persists them in batches from a
+        background thread. Pending updates are coalesced by account number, so an account that
+        changes several times before a flush is written once, with its latest balance.
+
+        A batch is written once `batch_size` accounts are pending, or `flush_interval` seconds
+        after the first pending update, whichever comes first. `flush` writes pending updates
+        immediately and `close` flushes and stops the background thread; call one of them
+        before shutting down.
+
+    Attributes:
+        None
+    """
+    def __init__(self, flush_interval: float = 1.0, batch_size: int = 100, write=None) -> None:
+        """
+        Description:
+            Initializes the writer and starts its background thread.
+
+        Args:
+            flush_interval (float): The maximum number of seconds an update waits before being written.
+            batch_size (int): The number of pending accounts which triggers a write.
+            write (callable, optional): Persists a list of accounts. Defaults to `manage_data.update_many`.
+
+        Raises:
+            ValueError: If flush_interval is not positive or batch_size is less than 1.
+        """
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must be positive.")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
+        self.__flush_interval = flush_interval
+        self.__batch_size = batch_size
+        self.__write = write or manage_data.update_many
+
+        self.__pending = {}
+        self.__first_pending_time = None
+        self.__closed = False
+        self.__condition = threading.Condition()
+        # Held while a batch is being written, so that batches are written in order.
+        self.__write_lock = threading.Lock()
+
+        self.__thread = threading.Thread(target=self.__run, name="AccountWriter", daemon=True)
+        self.__thread.start()
+
+    def submit(self, account: BankAccount) -> None:
+        """
+        Queues an updated account to be written.
+
+        Args:
+            account (BankAccount): The account containing an updated balance.
+
+        Raises:
+            RuntimeError: If the writer has been closed.
+        """
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("AccountWriter is closed.")
+
+            if not self.__pending:
+                # Wake the background thread so that it starts the flush_interval timer.
+                self.__first_pending_time = time.monotonic()
+                self.__condition.notify()
+            self.__pending[account.account_number] = account
+
+            if len(self.__pending) >= self.__batch_size:
+                self.__condition.notify()
+
+    def submit_many(self, accounts) -> None:
+        """
+        Queues several updated accounts to be written.
+
+        Args:
+            accounts (iterable): The accounts containing updated balances.
+        """
+        for account in accounts:
+            self.submit(account)
+
+    def pending_count(self) -> int:
+        """
+        Returns the number of accounts waiting to be written.
+
+        Returns:
+            int: The number of pending accounts.
+        """
+        with self.__condition:
+            return len(self.__pending)
+
+    def flush(self) -> None:
+        """
+        Writes all pending updates before returning. If the write fails, the updates
+        stay pending (unless superseded by newer ones) and the exception is raised.
+        """
+        with self.__write_lock:
+            batch = self.__take_pending()
+            if not batch:
+                return
+
+            try:
+                self.__write(batch)
+            except Exception:
+                self.__requeue(batch)
+                raise
+
+    def close(self) -> None:
+        """
+        Stops the background thread and writes any pending updates.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+        self.flush()
+
+    def __enter__(self):
+        """
+        Returns the writer for use in a `with` statement.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Closes the writer at the end of a `with` statement.
+        """
+        self.close()
+
+    def __take_pending(self) -> list:
+        """
+        Removes and returns the pending accounts.
+
+        Returns:
+            list: The pending accounts.
+        """
+        with self.__condition:
+            batch = list(self.__pending.values())
+            self.__pending = {}
+            self.__first_pending_time = None
+            return batch
+
+    def __requeue(self, batch: list) -> None:
+        """
+        Returns the accounts of a failed batch to the pending updates, unless newer
+        updates for the same accounts have been submitted since.
+
+        Args:
+            batch (list): The accounts which failed to be written.
+        """
+        with self.__condition:
+            pending = {account.account_number: account for account in batch}
+            pending.update(self.__pending)
+            self.__pending = pending
+            if self.__first_pending_time is None:
+                self.__first_pending_time = time.monotonic()
+
+    def __run(self) -> None:
+        """
+        Background thread: waits until a batch is due and writes it.
+        """
+        while True:
+            with self.__condition:
+                while not self.__closed and not self.__batch_due():
+                    timeout = None
+                    if self.__first_pending_time is not None:
+                        timeout = self.__first_pending_time + self.__flush_interval - time.monotonic()
+                    self.__condition.wait(timeout)
+
+                if self.__closed:
+                    return
+
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Unable to write account updates: {e}")
+                # Wait before retrying, so a persistent failure does not spin.
+                with self.__condition:
+                    if not self.__closed:
+                        self.__condition.wait(self.__flush_interval)
+
+    def __batch_due(self) -> bool:
+        """
+        Checks whether the pending updates should be written. Called with the condition held.
+
+        Returns:
+            bool: True if the batch is full or its oldest update has waited flush_interval seconds.
+        """
+        if not self.__pending:
+            return False
+        if len(self.__pending) >= self.__batch_size:
+            return True
+        return time.monotonic() - self.__first_pending_time >= self.__flush_interval
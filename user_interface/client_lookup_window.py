@@ -1,9 +1,14 @@
-from PySide6.QtWidgets import QTableWidgetItem, QMessageBox
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import QModelIndex
 from PySide6.QtCore import Slot
 from ui_superclasses.lookup_window import LookupWindow
 from user_interface.account_details_window import AccountDetailsWindow
-from user_interface.manage_data import load_data
+from user_interface.account_repository import AccountRepository
+from user_interface.account_table_model import AccountFilterProxyModel, AccountTableModel
+from user_interface import manage_data
+from user_interface.manage_data import load_account_repository
+from user_interface.manage_data import load_client_accounts
+from user_interface.manage_data import load_clients
 from user_interface.manage_data import update_data
 from bank_account.bank_account import BankAccount
 
@@ -16,13 +21,18 @@ class ClientLookupWindow(LookupWindow):
 
     Attributes:
         client_listing (dict): A dictionary mapping client numbers to Client objects.
-        accounts (dict): A dictionary mapping account numbers to BankAccount objects.
+        accounts (AccountRepository): The bank accounts, keyed by account number and indexed by client number.
+            With the sqlite backend it holds the accounts of the clients looked up so far.
+        account_model (AccountTableModel): The model of the account table, backed by accounts.
+        account_filter (AccountFilterProxyModel): The filter between account_model and the table.
 
     Methods:
         __init__():
             Initializes the ClientLookupWindow, loads data, and sets up event connections.
         on_lookup_client():
             Handles client lookups by client number, displaying relevant client and account data.
+        on_account_clicked(index):
+            Opens the AccountDetailsWindow for the account clicked in the table.
         on_select_account(row, column):
             Opens the AccountDetailsWindow for the selected account from the table.
         update_data(account):
@@ -33,17 +43,27 @@ class ClientLookupWindow(LookupWindow):
     def __init__(self):
         """
         Initializes the ClientLookupWindow with data and sets up event connections.
+        With the sqlite backend only the clients are loaded; each client's accounts
+        are queried through the client number index when the client is looked up.
 
         Returns:
             None
         """
         super().__init__()
 
-        self.client_listing, self.accounts = load_data()
+        if manage_data.STORAGE_BACKEND == 'sqlite':
+            self.client_listing, self.accounts = load_clients(), AccountRepository()
+        else:
+            self.client_listing, self.accounts = load_account_repository()
+
+        self.account_model = AccountTableModel(self.accounts, self)
+        self.account_filter = AccountFilterProxyModel(self)
+        self.account_filter.setSourceModel(self.account_model)
+        self.account_table.setModel(self.account_filter)
 
         self.lookup_button.clicked.connect(self.on_lookup_client)
 
-        self.account_table.cellClicked.connect(self.on_select_account)
+        self.account_table.clicked.connect(self.on_account_clicked)
 
         self.filter_button.clicked.connect(self.on_filter_clicked)
 
@@ -71,31 +91,29 @@ class ClientLookupWindow(LookupWindow):
         client = self.client_listing[client_number]
         self.client_info_label.setText(f"Client Name: {client.get_full_name()}")
 
-        self.account_table.setRowCount(0)
-
-        for account in self.accounts.values():
-            if account.client_number == client_number:
-                row_position = self.account_table.rowCount()
-                self.account_table.insertRow(row_position)
+        if manage_data.STORAGE_BACKEND == 'sqlite' and not self.accounts.accounts_for_client(client_number):
+            for account in load_client_accounts(client_number):
+                self.accounts.add(account)
 
-                account_number_item = QTableWidgetItem(str(account.account_number))
-                balance_item = QTableWidgetItem(f"${account.balance:,.2f}")
-                date_created_item = QTableWidgetItem(str(account.date_created))
-                account_type_item = QTableWidgetItem(account.__class__.__name__)
-
-                account_number_item.setTextAlignment(Qt.AlignCenter)
-                balance_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                date_created_item.setTextAlignment(Qt.AlignCenter)
-                account_type_item.setTextAlignment(Qt.AlignCenter)
-
-                self.account_table.setItem(row_position, 0, account_number_item)
-                self.account_table.setItem(row_position, 1, balance_item)
-                self.account_table.setItem(row_position, 2, date_created_item)
-                self.account_table.setItem(row_position, 3, account_type_item)
+        self.account_model.set_client(client_number)
 
         self.account_table.resizeColumnsToContents()
         self.toggle_filter(False)
     
+    @Slot(QModelIndex)
+    def on_account_clicked(self, index: QModelIndex) -> None:
+        """
+        Handles a click on the account table by opening the Account Details window.
+
+        Args:
+            index (QModelIndex): The cell clicked, in the filtered table.
+
+        Returns:
+            None
+        """
+        source_index = self.account_filter.mapToSource(index)
+        self.on_select_account(source_index.row(), source_index.column())
+
     @Slot(int, int)
     def on_select_account(self, row: int, column: int) -> None:
         """
@@ -108,20 +126,18 @@ class ClientLookupWindow(LookupWindow):
         Returns:
             None
         """
-        account_number_item = self.account_table.item(row, 0)
-        account_number = account_number_item.text() if account_number_item else ""
-
-        if not account_number:
+        if not 0 <= row < self.account_model.rowCount():
             QMessageBox.information(self, "Invalid Selection", "The selected account is invalid.")
             return
 
-        if int(account_number) not in self.accounts:
+        bank_account = self.account_model.account(row)
+
+        if bank_account is None:
             QMessageBox.information(self, "Bank Account does not Exist", "The selected bank account does not exist.")
             return
 
-        bank_account = self.accounts[int(account_number)]
-
         account_details_window = AccountDetailsWindow(bank_account)
+        account_details_window.balance_updated.connect(self.update_data)
         account_details_window.exec_()
 
     def update_data(self, account: BankAccount) -> None:
@@ -134,19 +150,13 @@ class ClientLookupWindow(LookupWindow):
         Returns:
             None
         """
+        if self.account_model.row_of(account.account_number) < 0:
+            return
 
-        for row in range(self.account_table.rowCount()):
-            account_number_in_table = self.account_table.item(row, 0).text()
-
-            if account_number_in_table == str(account.account_number):
-
-                self.account_table.setItem(row, 1, 
-                                           QTableWidgetItem(f"${account.balance:,.2f}"))
-
-                self.accounts[account.account_number] = account
+        self.accounts.update(account)
+        self.account_model.refresh_account(account.account_number)
 
-                update_data(account)
-                break
+        update_data(account)
 
     def on_filter_clicked(self):
         """
@@ -158,26 +168,14 @@ class ClientLookupWindow(LookupWindow):
         if self.filter_button.text() == "Apply Filter":
             # Get the selected column index and the filter text
             filter_column = self.filter_combo_box.currentIndex()
-            filter_text = self.filter_edit.text().strip().lower()
+            filter_text = self.filter_edit.text()
 
-            for row in range(self.account_table.rowCount()):
-                # Get the cell text for the specified column in the current row
-                cell_item = self.account_table.item(row, filter_column)
-                cell_text = cell_item.text().strip().lower() if cell_item else ""
+            self.account_filter.set_filter(filter_column, filter_text)
 
-                # Determine whether to hide the row based on the filter text
-                if filter_text not in cell_text:
-                    self.account_table.setRowHidden(row, True)
-                else:
-                    self.account_table.setRowHidden(row, False)
-
-            self.toggle_filter(filter_applied=True)
+            self.toggle_filter(True)
         else:
             # Reset the filtering to show all rows
-            for row in range(self.account_table.rowCount()):
-                self.account_table.setRowHidden(row, False)
-
-            self.toggle_filter(filter_applied=False)
+            self.toggle_filter(False)
 
     def toggle_filter(self, filter_on: bool) -> None:
         """
@@ -206,8 +204,7 @@ class ClientLookupWindow(LookupWindow):
             self.filter_combo_box.setCurrentIndex(0)  # Reset combobox to the first option
 
             # Show all rows in the account table
-            for row in range(self.account_table.rowCount()):
-                self.account_table.setRowHidden(row, False)
+            self.account_filter.clear_filter()
 
             self.filter_label.setText("Data is Not Currently Filtered")
 
@@ -0,0 +1,333 @@
+"""
+Description: Reads and writes a compact binary snapshot of the loaded clients and accounts, so
+that load_data can skip parsing the CSV files while they are unchanged. Values are stored typed,
+in packed columns (account numbers, balances, creation dates as ordinals, and so on), so reading
+a snapshot converts each column with one call and creates the accounts directly from the values,
+without parsing any text.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from array import array
+from datetime import date
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from bank_account.chequing_account import ChequingAccount
+from bank_account.investment_account import InvestmentAccount
+from bank_account.savings_account import SavingsAccount
+
+# File layout (all integers little-endian):
+#   magic
+#   flags (B): USES_CENTS if the accounts store their balances in cents
+#   source key: per source file, size (q, -1 if missing), mtime_ns (q) and a BLAKE2b digest
+#               of the contents (DIGEST_SIZE bytes, zeros if missing)
+#   clients: count (I), client numbers (q column), then a string block of first name,
+#            last name and email address per client
+#   accounts: count (I), then the columns account number (q), client number (q), account
+#             type (b), balance (d), date created as an ordinal (i), first and second
+#             parameter (d, d), then a string block of the account holders
+#   string block: lengths in characters (i column, NONE_LENGTH encodes None), the size of
+#                 the text in bytes (Q), then the strings' UTF-8 text, concatenated
+# The parameters are the overdraft limit and rate of a ChequingAccount, the minimum balance
+# of a SavingsAccount and the management fee of an InvestmentAccount.
+MAGIC = b'PRSNAP03'
+USES_CENTS = 0x01
+NONE_LENGTH = -1
+DIGEST_SIZE = 16
+
+_FLAGS = struct.Struct('<B')
+_SOURCE = struct.Struct(f'<qq{DIGEST_SIZE}s')
+_COUNT = struct.Struct('<I')
+_TEXT_SIZE = struct.Struct('<Q')
+
+CHEQUING, SAVINGS, INVESTMENT = 0, 1, 2
+ACCOUNT_TYPES = {ChequingAccount: CHEQUING, SavingsAccount: SAVINGS, InvestmentAccount: INVESTMENT}
+
+# The typecodes of the account columns, in file order.
+_ACCOUNT_COLUMNS = ('q', 'q', 'b', 'd', 'i', 'd', 'd')
+
+def source_key(source_paths: list) -> list:
+    """
+    Describes the current state of the source files a snapshot is built from.
+
+    Args:
+        source_paths (list): The paths of the source files.
+
+    Returns:
+        list: A (size, mtime_ns, digest) tuple per source file. Missing files are described
+              as (-1, 0, DIGEST_SIZE zero bytes).
+    """
+    return [_describe(path) for path in source_paths]
+
+def _describe(path: str, stored: tuple = None) -> tuple:
+    """
+    Describes a source file by its size, modification time and a digest of its contents.
+
+    Args:
+        path (str): The path of the file.
+        stored (tuple, optional): A stored description to compare against. The contents are
+            only hashed if the file's size and modification time match it.
+
+    Returns:
+        tuple: (size, mtime_ns, digest), with a digest of None if the contents were not hashed.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (-1, 0, bytes(DIGEST_SIZE))
+    described = (stat.st_size, stat.st_mtime_ns)
+    if stored is not None and described != stored[:2]:
+        return described + (None,)
+    try:
+        with open(path, 'rb') as file:
+            digest = hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=DIGEST_SIZE)).digest()
+    except FileNotFoundError:
+        return (-1, 0, bytes(DIGEST_SIZE))
+    return described + (digest,)
+
+def write_snapshot(path: str, key: list, clients: list, accounts, uses_cents: bool = False) -> None:
+    """
+    Writes a snapshot file. The file is written to a temporary file and swapped in atomically.
+
+    Args:
+        path (str): The path of the snapshot file.
+        key (list): The source key returned by `source_key` before the data was read.
+        clients (list): (client_number, first_name, last_name, email_address) tuples.
+        accounts (iterable): The accounts, each a ChequingAccount, SavingsAccount or InvestmentAccount.
+        uses_cents (bool, optional): Whether the accounts store their balances in cents.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If an account is of another type.
+    """
+    parts = [MAGIC, _FLAGS.pack(USES_CENTS if uses_cents else 0)]
+    for size, mtime_ns, digest in key:
+        parts.append(_SOURCE.pack(size, mtime_ns, digest))
+
+    parts.append(_COUNT.pack(len(clients)))
+    parts.append(_column_bytes(array('q', (client[0] for client in clients))))
+    _pack_strings(parts, [value for client in clients for value in client[1:]])
+
+    columns = [array(typecode) for typecode in _ACCOUNT_COLUMNS]
+    holders = []
+    for account in accounts:
+        account_type = ACCOUNT_TYPES.get(type(account))
+        if account_type is None:
+            raise ValueError(f"Accounts of type {type(account).__name__} cannot be written to a snapshot.")
+        if account_type == CHEQUING:
+            first, second = account.overdraft_limit, account.overdraft_rate
+        elif account_type == SAVINGS:
+            first, second = account.minimum_balance, 0.0
+        else:
+            first, second = account.management_fee, 0.0
+        values = (account.account_number, account.client_number, account_type, account.balance,
+                  account.date_created.toordinal(), first, second)
+        for column, value in zip(columns, values):
+            column.append(value)
+        holders.append(account.account_holder)
+
+    parts.append(_COUNT.pack(len(holders)))
+    parts.extend(_column_bytes(column) for column in columns)
+    _pack_strings(parts, holders)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(b''.join(parts))
+    os.replace(temp_path, path)
+
+def _column_bytes(column: array) -> bytes:
+    """
+    Returns the little-endian bytes of a column.
+
+    Args:
+        column (array): The column.
+
+    Returns:
+        bytes: The packed values.
+    """
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+def _pack_strings(parts: list, values: list) -> None:
+    """
+    Appends a string block to a list of byte strings.
+
+    Args:
+        parts (list): The byte strings being assembled.
+        values (list): The strings to encode, or None.
+
+    Returns:
+        None
+    """
+    lengths = array('i', (NONE_LENGTH if value is None else len(value) for value in values))
+    text = ''.join(value for value in values if value is not None).encode('utf-8')
+    parts.append(_column_bytes(lengths))
+    parts.append(_TEXT_SIZE.pack(len(text)))
+    parts.append(text)
+
+def read_snapshot(path: str, source_paths: list, uses_cents: bool = False):
+    """
+    Reads a snapshot file through a memory map, if it exists, its source files are unchanged
+    and its accounts store balances the same way.
+
+    Args:
+        path (str): The path of the snapshot file.
+        source_paths (list): The paths of the source files, in the order used to write it.
+        uses_cents (bool, optional): Whether the accounts should store their balances in cents.
+
+    Returns:
+        tuple: (clients, accounts), the client tuples as passed to `write_snapshot` and a list of
+               new accounts, or None if the snapshot is missing, stale or unreadable.
+    """
+    try:
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _read_mapped(mapped, source_paths, uses_cents)
+    except (OSError, ValueError, EOFError, struct.error, UnicodeDecodeError):
+        return None
+
+def _read_mapped(mapped: mmap.mmap, source_paths: list, uses_cents: bool):
+    """
+    Decodes a memory-mapped snapshot file.
+
+    Args:
+        mapped (mmap): The memory-mapped snapshot file.
+        source_paths (list): The paths of the source files.
+        uses_cents (bool): Whether the accounts should store their balances in cents.
+
+    Returns:
+        tuple: (clients, accounts), or None if the snapshot is stale.
+    """
+    if mapped[:len(MAGIC)] != MAGIC:
+        return None
+    offset = len(MAGIC)
+
+    (flags,) = _FLAGS.unpack_from(mapped, offset)
+    offset += _FLAGS.size
+    if bool(flags & USES_CENTS) != bool(uses_cents):
+        return None
+
+    for source_path in source_paths:
+        stored = _SOURCE.unpack_from(mapped, offset)
+        offset += _SOURCE.size
+        if stored != _describe(source_path, stored):
+            return None
+
+    (client_count,) = _COUNT.unpack_from(mapped, offset)
+    offset += _COUNT.size
+    client_numbers, offset = _unpack_column(mapped, offset, 'q', client_count)
+    names, offset = _unpack_strings(mapped, offset, 3 * client_count)
+    clients = [(client_number, *names[3 * index:3 * index + 3]) for index, client_number in enumerate(client_numbers)]
+
+    (account_count,) = _COUNT.unpack_from(mapped, offset)
+    offset += _COUNT.size
+    columns = []
+    for typecode in _ACCOUNT_COLUMNS:
+        column, offset = _unpack_column(mapped, offset, typecode, account_count)
+        columns.append(column)
+    holders, offset = _unpack_strings(mapped, offset, account_count)
+
+    return clients, _create_accounts(*columns, holders)
+
+def _unpack_column(mapped: mmap.mmap, offset: int, typecode: str, count: int):
+    """
+    Decodes a column of a snapshot.
+
+    Args:
+        mapped (mmap): The snapshot contents.
+        offset (int): The offset of the column.
+        typecode (str): The array typecode of the values.
+        count (int): The number of values.
+
+    Returns:
+        tuple: The column (array) and the offset following it.
+
+    Raises:
+        ValueError: If the column extends past the end of the snapshot.
+    """
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    if end > len(mapped):
+        raise ValueError("Truncated snapshot.")
+    column.frombytes(mapped[offset:end])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column, end
+
+def _unpack_strings(mapped: mmap.mmap, offset: int, count: int):
+    """
+    Decodes a string block of a snapshot.
+
+    Args:
+        mapped (mmap): The snapshot contents.
+        offset (int): The offset of the block.
+        count (int): The number of strings.
+
+    Returns:
+        tuple: The list of strings (or None) and the offset following the block.
+
+    Raises:
+        ValueError: If the block extends past the end of the snapshot.
+    """
+    lengths, offset = _unpack_column(mapped, offset, 'i', count)
+    (size,) = _TEXT_SIZE.unpack_from(mapped, offset)
+    offset += _TEXT_SIZE.size
+    end = offset + size
+    if end > len(mapped):
+        raise ValueError("Truncated snapshot.")
+    text = str(mapped[offset:end], 'utf-8')
+
+    values = []
+    position = 0
+    for length in lengths:
+        if length == NONE_LENGTH:
+            values.append(None)
+        else:
+            values.append(text[position:position + length])
+            position += length
+    if position != len(text):
+        raise ValueError("Corrupt snapshot strings.")
+    return values, end
+
+def _create_accounts(account_numbers, client_numbers, account_types, balances, ordinals, firsts, seconds,
+                     holders) -> list:
+    """
+    Creates the accounts described by the columns of a snapshot.
+
+    Args:
+        account_numbers (array): The account numbers.
+        client_numbers (array): The client numbers.
+        account_types (array): The account type codes.
+        balances (array): The balances.
+        ordinals (array): The creation dates, as proleptic Gregorian ordinals.
+        firsts (array): The first parameter of each account.
+        seconds (array): The second parameter of each account.
+        holders (list): The account holders.
+
+    Returns:
+        list: The accounts, in snapshot order.
+
+    Raises:
+        ValueError: If an account type code is not known.
+    """
+    from_ordinal = date.fromordinal
+    accounts = []
+    for account_number, client_number, account_type, balance, ordinal, first, second, holder in zip(
+            account_numbers, client_numbers, account_types, balances, ordinals, firsts, seconds, holders):
+        date_created = from_ordinal(ordinal)
+        if account_type == CHEQUING:
+            account = ChequingAccount(account_number, client_number, holder, balance, first, second, date_created)
+        elif account_type == SAVINGS:
+            account = SavingsAccount(account_number, client_number, balance, date_created, first)
+        elif account_type == INVESTMENT:
+            account = InvestmentAccount(account_number, client_number, balance, date_created, first)
+        else:
+            raise ValueError(f"Unknown account type {account_type} in snapshot.")
+        accounts.append(account)
+    return accounts
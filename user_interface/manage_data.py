@@ -5,12 +5,21 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import csv
 from datetime import datetime
+import io
 import logging
+import mmap
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from bank_account.bank_account import BankAccount
 from bank_account.chequing_account import ChequingAccount
 from bank_account.investment_account import InvestmentAccount
 from bank_account.savings_account import SavingsAccount
 from client.client import Client
+from client import email_validation
+from user_interface.account_repository import AccountRepository
+from user_interface import data_snapshot
+from user_interface import sqlite_storage
+from utility.money import format_cents, from_cents, to_cents
 
 # *******************************************************************************
 # GIVEN LOGGING AND FILE ACCESS CODE
@@ -44,131 +53,753 @@ accounts_csv_path = os.path.join(data_dir, 'accounts.csv')
 # END GIVEN LOGGING AND FILE ACCESS CODE
 # *******************************************************************************
 
+# Balance changes are appended to this journal instead of rewriting accounts.csv.
+# load_data replays the journal over accounts.csv and compact_journal folds it back in.
+accounts_journal_path = os.path.join(data_dir, 'accounts_journal.csv')
+JOURNAL_FIELDS = ['account_number', 'balance']
 
+# Set to False to rewrite accounts.csv on every update_data call instead of journaling.
+JOURNAL_ENABLED = True
 
+# update_data compacts the journal once it grows past this many bytes.
+JOURNAL_COMPACT_BYTES = 1024 * 1024
 
+# load_data parses accounts.csv in a pool of processes once it is at least this large;
+# smaller files are parsed faster in the calling process.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
 
+# load_data writes the parsed data to this binary snapshot and reads it back
+# instead of parsing the CSV files for as long as they (and the journal) are unchanged.
+snapshot_path = os.path.join(data_dir, 'snapshot.bin')
+SNAPSHOT_ENABLED = True
 
-def load_data()->tuple[dict,dict]:
+# The storage used by load_data and update_data: 'csv' for the data files
+# above, or 'sqlite' for the database below. The database is imported from
+# the data files the first time it is opened.
+STORAGE_BACKEND = 'csv'
+sqlite_db_path = os.path.join(data_dir, 'pixell_river.db')
+
+# The shared database connection, opened on first use, and the lock
+# which serializes its use.
+_sqlite_connection = None
+_sqlite_lock = threading.Lock()
+
+# Serializes writes to the data files (journal appends, compaction and rewrites of
+# accounts.csv), which can come from an AccountWriter thread as well as the caller's.
+# Reentrant, as update_many compacts the journal while holding it.
+_data_lock = threading.RLock()
+
+
+def load_data(workers: int = None)->tuple[dict,dict]:
     """
     Populates a client dictionary and an account dictionary with 
     corresponding data from files within the data directory.
+    When SNAPSHOT_ENABLED is set, the data is read from the binary snapshot
+    if the data files are unchanged since it was written, and the snapshot
+    is rewritten after the data files have been parsed.
+    Args:
+        workers (int, optional): The number of processes used to parse
+            accounts.csv. Defaults to one per CPU; 1 parses it in this process.
+            Files smaller than PARALLEL_MIN_BYTES are always parsed in this process.
     Returns:
         tuple containing client dictionary and account dictionary.
     """
+    if STORAGE_BACKEND == 'sqlite':
+        return _load_sqlite()
+
+    snapshot_sources = [clients_csv_path, accounts_csv_path, accounts_journal_path]
+
+    if SNAPSHOT_ENABLED:
+        snapshot = data_snapshot.read_snapshot(snapshot_path, snapshot_sources, BankAccount.USE_CENTS)
+        if snapshot is not None:
+            return _load_snapshot(*snapshot)
+        # Describe the sources before reading them, so that changes made
+        # while they are being read leave the new snapshot stale.
+        snapshot_key = data_snapshot.source_key(snapshot_sources)
+
     client_listing = {}
     accounts = {}
 
     # READ CLIENT DATA 
+    if email_validation.CHECK_DELIVERABILITY:
+        # Validate the addresses concurrently first, so that creating each
+        # client does not wait on the DNS queries for its address.
+        email_validation.validate_many(_iter_client_emails())
+
+    for client in iter_clients():
+        client_listing[client.client_number] = client
+
+    # READ ACCOUNT DATA
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers > 1 and _file_size(accounts_csv_path) >= PARALLEL_MIN_BYTES:
+        record_iterator = _iter_account_records_parallel(client_listing, workers)
+    else:
+        record_iterator = _iter_account_records(client_listing)
+
+    for _, account in record_iterator:
+        accounts[account.account_number] = account
+
+    if SNAPSHOT_ENABLED and os.path.exists(clients_csv_path) and os.path.exists(accounts_csv_path):
+        _write_snapshot(snapshot_key, client_listing, accounts)
+
+    # RETURN STATEMENT
+    return client_listing, accounts
+
+
+def _write_snapshot(snapshot_key: list, client_listing: dict, accounts: dict) -> None:
+    """
+    Writes the loaded data to the binary snapshot. Failures are logged.
+    Args:
+        snapshot_key (list): The description of the data files before they were read.
+        client_listing (dict): The loaded clients.
+        accounts (dict): The loaded accounts, with journaled balances applied.
+    """
+    clients = [(client.client_number, client.first_name, client.last_name, client.email_address)
+               for client in client_listing.values()]
+
     try:
-        with open(clients_csv_path, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
+        data_snapshot.write_snapshot(snapshot_path, snapshot_key, clients, accounts.values(),
+                                     BankAccount.USE_CENTS)
+    except (OSError, ValueError) as e:
+        logging.error(f"Unable to write data snapshot: {e}")
 
-            for record in reader:
-                try:
-                    client_number = int(record['client_number'])
-                    first_name = record['first_name']
-                    last_name = record['last_name']
-                    email_address = record['email']
 
-                    client = Client(client_number, first_name, last_name, email_address)
+def _load_snapshot(clients: list, snapshot_accounts: list) -> tuple[dict, dict]:
+    """
+    Populates a client dictionary and an account dictionary from
+    the contents of the binary snapshot.
+    Args:
+        clients (list): The client values read from the snapshot.
+        snapshot_accounts (list): The accounts created from the snapshot.
+    Returns:
+        tuple containing client dictionary and account dictionary.
+    """
+    client_listing = {}
 
-                    client_listing[client_number] = client
+    for client_number, first_name, last_name, email_address in clients:
+        client_listing[client_number] = Client.from_validated(client_number, first_name, last_name, email_address)
 
-                except Exception as e:
-                    logging.error(f"Unable to create client from record {record}: {e}")
+    accounts = {account.account_number: account for account in snapshot_accounts}
+
+    return client_listing, accounts
+
+
+def iter_clients():
+    """
+    Yields Client objects one at a time from the clients.csv file, so that
+    the client data can be processed without holding it all in memory.
+    Records which cannot be converted are logged and skipped.
+    Yields:
+        Client: The next client in the file.
+    """
+    try:
+        with open(clients_csv_path, newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+
+            for record in reader:
+                client = _client_from_record(record)
+                if client is not None:
+                    yield client
 
     except FileNotFoundError:
         logging.error("clients.csv file not found.")
     except Exception as e:
         logging.error(f"Error reading client data: {e}")
 
-    # READ ACCOUNT DATA
+
+def _iter_client_emails():
+    """
+    Yields the email address of each record in the clients.csv file.
+    Yields:
+        str: The next email address.
+    """
+    try:
+        with open(clients_csv_path, newline='') as csvfile:
+            for record in csv.DictReader(csvfile):
+                email_address = record.get('email_address', record.get('email'))
+                if email_address is not None:
+                    yield email_address
+    except FileNotFoundError:
+        return
+
+
+def iter_accounts(client_numbers=None):
+    """
+    Yields BankAccount objects one at a time from the accounts.csv file, with
+    journaled balances applied, so that the account data can be processed
+    without holding it all in memory. Records which cannot be converted are
+    logged and skipped.
+    Args:
+        client_numbers (optional): A container of known client numbers (such as
+            the client dictionary). When given, accounts belonging to other
+            clients are logged and skipped.
+    Yields:
+        BankAccount: The next account in the file.
+    """
+    for _, account in _iter_account_records(client_numbers):
+        yield account
+
+
+def _iter_account_records(client_numbers=None):
+    """
+    Yields each valid accounts.csv record, with its journaled balance
+    applied, together with the BankAccount created from it.
+    Args:
+        client_numbers (optional): A container of known client numbers.
+    Yields:
+        tuple containing the record and the BankAccount.
+    """
+    journal_balances = read_journal()
+
     try:
         with open(accounts_csv_path, newline='') as csvfile:
             reader = csv.DictReader(csvfile)  
 
             for record in reader:
-                try:
-                    account_number = record['account_number']
-                    client_number = record['client_number']
-                    account_holder = record['account_holder']
-                    balance = record['balance']
-                    date_created = record['date_created']
-                    account_type = record['account_type']
-                    overdraft_limit = record.get('overdraft_limit', None)
-                    overdraft_rate = record.get('overdraft_rate', None)
-                    management_fee = record.get('management_fee', None)
-                    minimum_balance = record.get('minimum_balance', None)
-
-                    try:
-                        balance = float(balance)
-                        if overdraft_limit:
-                            overdraft_limit = float(overdraft_limit)
-                        if overdraft_rate:
-                            overdraft_rate = float(overdraft_rate)
-                        if management_fee:
-                            management_fee = float(management_fee)
-                        if minimum_balance:
-                            minimum_balance = float(minimum_balance)
-                    except ValueError as e:
-                        logging.error(f"Unable to convert value for account {account_number}: {e}")
-                        continue  # Skip to the next record
-
-
-                    if account_type == 'ChequingAccount':
-                        try:
-                            account = ChequingAccount(
-                                account_number, client_number, account_holder, 
-                                balance, overdraft_limit, overdraft_rate, date_created
-                            )
-                        except Exception as e:
-                            logging.error(f"Unable to create ChequingAccount: {e}")
-                            continue
-                    elif account_type == 'InvestmentAccount':
-                        try:
-                            account = InvestmentAccount(
-                                account_number, client_number, balance, date_created, management_fee
-                            )
-                        except Exception as e:
-                            logging.error(f"Unable to create InvestmentAccount: {e}")
-                            continue
-                    elif account_type == 'SavingsAccount':
-                        try:
-                            account = SavingsAccount(
-                                account_number, client_number, balance, date_created, minimum_balance
-                            )
-                        except Exception as e:
-                            logging.error(f"Unable to create SavingsAccount: {e}")
-                            continue
-                    else:
-                        logging.error(f"Not a valid account type for account {account_number}: {account_type}")
-                        continue
-
-                    if client_number in client_listing:
-                        accounts[account_number] = account  
-                    else:
-                        logging.error(f"Bank Account {account_number}: Client {client_number} not found in client_listing")
+                account = _account_from_record(record, journal_balances, client_numbers)
+                if account is not None:
+                    yield record, account
 
-                except Exception as e:
-                    logging.error(f"Error processing record {record}: {e}")
+    except FileNotFoundError:
+        logging.error("accounts.csv file not found.")
+    except Exception as e:
+        logging.error(f"Error reading account data: {e}")
+
+
+def iter_accounts_parallel(client_numbers=None, workers: int = None):
+    """
+    Yields the same BankAccount objects, in the same order, as iter_accounts,
+    but parses accounts.csv in a pool of processes. The memory-mapped file is
+    split into line-aligned byte ranges, each process parses one range, and
+    the results and error messages are merged back in file order.
+    Records containing quoted line breaks are not supported.
+    Args:
+        client_numbers (optional): A container of known client numbers. When
+            given, accounts belonging to other clients are logged and skipped.
+        workers (int, optional): The number of processes. Defaults to one per CPU.
+    Yields:
+        BankAccount: The next account in the file.
+    """
+    for _, account in _iter_account_records_parallel(client_numbers, workers):
+        yield account
+
+
+def _iter_account_records_parallel(client_numbers=None, workers: int = None):
+    """
+    The parallel counterpart of _iter_account_records.
+    Args:
+        client_numbers (optional): A container of known client numbers.
+        workers (int, optional): The number of processes. Defaults to one per CPU.
+    Yields:
+        tuple containing the record and the BankAccount.
+    """
+    workers = workers or os.cpu_count() or 1
+    journal_balances = read_journal()
+    known_clients = None if client_numbers is None else frozenset(client_numbers)
+
+    try:
+        with open(accounts_csv_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                newline = mapped.find(b'\n')
+                header_end = len(mapped) if newline == -1 else newline + 1
+                fieldnames = next(csv.reader([mapped[:header_end].decode('utf-8')]))
+                ranges = _line_aligned_ranges(mapped, header_end, workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_parse_account_range,
+                                   [accounts_csv_path] * len(ranges), [fieldnames] * len(ranges),
+                                   ranges, [journal_balances] * len(ranges),
+                                   [known_clients] * len(ranges), [BankAccount.USE_CENTS] * len(ranges))
+
+            for pairs, errors in results:
+                for error in errors:
+                    logging.error(error)
+                yield from pairs
 
     except FileNotFoundError:
         logging.error("accounts.csv file not found.")
     except Exception as e:
         logging.error(f"Error reading account data: {e}")
 
-    # RETURN STATEMENT
+
+def _file_size(path: str) -> int:
+    """
+    Returns the size of a file in bytes, or 0 if it does not exist.
+    Args:
+        path (str): The path to the file.
+    Returns:
+        int: The size of the file.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _next_line_start(mapped: mmap.mmap, position: int) -> int:
+    """
+    Returns the offset of the first line starting at or after a position.
+    Args:
+        mapped (mmap): The memory-mapped file.
+        position (int): The offset to search from (at least 1).
+    Returns:
+        int: The offset of the next line, or the file size if there is none.
+    """
+    newline = mapped.find(b'\n', position - 1)
+    return len(mapped) if newline == -1 else newline + 1
+
+
+def _line_aligned_ranges(mapped: mmap.mmap, start: int, count: int) -> list:
+    """
+    Splits the memory-mapped file from the start offset into at most count
+    contiguous byte ranges, each of which begins at the start of a line.
+    Args:
+        mapped (mmap): The memory-mapped file.
+        start (int): The offset of the first data line.
+        count (int): The number of ranges to create.
+    Returns:
+        list of (begin, end) offsets.
+    """
+    size = len(mapped)
+    step = max(1, (size - start) // count)
+    ranges = []
+    begin = start
+
+    while begin < size:
+        end = size if len(ranges) == count - 1 else _next_line_start(mapped, begin + step)
+        ranges.append((begin, end))
+        begin = end
+
+    return ranges
+
+
+def _parse_account_range(path: str, fieldnames: list, byte_range: tuple, journal_balances: dict, client_numbers,
+                         use_cents: bool = False):
+    """
+    Parses one line-aligned byte range of accounts.csv. Runs in a worker process.
+    Args:
+        path (str): The path to accounts.csv.
+        fieldnames (list): The field names from the header line.
+        byte_range (tuple): The (begin, end) offsets to parse.
+        journal_balances (dict): Journaled balances, keyed by account number.
+        client_numbers (optional): A container of known client numbers.
+        use_cents (bool): The parent process's BankAccount.USE_CENTS, which
+            worker processes started with 'spawn' would not otherwise see.
+    Returns:
+        tuple containing the list of (record, account) pairs and the list of error messages.
+    """
+    begin, end = byte_range
+    pairs = []
+    errors = []
+
+    # The range is decoded straight from a view of the mapping, without first copying it to bytes.
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped)[begin:end] as view:
+                text = str(view, 'utf-8')
+
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames)
+
+    # The flag is set only while this range's accounts are created, so that a range parsed
+    # in the calling process does not change its setting.
+    previous_use_cents = BankAccount.USE_CENTS
+    BankAccount.USE_CENTS = use_cents
+    try:
+        for record in reader:
+            account = _account_from_record(record, journal_balances, client_numbers, errors.append)
+            if account is not None:
+                pairs.append((record, account))
+    finally:
+        BankAccount.USE_CENTS = previous_use_cents
+
+    return pairs, errors
+
+
+def _optional_value(record: dict, field: str):
+    """
+    Returns the value of an optional field of a record, treating
+    missing, blank and 'Null' values as None.
+    Args:
+        record (dict): A record read from a data file.
+        field (str): The name of the field.
+    Returns:
+        The field value, or None.
+    """
+    value = record.get(field)
+    if value is None or value.strip() in ('', 'Null'):
+        return None
+    return value
+
+
+def _client_from_record(record: dict, log=logging.error):
+    """
+    Converts a clients.csv record to a Client object.
+    Args:
+        record (dict): A record read from clients.csv.
+        log (callable): Receives the error message if the record is invalid.
+    Returns:
+        Client: The client, or None if the record is invalid.
+    """
+    try:
+        client_number = int(record['client_number'])
+        first_name = record['first_name']
+        last_name = record['last_name']
+        email_address = record['email_address'] if 'email_address' in record else record['email']
+
+        return Client(client_number, first_name, last_name, email_address)
+
+    except Exception as e:
+        log(f"Unable to create client from record {record}: {e}")
+        return None
+
+
+def _account_from_record(record: dict, journal_balances: dict, client_numbers=None, log=logging.error):
+    """
+    Converts an accounts.csv record to a BankAccount object, applying
+    the journaled balance for the account (to the record) if there is one.
+    Args:
+        record (dict): A record read from accounts.csv.
+        journal_balances (dict): Journaled balances, keyed by account number.
+        client_numbers (optional): A container of known client numbers. When
+            given, an account belonging to another client is invalid.
+        log (callable): Receives the error message if the record is invalid.
+    Returns:
+        BankAccount: The account, or None if the record is invalid.
+    """
+    try:
+        account_number = int(record['account_number'])
+        client_number = int(record['client_number'])
+        account_holder = record.get('account_holder')
+        if account_number in journal_balances:
+            record['balance'] = journal_balances[account_number]
+        balance = record['balance']
+        date_created = record['date_created']
+        account_type = record['account_type']
+        overdraft_limit = _optional_value(record, 'overdraft_limit')
+        overdraft_rate = _optional_value(record, 'overdraft_rate')
+        management_fee = _optional_value(record, 'management_fee')
+        minimum_balance = _optional_value(record, 'minimum_balance')
+
+        try:
+            # Accounts which store cents are given the balance rounded to the cent from its text,
+            # rather than from its nearest float.
+            balance = from_cents(to_cents(balance)) if BankAccount.USE_CENTS else float(balance)
+            if overdraft_limit:
+                overdraft_limit = float(overdraft_limit)
+            if overdraft_rate:
+                overdraft_rate = float(overdraft_rate)
+            if management_fee:
+                management_fee = float(management_fee)
+            if minimum_balance:
+                minimum_balance = float(minimum_balance)
+        except ValueError as e:
+            log(f"Unable to convert value for account {account_number}: {e}")
+            return None
+
+
+        if account_type == 'ChequingAccount':
+            try:
+                account = ChequingAccount(
+                    account_number, client_number, account_holder, 
+                    balance, overdraft_limit, overdraft_rate, date_created
+                )
+            except Exception as e:
+                log(f"Unable to create ChequingAccount: {e}")
+                return None
+        elif account_type == 'InvestmentAccount':
+            try:
+                account = InvestmentAccount(
+                    account_number, client_number, balance, date_created, management_fee
+                )
+            except Exception as e:
+                log(f"Unable to create InvestmentAccount: {e}")
+                return None
+        elif account_type == 'SavingsAccount':
+            try:
+                account = SavingsAccount(
+                    account_number, client_number, balance, date_created, minimum_balance
+                )
+            except Exception as e:
+                log(f"Unable to create SavingsAccount: {e}")
+                return None
+        else:
+            log(f"Not a valid account type for account {account_number}: {account_type}")
+            return None
+
+        if client_numbers is not None and client_number not in client_numbers:
+            log(f"Bank Account {account_number}: Client {client_number} not found in client_listing")
+            return None
+
+        return account
+
+    except Exception as e:
+        log(f"Error processing record {record}: {e}")
+        return None
+
+
+def get_sqlite_connection():
+    """
+    Returns the shared database connection, opening it on first use. A new
+    database is populated from the data files (with journaled balances).
+    Returns:
+        sqlite3.Connection: The database connection.
+    """
+    global _sqlite_connection
+
+    with _sqlite_lock:
+        if _sqlite_connection is None:
+            is_new = not os.path.exists(sqlite_db_path)
+            connection = sqlite_storage.connect(sqlite_db_path)
+            if is_new:
+                try:
+                    sqlite_storage.import_csv(connection, clients_csv_path, accounts_csv_path, read_journal())
+                except FileNotFoundError as e:
+                    logging.error(f"Unable to import data into {sqlite_db_path}: {e}")
+            _sqlite_connection = connection
+
+    return _sqlite_connection
+
+
+def import_csv_to_sqlite() -> None:
+    """
+    Imports the data files (with journaled balances) into the database,
+    replacing stored records with the same client or account numbers.
+    """
+    connection = get_sqlite_connection()
+
+    with _sqlite_lock:
+        sqlite_storage.import_csv(connection, clients_csv_path, accounts_csv_path, read_journal())
+
+
+def close_sqlite_connection() -> None:
+    """
+    Closes the shared database connection, if it is open.
+    """
+    global _sqlite_connection
+
+    with _sqlite_lock:
+        if _sqlite_connection is not None:
+            _sqlite_connection.close()
+            _sqlite_connection = None
+
+
+def _load_sqlite() -> tuple[dict, dict]:
+    """
+    Populates a client dictionary and an account dictionary from the database.
+    Returns:
+        tuple containing client dictionary and account dictionary.
+    """
+    client_listing = load_clients()
+    connection = get_sqlite_connection()
+    accounts = {}
+
+    with _sqlite_lock:
+        for record in sqlite_storage.iter_account_records(connection):
+            account = _account_from_record(record, {}, client_listing)
+            if account is not None:
+                accounts[account.account_number] = account
+
     return client_listing, accounts
 
 
+def load_clients() -> dict:
+    """
+    Populates a client dictionary without loading any accounts, for callers
+    which load each client's accounts with load_client_accounts.
+    Returns:
+        dict mapping client numbers to Client objects.
+    """
+    if STORAGE_BACKEND != 'sqlite':
+        return {client.client_number: client for client in iter_clients()}
+
+    connection = get_sqlite_connection()
+    client_listing = {}
+
+    with _sqlite_lock:
+        for record in sqlite_storage.iter_client_records(connection):
+            client = _client_from_record(record)
+            if client is not None:
+                client_listing[client.client_number] = client
+
+    return client_listing
+
+
+def load_client_accounts(client_number: int) -> list:
+    """
+    Loads the accounts belonging to one client. With the sqlite backend this
+    is an indexed query; with the csv backend the accounts file is scanned.
+    Args:
+        client_number (int): The client whose accounts to load.
+    Returns:
+        list of the client's BankAccount objects.
+    """
+    if STORAGE_BACKEND != 'sqlite':
+        return [account for account in iter_accounts() if account.client_number == client_number]
+
+    connection = get_sqlite_connection()
+    accounts = []
+
+    with _sqlite_lock:
+        for record in sqlite_storage.iter_account_records(connection, client_number):
+            account = _account_from_record(record, {})
+            if account is not None:
+                accounts.append(account)
+
+    return accounts
+
+
+def load_account_repository(workers: int = None) -> tuple[dict, AccountRepository]:
+    """
+    Loads the client and account data and wraps the accounts in an
+    AccountRepository indexed by client number.
+    Args:
+        workers (int, optional): The number of processes used to parse accounts.csv,
+            as for load_data.
+    Returns:
+        tuple containing client dictionary and account repository.
+    """
+    client_listing, accounts = load_data(workers)
+    return client_listing, AccountRepository(accounts)
+
+
 def update_data(updated_account: BankAccount) -> None:
     """
-    A function to update the accounts.csv file with balance 
-    data provided in the BankAccount argument.
+    A function to persist the balance provided in the BankAccount argument.
+    With the sqlite backend the account's row is updated. Otherwise, when
+    JOURNAL_ENABLED is set the balance is appended to the accounts journal
+    (compacting it once it exceeds JOURNAL_COMPACT_BYTES), and when it is
+    not the accounts.csv file is rewritten with the new balance.
     Args:
         updated_account (BankAccount): A bank account containing an updated balance.
     """
+    update_many([updated_account])
+
+
+def update_many(updated_accounts) -> None:
+    """
+    A function to persist the balances provided in the BankAccount arguments
+    with a single write: one transaction with the sqlite backend, one journal
+    append, or one rewrite of accounts.csv. When an account appears more than
+    once, its last balance is written.
+    Args:
+        updated_accounts (iterable): Bank accounts containing updated balances.
+    """
+    balances = {}
+    for account in updated_accounts:
+        balances[int(account.account_number)] = _balance_text(account)
+
+    if not balances:
+        return
+
+    if STORAGE_BACKEND == 'sqlite':
+        connection = get_sqlite_connection()
+        with _sqlite_lock:
+            sqlite_storage.update_balances(connection, balances)
+        return
+
+    with _data_lock:
+        if not JOURNAL_ENABLED:
+            _rewrite_accounts(balances)
+            return
+
+        _append_journal(balances)
+
+        if os.path.getsize(accounts_journal_path) >= JOURNAL_COMPACT_BYTES:
+            compact_journal()
+
+
+def append_journal(updated_account: BankAccount) -> None:
+    """
+    Appends the balance provided in the BankAccount argument to the accounts journal.
+    Args:
+        updated_account (BankAccount): A bank account containing an updated balance.
+    """
+    with _data_lock:
+        _append_journal({updated_account.account_number: _balance_text(updated_account)})
+
+
+def _balance_text(account: BankAccount):
+    """
+    Returns the balance of an account as it is written to the data files.
+    Accounts which store cents are written with exactly two decimal places.
+    Args:
+        account (BankAccount): The bank account.
+    Returns:
+        The balance: a string for accounts which store cents, otherwise the balance itself.
+    """
+    return format_cents(account.balance_cents) if account.uses_cents else account.balance
+
+
+def _append_journal(balances: dict) -> None:
+    """
+    Appends balances to the accounts journal with a single write.
+    Args:
+        balances (dict): A dictionary mapping account numbers to new balances.
+    """
+    write_header = not os.path.exists(accounts_journal_path) or os.path.getsize(accounts_journal_path) == 0
+
+    with open(accounts_journal_path, mode='a', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=JOURNAL_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows({'account_number': account_number, 'balance': balance}
+                         for account_number, balance in balances.items())
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def read_journal() -> dict:
+    """
+    Reads the accounts journal.
+    Returns:
+        dict mapping account numbers to their latest journaled balance (as text).
+    """
+    balances = {}
+
+    try:
+        with open(accounts_journal_path, newline='') as file:
+            reader = csv.DictReader(file)
+
+            for record in reader:
+                try:
+                    balances[int(record['account_number'])] = record['balance']
+                except Exception as e:
+                    logging.error(f"Skipping journal record {record}: {e}")
+
+    except FileNotFoundError:
+        pass
+
+    return balances
+
+
+def compact_journal() -> None:
+    """
+    Folds the accounts journal into accounts.csv and empties the journal.
+    Replaying a journal is idempotent, so a crash between the two steps
+    leaves the data consistent. Appends wait until the journal is emptied,
+    so none is lost in between.
+    """
+    with _data_lock:
+        balances = read_journal()
+
+        if balances:
+            _rewrite_accounts(balances)
+
+        if os.path.exists(accounts_journal_path):
+            open(accounts_journal_path, mode='w').close()
+
+
+def _rewrite_accounts(balances: dict) -> None:
+    """
+    Rewrites the accounts.csv file, replacing the balance of each account in
+    the balances argument. The file is replaced atomically.
+    Args:
+        balances (dict): A dictionary mapping account numbers to new balances.
+    """
     updated_rows = []
 
     with open(accounts_csv_path, mode='r', newline='') as file:
@@ -178,16 +809,18 @@ def update_data(updated_account: BankAccount) -> None:
         for row in reader:
             account_number = int(row['account_number'])
             # Check if the account number is in the dictionary
-            if account_number == updated_account.account_number:
+            if account_number in balances:
                 # Update the balance column with the new balance from the dictionary
-                row['balance'] = updated_account.balance
+                row['balance'] = balances[account_number]
             updated_rows.append(row)
 
-    # Write the updated data back to the CSV
-    with open(accounts_csv_path, mode='w', newline='') as file:
+    # Write the updated data to a temporary file and swap it in
+    temp_path = accounts_csv_path + '.tmp'
+    with open(temp_path, mode='w', newline='') as file:
         writer = csv.DictWriter(file, fieldnames=fields)
         writer.writeheader()
         writer.writerows(updated_rows)
+    os.replace(temp_path, accounts_csv_path)
 
 
 # GIVEN TESTING SECTION:
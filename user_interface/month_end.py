@@ -0,0 +1,339 @@
+"""
+Description: Headless month-end batch job. Loads the accounts through manage_data, calculates
+each account's service charge across a process pool, posts the charges and persists the new
+balances. Every posted charge is recorded in a results file, and each chunk is committed there
+once its balances are persisted. The results file is also the checkpoint:
+a run which is interrupted resumes where it stopped, and a rerun only recalculates accounts
+which changed after their charge was posted (the dirty set).
+Usage: python -m user_interface.month_end [--period YYYY-MM] [--workers N] [--chunk-size N]
+Author: Jashanpreet Kaur Jattana
+"""
+
+import os
+import sys
+# Allows the module to be run directly as well as with python -m.
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import argparse
+import csv
+import hashlib
+import logging
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from bank_account.bank_account import BankAccount
+from patterns.strategy.batch_service_charges import calculate_service_charges
+from user_interface import manage_data
+
+# The results of each period's run are written to this directory.
+output_dir = os.path.join(manage_data.root_dir, 'output')
+
+# The number of accounts whose charges are posted and persisted together. Progress
+# is checkpointed after each chunk.
+CHUNK_SIZE = 10000
+
+RESULT_FIELDS = ['entry', 'batch', 'account_number', 'client_number', 'service_charge', 'balance_before',
+                 'balance_after', 'fingerprint_before', 'fingerprint_after']
+
+# The kinds of result rows. A CHARGE row records a posted service charge and a REFUND row the
+# reversal of an earlier charge. The rows of a batch are written before its balances are
+# persisted; a COMMIT row is written once they have been, so only rows of uncommitted
+# batches can be missing from the data files.
+CHARGE = 'charge'
+REFUND = 'refund'
+COMMIT = 'commit'
+
+def results_path(period: str) -> str:
+    """
+    Returns the path of a period's results file.
+    Args:
+        period (str): The period, as 'YYYY-MM'.
+    Returns:
+        str: The path of the results file.
+    """
+    return os.path.join(output_dir, f"month_end_{period}.csv")
+
+def _period(text: str) -> str:
+    """
+    Validates a period.
+    Args:
+        text (str): The period, as 'YYYY-MM'.
+    Returns:
+        str: The period.
+    Raises:
+        ValueError: If the period is not a valid 'YYYY-MM' month.
+    """
+    datetime.strptime(text, '%Y-%m')
+    if len(text) != 7:
+        raise ValueError(f"Period must be in YYYY-MM format: {text}")
+    return text
+
+def fingerprint(account: BankAccount) -> str:
+    """
+    Returns a digest of everything an account's service charge depends on: its
+    type, its balance and its strategy's parameters (whatever the strategy's class, such
+    as a fee schedule's rule).
+    Args:
+        account (BankAccount): The account.
+    Returns:
+        str: The fingerprint.
+    """
+    strategy = account.service_charge_strategy
+    inputs = [type(account).__name__, repr(account.balance), repr(account.date_created), type(strategy).__name__]
+    inputs.extend(map(repr, strategy.parameters))
+    return hashlib.blake2b('|'.join(inputs).encode('utf-8'), digest_size=16).hexdigest()
+
+def read_results(path: str) -> dict:
+    """
+    Reads the charges in a results file. When an account was charged more than once its
+    last charge applies. Each row is given a 'committed' value: True if its batch was
+    persisted.
+    Args:
+        path (str): The path of the results file.
+    Returns:
+        dict mapping account numbers to their charge rows.
+    """
+    results = {}
+    committed = set()
+
+    try:
+        with open(path, newline='') as file:
+            for row in csv.DictReader(file):
+                entry = row.get('entry')
+                if entry == COMMIT:
+                    committed.add(row.get('batch'))
+                    continue
+                if entry != CHARGE:
+                    continue
+                try:
+                    results[int(row['account_number'])] = row
+                except (KeyError, TypeError, ValueError) as e:
+                    logging.error(f"Skipping month-end result {row}: {e}")
+    except FileNotFoundError:
+        pass
+
+    for row in results.values():
+        row['committed'] = row.get('batch') in committed
+    return results
+
+def _write_results(path: str, rows: list) -> None:
+    """
+    Appends rows to a results file and syncs them to disk.
+    Args:
+        path (str): The path of the results file.
+        rows (list): The result rows.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+
+    with open(path, mode='a', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+        file.flush()
+        os.fsync(file.fileno())
+
+def _post(path: str, batch: str, rows: list, accounts: list) -> None:
+    """
+    Records a batch of result rows, persists the batch's balances and commits the batch.
+    A run which stops in between leaves the batch uncommitted, so the next run can tell
+    which recorded balances may not have been persisted.
+    Args:
+        path (str): The path of the results file.
+        batch (str): The batch identifier.
+        rows (list): The batch's result rows.
+        accounts (list): The accounts whose balances the rows record.
+    """
+    for row in rows:
+        row['batch'] = batch
+    _write_results(path, rows)
+    manage_data.update_many(accounts)
+    _write_results(path, [{'entry': COMMIT, 'batch': batch}])
+
+def _result_row(entry: str, account: BankAccount, amount: float, balance_before: float,
+                fingerprint_before: str) -> dict:
+    """
+    Returns the result row of a change to an account's balance.
+    Args:
+        entry (str): CHARGE or REFUND.
+        account (BankAccount): The account, after the change.
+        amount (float): The service charge posted, or (negated) the charge refunded.
+        balance_before (float): The balance before the change.
+        fingerprint_before (str): The fingerprint before the change.
+    Returns:
+        dict: The row.
+    """
+    return {'entry': entry,
+            'account_number': account.account_number,
+            'client_number': account.client_number,
+            'service_charge': repr(amount),
+            'balance_before': repr(balance_before),
+            'balance_after': repr(account.balance),
+            'fingerprint_before': fingerprint_before,
+            'fingerprint_after': fingerprint(account)}
+
+def period_end(period: str) -> date:
+    """
+    Returns the last day of a period, the date on which account ages are determined.
+    Args:
+        period (str): The period, as 'YYYY-MM'.
+    Returns:
+        date: The last day of the month.
+    """
+    year, month = map(int, period.split('-'))
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+def _calculate_chunk(accounts: list, as_of: date) -> list:
+    """
+    Calculates the service charges of a chunk of accounts. Runs in a worker process.
+    Args:
+        accounts (list): The accounts.
+        as_of (date): The date on which account ages are determined.
+    Returns:
+        list of service charges, in the order of the accounts.
+    """
+    return calculate_service_charges(accounts, as_of).tolist()
+
+def _chunks(items: list, size: int):
+    """
+    Yields consecutive slices of a list.
+    Args:
+        items (list): The list.
+        size (int): The length of each slice (the last may be shorter).
+    Yields:
+        list: The next slice.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def run_month_end(period: str = None, workers: int = None, chunk_size: int = None) -> dict:
+    """
+    Calculates, posts and persists the service charges of every account for a period.
+    Management fee eligibility is determined as of the last day of the period.
+
+    Accounts are classified against their last charge in the period's results file:
+    accounts with no charge are charged; accounts whose state matches their state after
+    the charge are skipped; accounts whose charge was not committed and whose state
+    matches their state before it (the run stopped before their new balance was persisted)
+    are given their recorded balance again; accounts which changed after their charge was
+    committed are dirty, so the charge is refunded and recalculated; and accounts which
+    match neither state of an uncommitted charge are charged again, as it was not persisted.
+    Args:
+        period (str, optional): The period, as 'YYYY-MM'. Defaults to the current month.
+        workers (int, optional): The number of processes which calculate charges. Defaults
+            to one per CPU; 1 calculates in this process.
+        chunk_size (int, optional): The number of accounts posted and persisted together.
+            Defaults to CHUNK_SIZE.
+    Returns:
+        dict with the number of accounts 'charged', 'recalculated', 'restored' and
+        'skipped', and the 'total_charges' posted by this run.
+    Raises:
+        ValueError: If the period is not a valid 'YYYY-MM' month.
+    """
+    period = _period(period) if period else date.today().strftime('%Y-%m')
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or CHUNK_SIZE
+    path = results_path(period)
+    run_id = uuid.uuid4().hex
+
+    _, accounts = manage_data.load_data(workers)
+    results = read_results(path)
+    summary = {'charged': 0, 'recalculated': 0, 'restored': 0, 'skipped': 0, 'total_charges': 0.0}
+
+    pending = []
+    restored = []
+    restored_rows = []
+    refunds = {}
+    for account in accounts.values():
+        result = results.get(account.account_number)
+        if result is None:
+            pending.append(account)
+            continue
+
+        current = fingerprint(account)
+        if current == result['fingerprint_after']:
+            summary['skipped'] += 1
+        elif not result['committed'] and current == result['fingerprint_before']:
+            account.balance = float(result['balance_after'])
+            restored.append(account)
+            restored_rows.append({field: result[field] for field in RESULT_FIELDS})
+        elif result['committed']:
+            # Dirty: refund the posted charge so it is recalculated from the current state.
+            # A refund is not a transaction, so the balance is set without notifying; the
+            # refund row is recorded and committed with the recalculated charge.
+            charge = float(result['service_charge'])
+            balance_before = account.balance
+            account.balance = balance_before + charge
+            refunds[account.account_number] = _result_row(REFUND, account, -charge, balance_before, current)
+            pending.append(account)
+        else:
+            pending.append(account)
+
+    if restored:
+        _post(path, f"{run_id}-restored", restored_rows, restored)
+        summary['restored'] = len(restored)
+
+    chunks = list(_chunks(pending, chunk_size))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(chunks) > 1 else None
+
+    try:
+        as_of = [period_end(period)] * len(chunks)
+        if executor:
+            charges_by_chunk = executor.map(_calculate_chunk, chunks, as_of)
+        else:
+            charges_by_chunk = map(_calculate_chunk, chunks, as_of)
+
+        for index, (chunk, charges) in enumerate(zip(chunks, charges_by_chunk)):
+            rows = []
+            for account, charge in zip(chunk, charges):
+                refund = refunds.get(account.account_number)
+                if refund is not None:
+                    rows.append(refund)
+                balance_before = account.balance
+                fingerprint_before = fingerprint(account)
+                account.update_balance(-charge)
+                rows.append(_result_row(CHARGE, account, charge, balance_before, fingerprint_before))
+
+                if account.account_number in results:
+                    summary['recalculated'] += 1
+                else:
+                    summary['charged'] += 1
+                summary['total_charges'] += charge
+
+            # Record the charges before persisting the balances, so that a run which stops
+            # in between restores the recorded balances rather than charging again.
+            _post(path, f"{run_id}-{index}", rows, chunk)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return summary
+
+def main(argv=None) -> int:
+    """
+    Runs the month-end batch job from the command line and prints a summary.
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv[1:].
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Calculate and post month-end service charges.")
+    parser.add_argument('--period', type=_period, default=None, help="the period to charge, as YYYY-MM (default: this month)")
+    parser.add_argument('--workers', type=int, default=None, help="the number of worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f"the number of accounts checkpointed together (default: {CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+
+    period = args.period or date.today().strftime('%Y-%m')
+    summary = run_month_end(period, args.workers, args.chunk_size)
+
+    print(f"Month-end {period}: {summary['charged']} charged, {summary['recalculated']} recalculated, "
+          f"{summary['restored']} restored, {summary['skipped']} unchanged; "
+          f"total charges ${summary['total_charges']:.2f}")
+    print(f"Results: {results_path(period)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Description: SQLite storage for the client and account data, used by manage_data as an
+alternative to the CSV files. Records are returned as dictionaries with the same field
+names as the CSV files, so that the same record conversion code can be used for both.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import csv
+import logging
+import sqlite3
+
+CLIENT_FIELDS = ['client_number', 'first_name', 'last_name', 'email_address']
+ACCOUNT_FIELDS = ['account_number', 'client_number', 'account_holder', 'balance', 'date_created',
+                  'account_type', 'overdraft_limit', 'overdraft_rate', 'minimum_balance', 'management_fee']
+
+# Columns other than the keys use TEXT affinity so that values round-trip exactly as in the CSV files.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    client_number INTEGER PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    email_address TEXT
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    account_number INTEGER PRIMARY KEY,
+    client_number INTEGER,
+    account_holder TEXT,
+    balance TEXT,
+    date_created TEXT,
+    account_type TEXT,
+    overdraft_limit TEXT,
+    overdraft_rate TEXT,
+    minimum_balance TEXT,
+    management_fee TEXT
+);
+CREATE INDEX IF NOT EXISTS accounts_client_number ON accounts (client_number);
+"""
+
+# Statements are kept as constants so that the connection's statement cache
+# reuses the prepared statement on every call. The keys are INTEGER PRIMARY KEY
+# columns, which are the rowid, so ordering by rowid orders by client or account number.
+SELECT_CLIENTS = f"SELECT {', '.join(CLIENT_FIELDS)} FROM clients ORDER BY rowid"
+SELECT_ACCOUNTS = f"SELECT {', '.join(ACCOUNT_FIELDS)} FROM accounts ORDER BY rowid"
+SELECT_CLIENT_ACCOUNTS = (f"SELECT {', '.join(ACCOUNT_FIELDS)} FROM accounts "
+                          "WHERE client_number = ? ORDER BY rowid")
+UPDATE_BALANCE = "UPDATE accounts SET balance = ? WHERE account_number = ?"
+INSERT_CLIENT = (f"INSERT OR REPLACE INTO clients ({', '.join(CLIENT_FIELDS)}) "
+                 f"VALUES ({', '.join('?' * len(CLIENT_FIELDS))})")
+INSERT_ACCOUNT = (f"INSERT OR REPLACE INTO accounts ({', '.join(ACCOUNT_FIELDS)}) "
+                  f"VALUES ({', '.join('?' * len(ACCOUNT_FIELDS))})")
+
+def connect(database_path: str) -> sqlite3.Connection:
+    """
+    Opens the database in WAL mode, creating the tables and index if needed.
+
+    Args:
+        database_path (str): The path to the database file.
+
+    Returns:
+        sqlite3.Connection: The open connection. It may be shared between threads,
+                            provided that callers serialize their use of it.
+    """
+    connection = sqlite3.connect(database_path, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+def import_csv(connection: sqlite3.Connection, clients_csv_path: str, accounts_csv_path: str,
+               balances: dict = None) -> None:
+    """
+    Imports the clients.csv and accounts.csv files in a single transaction, replacing any
+    stored records with the same numbers. Records whose client or account number is not an
+    integer are logged and skipped, as they cannot be stored under it.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        clients_csv_path (str): The path to clients.csv.
+        accounts_csv_path (str): The path to accounts.csv.
+        balances (dict, optional): Balances which override those in accounts.csv,
+                                   keyed by account number (such as journaled balances).
+
+    Returns:
+        None
+    """
+    balances = balances or {}
+
+    with open(clients_csv_path, newline='') as file:
+        client_rows = []
+        for record in csv.DictReader(file):
+            try:
+                record['client_number'] = int(record['client_number'])
+            except (KeyError, TypeError, ValueError) as e:
+                logging.error(f"Skipping client record {record}: invalid client number: {e}")
+                continue
+            if 'email_address' not in record:
+                record['email_address'] = record.get('email')
+            client_rows.append([record.get(field) for field in CLIENT_FIELDS])
+
+    with open(accounts_csv_path, newline='') as file:
+        account_rows = []
+        for record in csv.DictReader(file):
+            try:
+                account_number = int(record['account_number'])
+            except (KeyError, TypeError, ValueError) as e:
+                logging.error(f"Skipping account record {record}: invalid account number: {e}")
+                continue
+            record['account_number'] = account_number
+            if account_number in balances:
+                record['balance'] = balances[account_number]
+            account_rows.append([record.get(field) for field in ACCOUNT_FIELDS])
+
+    with connection:
+        connection.executemany(INSERT_CLIENT, client_rows)
+        connection.executemany(INSERT_ACCOUNT, account_rows)
+
+def iter_client_records(connection: sqlite3.Connection):
+    """
+    Yields the stored client records in order of client number.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+
+    Yields:
+        dict: A client record keyed by the clients.csv field names.
+    """
+    for row in connection.execute(SELECT_CLIENTS):
+        yield dict(row)
+
+def iter_account_records(connection: sqlite3.Connection, client_number: int = None):
+    """
+    Yields the stored account records in order of account number, optionally only those
+    of one client (using the client_number index).
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        client_number (int, optional): The client whose accounts to return.
+
+    Yields:
+        dict: An account record keyed by the accounts.csv field names.
+    """
+    if client_number is None:
+        cursor = connection.execute(SELECT_ACCOUNTS)
+    else:
+        cursor = connection.execute(SELECT_CLIENT_ACCOUNTS, (client_number,))
+
+    for row in cursor:
+        yield dict(row)
+
+def update_balances(connection: sqlite3.Connection, balances: dict) -> None:
+    """
+    Updates the balances of one or more accounts in a single transaction.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        balances (dict): New balances keyed by account number.
+
+    Returns:
+        None
+    """
+    with connection:
+        connection.executemany(UPDATE_BALANCE,
+                               [(str(balance), account_number) for account_number, balance in balances.items()])
@@ -1,19 +1,92 @@
+import atexit
 import os
+import threading
+from utility.outbox import Outbox
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+# The transport simulate_send_email delivers through; None for the shared file outbox.
+_transport = None
+
+# Callbacks which run at exit before the outbox and transport are closed, such as
+# flushing notification digests, which may still send messages.
+_shutdown_callbacks = []
+
+def at_shutdown(callback):
+        """
+        Registers a callback to run at exit, before the outbox and the transport are closed,
+        so that messages it sends are still delivered. Callbacks run in registration order.
+        Args:
+            callback (callable): Called with no arguments.
+        Returns:
+            callable: The callback.
+        """
+        _shutdown_callbacks.append(callback)
+        return callback
+
+def _shutdown():
+        """
+        Runs the shutdown callbacks, then closes the outbox (if it was created) and the
+        transport, so that every message sent by the callbacks is written.
+        """
+        for callback in _shutdown_callbacks:
+                callback()
+        with _outbox_lock:
+                outbox = _outbox
+        if outbox is not None:
+                outbox.close()
+        if _transport is not None:
+                _transport.close()
+
+atexit.register(_shutdown)
+
+def set_transport(transport):
+        """
+        Sets the transport simulate_send_email delivers messages through, such as an
+        SmtpTransport (see utility.transports) or a NotificationStore writing segmented,
+        indexed files (see utility.notification_store). None restores the shared file outbox.
+        Args:
+            transport (Transport): The transport, or None.
+        Returns:
+            Transport: The previous transport, or None.
+        """
+        global _transport
+        previous, _transport = _transport, transport
+        return previous
+
+def get_outbox():
+        """
+        Returns the outbox used by simulate_send_email, creating it on first use.
+        The outbox appends to 'observer_emails.txt' within the 'output' directory
+        of the current project directory, and is flushed and closed on exit, after
+        the callbacks registered with at_shutdown.
+        Returns:
+            Outbox: The shared outbox.
+        """
+        global _outbox
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox(os.path.join("output", "observer_emails.txt"))
+            return _outbox
 
 @staticmethod
 def simulate_send_email(email_address, subject, message):
         """
-        Sends a 'simulated' email in the form of adding an email message 
-        to a text file.  The message will appear in the 'observer_emails.txt' 
+        Sends a 'simulated' email in the form of adding an email message
+        to a text file.  The message will appear in the 'observer_emails.txt'
         file within the 'output' directory of the current project directory.
+        The message is queued on the shared outbox and written by its
+        background thread, so the caller does not wait on file I/O.
+        If a transport has been set with set_transport, the message is
+        delivered through it instead.
         Args:
             email_address (str):  The email address to which the 'simulated' message is sent.
             subject (str):  The subject line for the 'simulated' message.
             message (str): The message body for the 'simulated' message.
         """
-        directory = "output"
-        filename = "observer_emails.txt"
-        path = os.path.join(directory, filename)
-        os.makedirs(directory, exist_ok=True)
-        with open(path, "a") as file:
-            file.write(f"---\nTo: {email_address}\nSubject: {subject}\nMessage: {message}\n---\n")
\ No newline at end of file
+        transport = _transport
+        if transport is not None:
+                transport.send(email_address, subject, message)
+        else:
+                get_outbox().send(email_address, subject, message)
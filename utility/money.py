@@ -0,0 +1,140 @@
+"""
+Description: Conversions between dollar amounts and integer cents, used by accounts which
+store their balance in cents (see BankAccount.USE_CENTS) so that balance arithmetic is exact.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache
+
+CENTS_PER_DOLLAR = 100
+
+def to_cents(amount) -> int:
+    """
+    Converts a dollar amount to a whole number of cents, rounding half a cent away from zero.
+    Floats are converted from their shortest decimal representation, so 0.1 is 10 cents and
+    19.99 is 1999 cents (rather than the nearest binary value multiplied by 100).
+
+    Args:
+        amount (int, float, str, Decimal or Fraction): The dollar amount.
+
+    Returns:
+        int: The amount in cents.
+
+    Raises:
+        ValueError: If the amount is not a finite number.
+    """
+    if isinstance(amount, bool):
+        raise ValueError(f"Not a dollar amount: {amount!r}")
+    if isinstance(amount, int):
+        return amount * CENTS_PER_DOLLAR
+    if isinstance(amount, Fraction):
+        return _round_half_up(amount.numerator * CENTS_PER_DOLLAR, amount.denominator)
+    if isinstance(amount, float):
+        amount = repr(amount)
+    try:
+        cents = Decimal(amount.strip() if isinstance(amount, str) else amount).scaleb(2)
+        return int(cents.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError, ValueError, OverflowError):
+        raise ValueError(f"Not a dollar amount: {amount!r}") from None
+
+def from_cents(cents: int) -> float:
+    """
+    Converts a whole number of cents to dollars.
+
+    Args:
+        cents (int): The amount in cents.
+
+    Returns:
+        float: The amount in dollars (the float nearest to the exact value).
+    """
+    return cents / CENTS_PER_DOLLAR
+
+def format_cents(cents: int) -> str:
+    """
+    Formats a whole number of cents as a dollar amount with two decimal places, as stored
+    in the data files.
+
+    Args:
+        cents (int): The amount in cents.
+
+    Returns:
+        str: The amount, e.g. '-12.30'.
+    """
+    sign = '-' if cents < 0 else ''
+    dollars, remainder = divmod(abs(cents), CENTS_PER_DOLLAR)
+    return f"{sign}{dollars}.{remainder:02d}"
+
+@lru_cache(maxsize=1024)
+def rate_fraction(rate) -> Fraction:
+    """
+    Returns a rate (such as an overdraft rate) as an exact fraction of its decimal value.
+
+    Args:
+        rate (int, float or str): The rate.
+
+    Returns:
+        Fraction: The rate, e.g. Fraction(1, 20) for 0.05.
+    """
+    return Fraction(repr(rate) if isinstance(rate, float) else rate)
+
+def multiply_cents(cents: int, rate) -> int:
+    """
+    Multiplies an amount in cents by a rate, rounding half a cent away from zero, using
+    only integer arithmetic.
+
+    Args:
+        cents (int): The amount in cents.
+        rate (int, float or str): The rate.
+
+    Returns:
+        int: The product in cents.
+    """
+    rate = rate_fraction(rate)
+    return _round_half_up(cents * rate.numerator, rate.denominator)
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    """
+    Divides two integers, rounding half away from zero.
+
+    Args:
+        numerator (int): The dividend.
+        denominator (int): The divisor (positive).
+
+    Returns:
+        int: The rounded quotient.
+    """
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return -quotient if numerator < 0 else quotient
+
+def to_cents_array(amounts):
+    """
+    Converts an array of dollar amounts to an int64 array of cents, rounding exactly as
+    to_cents does: half a cent away from zero, from each amount's shortest decimal
+    representation. Amounts which are within rounding error of half a cent are converted
+    with to_cents; the rest are rounded with array operations.
+
+    Args:
+        amounts (array-like): The dollar amounts.
+
+    Returns:
+        ndarray: The amounts in cents.
+
+    Raises:
+        ValueError: If an amount is not a finite number.
+    """
+    import numpy as np
+
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if not np.all(np.isfinite(amounts)):
+        raise ValueError("Not a dollar amount: the array holds a value which is not finite.")
+
+    scaled = np.abs(amounts) * CENTS_PER_DOLLAR
+    cents = np.copysign(np.floor(scaled + 0.5), amounts).astype(np.int64)
+    # The product of a float and 100 can land on either side of a half cent which its decimal
+    # value is exactly on (1.005 * 100 is 100.49999999999999), so those amounts are redone.
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(scaled, 1.0)
+    if near_half.any():
+        cents[near_half] = [to_cents(float(amount)) for amount in amounts[near_half]]
+    return cents
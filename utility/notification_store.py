@@ -0,0 +1,528 @@
+"""
+Description: Defines the NotificationStore class, a Transport which writes notifications to
+segmented files instead of one ever-growing text file. Segments are rotated by size and by
+date, and each has a small index of the offset of every message by email address and client
+number, so one client's notifications are read by seeking to them. Messages are written by a
+background thread, as the Outbox writes the flat file, so senders never wait on file I/O.
+When a segment is closed
+its index is also written sorted by email address and client number, so finding a client's
+messages in it is a binary search. Closed segments can be compressed or moved to an archive
+without touching the others.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import csv
+from datetime import date
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+from urllib.parse import quote
+from utility.transports import Transport
+
+# Client.update starts each message with "Notification for <client number>: ".
+CLIENT_NUMBER_PATTERN = re.compile(r"Notification for (\d+):")
+
+SEGMENT_PATTERN = re.compile(r"^(?P<prefix>.+)-(?P<date>\d{8})-(?P<sequence>\d{4})\.txt(?P<gz>\.gz)?$")
+
+def _key(kind: str, value: str) -> bytes:
+    """
+    Returns a lookup key of a sorted index, which has no tabs or line breaks.
+
+    Args:
+        kind (str): 'c' for a client number or 'e' for an email address.
+        value (str): The client number or email address.
+
+    Returns:
+        bytes: The key.
+    """
+    return f"{kind}:{quote(value, safe='@')}".encode('utf-8')
+
+def _first_line_from(file, position: int) -> None:
+    """
+    Moves a file to the start of the first line which starts at or after a position.
+
+    Args:
+        file (file): The file, opened in binary mode.
+        position (int): The position.
+    """
+    if position:
+        file.seek(position - 1)
+        file.readline()
+    else:
+        file.seek(0)
+
+class NotificationStore(Transport):
+    """
+    Description:
+        The `NotificationStore` class appends messages, in the simulated email format, to the
+        current segment file of a directory. A new segment is started when the current one
+        reaches `max_bytes` or the date changes. Each segment `<name>.txt` has an index
+        `<name>.idx`, a CSV file with the offset, length, client number and email address of
+        each message. When the segment is closed, `<name>.key` is written: one line
+        "<key>\t<offset>\t<length>" per message and key, sorted by key, which `find` searches
+        by bisecting the file. `send` only queues the message; a writer thread appends
+        queued messages in batches and flushes the files whenever the queue runs empty.
+
+    Attributes:
+        MAX_BATCH (int): The most queued messages written before the files are flushed.
+    """
+    MAX_BATCH = 100
+    _STOP = object()
+
+    def __init__(self, directory: str, prefix: str = "observer_emails", max_bytes: int = 64 * 1024 * 1024,
+                 today=date.today) -> None:
+        """
+        Description:
+            Initializes the store and starts its writer thread. Writing continues in the
+            newest segment if it is from today and not full. If no thread can be started (as
+            while the interpreter is exiting), messages are queued and written by flush and close.
+
+        Args:
+            directory (str): The directory of the segment files.
+            prefix (str, optional): The start of the segment file names. Defaults to 'observer_emails'.
+            max_bytes (int, optional): The size at which a segment is rotated. Defaults to 64 MB.
+            today (callable, optional): Returns the current date. Defaults to date.today.
+
+        Raises:
+            ValueError: If max_bytes is less than 1.
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__max_bytes = max_bytes
+        self.__today = today
+        self.__lock = threading.Lock()
+        self.__closed = False
+        self.__segment = None
+        self.__file = None
+        self.__index_file = None
+        self.__index = None
+        self.__size = 0
+        self.__queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name="NotificationStore", daemon=True)
+        try:
+            self.__thread.start()
+        except RuntimeError:
+            self.__thread = None
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns the directory of the segment files.
+
+        Returns:
+            str: The directory.
+        """
+        return self.__directory
+
+    def segments(self) -> list:
+        """
+        Returns the names of the segments, oldest first, without their '.txt' or '.txt.gz' extension.
+
+        Returns:
+            list: The segment names.
+        """
+        names = set()
+        try:
+            entries = os.listdir(self.__directory)
+        except FileNotFoundError:
+            return []
+        for entry in entries:
+            match = SEGMENT_PATTERN.match(entry)
+            if match and match.group('prefix') == self.__prefix:
+                names.add(f"{match.group('prefix')}-{match.group('date')}-{match.group('sequence')}")
+        return sorted(names)
+
+    def __path(self, segment: str, extension: str) -> str:
+        """
+        Returns the path of a segment file.
+
+        Args:
+            segment (str): The segment name.
+            extension (str): '.txt', '.txt.gz' or '.idx'.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.__directory, segment + extension)
+
+    def __open_segment(self, size_needed: int, day: date) -> None:
+        """
+        Makes sure the current segment is open and has room for a message, rotating it if it
+        is full or from an earlier date. Called with the lock held.
+
+        Args:
+            size_needed (int): The size of the message in bytes.
+            day (date): The date the message was sent.
+        """
+        stamp = day.strftime('%Y%m%d')
+        if self.__file is not None:
+            if (self.__segment.rsplit('-', 2)[1] == stamp
+                    and (self.__size == 0 or self.__size + size_needed <= self.__max_bytes)):
+                return
+            self.__close_segment()
+
+        os.makedirs(self.__directory, exist_ok=True)
+        segments = [segment for segment in self.segments() if f"-{stamp}-" in segment]
+        segment = segments[-1] if segments else None
+        if segment is None or os.path.exists(self.__path(segment, '.txt.gz')):
+            sequence = int(segment.rsplit('-', 1)[1]) + 1 if segment else 1
+            segment = f"{self.__prefix}-{stamp}-{sequence:04d}"
+        else:
+            size = os.path.getsize(self.__path(segment, '.txt')) if os.path.exists(self.__path(segment, '.txt')) else 0
+            if size and size + size_needed > self.__max_bytes:
+                segment = f"{self.__prefix}-{stamp}-{int(segment.rsplit('-', 1)[1]) + 1:04d}"
+
+        path = self.__path(segment, '.txt')
+        if os.path.exists(self.__path(segment, '.key')):
+            # The segment is written to again, so its sorted index is rewritten when it closes.
+            os.remove(self.__path(segment, '.key'))
+        self.__segment = segment
+        self.__file = open(path, 'ab')
+        self.__size = self.__file.tell()
+        self.__index_file = open(self.__path(segment, '.idx'), 'a', newline='', encoding='utf-8')
+        self.__index = csv.writer(self.__index_file)
+
+    def __close_segment(self) -> None:
+        """
+        Closes the current segment and its index. Called with the lock held.
+        """
+        if self.__file is not None:
+            self.__file.close()
+            self.__index_file.close()
+            self.__write_keys(self.__segment)
+        self.__segment = self.__file = self.__index_file = self.__index = None
+        self.__size = 0
+
+    def __write_keys(self, segment: str) -> None:
+        """
+        Writes the sorted index of a closed segment from its index.
+
+        Args:
+            segment (str): The segment name.
+        """
+        lines = []
+        with open(self.__path(segment, '.idx'), newline='', encoding='utf-8') as index_file:
+            for row in csv.reader(index_file):
+                if len(row) != 4:
+                    continue
+                location = f"\t{int(row[0])}\t{int(row[1])}\n".encode('ascii')
+                if row[2]:
+                    lines.append((_key('c', row[2]), int(row[0]), location))
+                lines.append((_key('e', row[3]), int(row[0]), location))
+        lines.sort()
+
+        temp_path = self.__path(segment, '.key.tmp')
+        with open(temp_path, 'wb') as key_file:
+            key_file.writelines(key + location for key, _, location in lines)
+        os.replace(temp_path, self.__path(segment, '.key'))
+
+    def __lookup(self, segment: str, keys: list) -> list:
+        """
+        Finds messages in the sorted index of a segment by binary search.
+
+        Args:
+            segment (str): The segment name.
+            keys (list): The keys to look up.
+
+        Returns:
+            list: (offset, length) pairs, in ascending order of offset.
+        """
+        locations = set()
+        with open(self.__path(segment, '.key'), 'rb') as key_file:
+            size = os.fstat(key_file.fileno()).st_size
+            for key in keys:
+                low, high = 0, size
+                while low < high:
+                    middle = (low + high) // 2
+                    _first_line_from(key_file, middle)
+                    line = key_file.readline()
+                    if not line or line.split(b'\t', 1)[0] >= key:
+                        high = middle
+                    else:
+                        low = middle + 1
+                _first_line_from(key_file, low)
+                for line in key_file:
+                    line_key, offset, length = line.split(b'\t')
+                    if line_key != key:
+                        break
+                    locations.add((int(offset), int(length)))
+        return sorted(locations)
+
+    def __scan(self, segment: str, email_address: str, client_number: str) -> list:
+        """
+        Finds messages in the index of a segment by reading every row.
+
+        Args:
+            segment (str): The segment name.
+            email_address (str): The email address, or None.
+            client_number (str): The client number, or ''.
+
+        Returns:
+            list: (offset, length) pairs, in ascending order of offset.
+        """
+        locations = []
+        with open(self.__path(segment, '.idx'), newline='', encoding='utf-8') as index_file:
+            for row in csv.reader(index_file):
+                if len(row) == 4 and (row[3] == email_address or (client_number and row[2] == client_number)):
+                    locations.append((int(row[0]), int(row[1])))
+        return locations
+
+    def send(self, email_address: str, subject: str, message: str) -> None:
+        """
+        Queues a message to be appended to the current segment and indexed. Returns immediately.
+        The message is stored in the segment of the date it was sent on.
+
+        Args:
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+
+        Raises:
+            RuntimeError: If the store has been closed.
+        """
+        if self.__closed:
+            raise RuntimeError("Notification store is closed.")
+        self.__queue.put((self.__today(), email_address, subject, message))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every message queued before the call has been written, and the current
+        segment and its index have been flushed to the operating system.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the messages were flushed, False if the timeout expired.
+        """
+        if self.__thread is None:
+            while not self.__queue.empty():
+                self.__write_batch(block=False)
+            return True
+        if not self.__thread.is_alive():
+            return True
+        flushed = threading.Event()
+        self.__queue.put(flushed)
+        return flushed.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Writes any queued messages, closes the current segment and stops the writer thread.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put(self._STOP)
+        if self.__thread is None:
+            while not self.__write_batch(block=False):
+                pass
+        else:
+            self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        Writer thread: writes queued messages until the store is closed.
+        """
+        while not self.__write_batch():
+            pass
+
+    def __write_batch(self, block: bool = True) -> bool:
+        """
+        Takes up to MAX_BATCH items from the queue, writes the messages among them and flushes
+        the files, then answers the flush requests among them. A stop request closes the
+        current segment.
+
+        Args:
+            block (bool, optional): Whether to wait for the first item. Defaults to True.
+
+        Returns:
+            bool: True if a stop request was taken.
+        """
+        batch = []
+        try:
+            batch.append(self.__queue.get(block))
+            while len(batch) < self.MAX_BATCH and batch[-1] is not self._STOP:
+                batch.append(self.__queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        stopping = False
+        with self.__lock:
+            for item in batch:
+                if isinstance(item, tuple):
+                    try:
+                        self.__write(*item)
+                    except OSError as e:
+                        logging.error(f"Unable to write message to {self.__directory}: {e}")
+                elif item is self._STOP:
+                    stopping = True
+            try:
+                if stopping:
+                    self.__close_segment()
+                elif self.__file is not None:
+                    self.__file.flush()
+                    self.__index_file.flush()
+            except OSError as e:
+                logging.error(f"Unable to flush {self.__directory}: {e}")
+
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+        return stopping
+
+    def __write(self, day: date, email_address: str, subject: str, message: str) -> None:
+        """
+        Appends a message to the current segment and indexes it. Called with the lock held.
+
+        Args:
+            day (date): The date the message was sent.
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+        """
+        data = f"---\nTo: {email_address}\nSubject: {subject}\nMessage: {message}\n---\n".encode('utf-8')
+        match = CLIENT_NUMBER_PATTERN.match(message)
+        client_number = match.group(1) if match else ''
+
+        self.__open_segment(len(data), day)
+        self.__file.write(data)
+        self.__index.writerow([self.__size, len(data), client_number, email_address])
+        self.__size += len(data)
+
+    def find(self, email_address: str = None, client_number: int = None) -> list:
+        """
+        Returns the messages sent to an email address or a client, oldest first. Closed
+        segments are searched through their sorted index and only the index of the current
+        segment is read in full; each message is read by seeking to its offset.
+
+        Args:
+            email_address (str, optional): The email address.
+            client_number (int, optional): The client number.
+
+        Returns:
+            list of the messages, as written (str).
+
+        Raises:
+            ValueError: If neither an email address nor a client number is given.
+        """
+        if email_address is None and client_number is None:
+            raise ValueError("Give an email address or a client number.")
+        client_number = '' if client_number is None else str(client_number)
+        keys = []
+        if email_address is not None:
+            keys.append(_key('e', email_address))
+        if client_number:
+            keys.append(_key('c', client_number))
+        self.flush()
+        with self.__lock:
+            current = self.__segment
+
+        messages = []
+        for segment in self.segments():
+            try:
+                if segment == current:
+                    locations = self.__scan(segment, email_address, client_number)
+                else:
+                    if not os.path.exists(self.__path(segment, '.key')):
+                        # Segments closed by a store which stopped without closing them.
+                        self.__write_keys(segment)
+                    locations = self.__lookup(segment, keys)
+            except FileNotFoundError:
+                continue
+            if locations:
+                messages.extend(self.__read(segment, locations))
+        return messages
+
+    def __read(self, segment: str, locations: list) -> list:
+        """
+        Reads messages from a segment, which may be compressed.
+
+        Args:
+            segment (str): The segment name.
+            locations (list): (offset, length) pairs, in ascending order of offset.
+
+        Returns:
+            list of the messages (str).
+        """
+        path = self.__path(segment, '.txt')
+        opener = open
+        if not os.path.exists(path):
+            path = self.__path(segment, '.txt.gz')
+            opener = gzip.open
+        messages = []
+        with opener(path, 'rb') as file:
+            for offset, length in locations:
+                file.seek(offset)
+                messages.append(file.read(length).decode('utf-8'))
+        return messages
+
+    def compress(self, before: date = None) -> list:
+        """
+        Compresses closed segments with gzip. The indexes stay as they are, and compressed
+        segments can still be searched.
+
+        Args:
+            before (date, optional): Only segments started before this date. Defaults to every
+                segment from before today except the current one.
+
+        Returns:
+            list: The names of the segments compressed.
+        """
+        compressed = []
+        for segment in self.__closed_segments(before):
+            path = self.__path(segment, '.txt')
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as source, gzip.open(self.__path(segment, '.txt.gz'), 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(path)
+            compressed.append(segment)
+        return compressed
+
+    def archive(self, destination: str, before: date = None) -> list:
+        """
+        Moves closed segments, with their indexes, to another directory. A NotificationStore
+        opened on that directory with the same prefix can search them.
+
+        Args:
+            destination (str): The archive directory.
+            before (date, optional): Only segments started before this date. Defaults to every
+                segment from before today except the current one.
+
+        Returns:
+            list: The names of the segments archived.
+        """
+        os.makedirs(destination, exist_ok=True)
+        archived = []
+        for segment in self.__closed_segments(before):
+            for extension in ('.txt', '.txt.gz', '.idx', '.key'):
+                path = self.__path(segment, extension)
+                if os.path.exists(path):
+                    shutil.move(path, os.path.join(destination, segment + extension))
+            archived.append(segment)
+        return archived
+
+    def __closed_segments(self, before: date = None) -> list:
+        """
+        Returns the segments which are not being written to. Segments from today are never
+        included, even when closed, as the newest of them can be opened again by `send`.
+
+        Args:
+            before (date, optional): Only segments started before this date.
+
+        Returns:
+            list: The segment names, oldest first.
+        """
+        with self.__lock:
+            current = self.__segment
+            today = self.__today()
+        cutoff = min(before, today) if before is not None else today
+        cutoff = cutoff.strftime('%Y%m%d')
+        return [segment for segment in self.segments()
+                if segment != current and segment.rsplit('-', 2)[1] < cutoff]
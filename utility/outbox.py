@@ -0,0 +1,161 @@
+"""
+Description: Defines the Outbox class, which queues simulated email messages in memory and
+appends them to a file from a background thread, so that senders never wait on file I/O.
+Author: Jashanpreet Kaur Jattana
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+
+class Outbox:
+    """
+    Description:
+        The `Outbox` class accepts messages on an in-memory queue. A writer thread drains the
+        queue in batches into a single file handle that stays open, and flushes the file once
+        `max_batch` messages have been written or `flush_interval` seconds after the first
+        unflushed message, whichever comes first.
+
+    Attributes:
+        None
+    """
+    _STOP = object()
+
+    def __init__(self, path: str, max_batch: int = 100, flush_interval: float = 0.5) -> None:
+        """
+        Description:
+            Initializes the outbox and starts its writer thread. The file (and its directory)
+            is created when the first message is written. If no thread can be started (as
+            while the interpreter is exiting), messages are queued and written by close.
+
+        Args:
+            path (str): The path of the file messages are appended to.
+            max_batch (int): The number of unflushed messages which triggers a flush.
+            flush_interval (float): The maximum number of seconds a message stays unflushed.
+        """
+        self.__path = path
+        self.__max_batch = max_batch
+        self.__flush_interval = flush_interval
+        self.__queue = queue.Queue()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name="Outbox", daemon=True)
+        try:
+            self.__thread.start()
+        except RuntimeError:
+            self.__thread = None
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the file messages are appended to.
+
+        Returns:
+            str: The file path.
+        """
+        return self.__path
+
+    def send(self, email_address: str, subject: str, message: str) -> None:
+        """
+        Queues a message to be written. Returns immediately.
+
+        Args:
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+
+        Raises:
+            RuntimeError: If the outbox has been closed.
+        """
+        if self.__closed:
+            raise RuntimeError("Outbox is closed.")
+        self.__queue.put(f"---\nTo: {email_address}\nSubject: {subject}\nMessage: {message}\n---\n")
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every message queued before the call has been written and flushed.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the messages were flushed, False if the timeout expired.
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            return True
+        flushed = threading.Event()
+        self.__queue.put(flushed)
+        return flushed.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Writes and flushes any queued messages, closes the file and stops the writer thread.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put(self._STOP)
+        if self.__thread is None:
+            self.__run()
+        else:
+            self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        Writer thread: drains the queue into the file.
+        """
+        file = None
+        unflushed = 0
+        first_unflushed_time = None
+
+        while True:
+            timeout = None
+            if unflushed:
+                timeout = max(0, first_unflushed_time + self.__flush_interval - time.monotonic())
+
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                try:
+                    if file is None:
+                        file = self.__open()
+                    file.write(item)
+                    if not unflushed:
+                        first_unflushed_time = time.monotonic()
+                    unflushed += 1
+                except OSError as e:
+                    logging.error(f"Unable to write message to {self.__path}: {e}")
+
+                if unflushed < self.__max_batch:
+                    continue
+
+            # Flush on a full batch, an expired interval, a flush request or a stop request.
+            if file is not None and unflushed:
+                try:
+                    file.flush()
+                except OSError as e:
+                    logging.error(f"Unable to flush {self.__path}: {e}")
+            unflushed = 0
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                if file is not None:
+                    file.close()
+                return
+
+    def __open(self):
+        """
+        Opens the file for appending, creating its directory if needed.
+
+        Returns:
+            file: The open file.
+        """
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.__path, "a")
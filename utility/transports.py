@@ -0,0 +1,381 @@
+"""
+Description: Notification transports. A transport delivers email notifications; the
+FileTransport appends them to a text file through an Outbox, and the SmtpTransport sends
+them to a mail server over a small pool of persistent connections, so that a burst of alerts
+costs one connection (and TLS handshake) per pooled connection rather than one per message.
+Author: Jashanpreet Kaur Jattana
+"""
+
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+from utility.outbox import Outbox
+
+class Transport(ABC):
+    """
+    Description:
+        Abstract base class for notification transports. Sending returns as soon as the
+        message is accepted; flush waits for accepted messages to be delivered.
+
+    Attributes:
+        None
+    """
+
+    @abstractmethod
+    def send(self, email_address: str, subject: str, message: str) -> None:
+        """
+        Accepts a message for delivery.
+
+        Args:
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+        """
+        pass
+
+    def send_many(self, messages) -> int:
+        """
+        Accepts several messages for delivery.
+
+        Args:
+            messages (iterable): (email_address, subject, message) tuples.
+
+        Returns:
+            int: The number of messages accepted.
+        """
+        count = 0
+        for email_address, subject, message in messages:
+            self.send(email_address, subject, message)
+            count += 1
+        return count
+
+    @abstractmethod
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every message accepted before the call has been delivered.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the messages were delivered, False if the timeout expired.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Delivers any accepted messages and releases the transport's resources.
+        """
+        pass
+
+
+class FileTransport(Transport):
+    """
+    Description:
+        The `FileTransport` class appends messages to a text file in the simulated email
+        format, from the background thread of an Outbox.
+
+    Attributes:
+        None
+    """
+
+    def __init__(self, path: str, max_batch: int = 100, flush_interval: float = 0.5) -> None:
+        """
+        Description:
+            Initializes the transport.
+
+        Args:
+            path (str): The path of the file messages are appended to.
+            max_batch (int, optional): The number of unflushed messages which triggers a flush.
+            flush_interval (float, optional): The maximum number of seconds a message stays unflushed.
+        """
+        self.__outbox = Outbox(path, max_batch, flush_interval)
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the file messages are appended to.
+
+        Returns:
+            str: The file path.
+        """
+        return self.__outbox.path
+
+    def send(self, email_address: str, subject: str, message: str) -> None:
+        """
+        Queues a message to be appended to the file.
+
+        Args:
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+
+        Raises:
+            RuntimeError: If the transport has been closed.
+        """
+        self.__outbox.send(email_address, subject, message)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued message has been written and flushed.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the messages were flushed, False if the timeout expired.
+        """
+        return self.__outbox.flush(timeout)
+
+    def close(self) -> None:
+        """
+        Writes any queued messages and closes the file.
+        """
+        self.__outbox.close()
+
+
+class SmtpTransport(Transport):
+    """
+    Description:
+        The `SmtpTransport` class sends messages to an SMTP server. Messages are queued and sent
+        by `pool_size` worker threads, each of which keeps one connection open and sends up to
+        `batch_size` queued messages back to back over it. A connection which the server has
+        dropped is reopened and the message retried once; a message which still fails is logged
+        and counted as failed.
+
+    Attributes:
+        None
+    """
+    _STOP = object()
+
+    def __init__(self, host: str, port: int = 25, sender: str = "alerts@pixell-river.com", pool_size: int = 2,
+                 batch_size: int = 50, starttls: bool = False, username: str = None, password: str = None,
+                 timeout: float = 10.0, smtp_class=smtplib.SMTP) -> None:
+        """
+        Description:
+            Initializes the transport and starts its workers. Connections are opened when the
+            first message is sent.
+
+        Args:
+            host (str): The SMTP server host.
+            port (int, optional): The SMTP server port. Defaults to 25.
+            sender (str, optional): The From address of the messages.
+            pool_size (int, optional): The number of connections (and worker threads). Defaults to 2.
+            batch_size (int, optional): The most messages a worker takes from the queue at once. Defaults to 50.
+            starttls (bool, optional): Whether to upgrade connections with STARTTLS. Defaults to False.
+            username (str, optional): The user to log in as, if the server requires it.
+            password (str, optional): The password to log in with.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 10.
+            smtp_class (type, optional): The SMTP client class, e.g. smtplib.SMTP_SSL. Defaults to smtplib.SMTP.
+
+        Raises:
+            ValueError: If pool_size or batch_size is less than 1.
+        """
+        if pool_size < 1 or batch_size < 1:
+            raise ValueError("pool_size and batch_size must be at least 1.")
+        self.__host = host
+        self.__port = port
+        self.__sender = sender
+        self.__batch_size = batch_size
+        self.__starttls = starttls
+        self.__username = username
+        self.__password = password
+        self.__timeout = timeout
+        self.__smtp_class = smtp_class
+        self.__queue = queue.Queue()
+        self.__closed = False
+        # Counts of messages accepted but not yet sent or failed, and of outcomes.
+        self.__condition = threading.Condition()
+        self.__pending = 0
+        self.__sent = 0
+        self.__failed = 0
+        self.__connections = 0
+        self.__workers = [threading.Thread(target=self.__run, name=f"SmtpTransport-{number}", daemon=True)
+                          for number in range(pool_size)]
+        for worker in self.__workers:
+            worker.start()
+
+    @property
+    def sent_count(self) -> int:
+        """
+        Returns the number of messages sent.
+
+        Returns:
+            int: The number of messages.
+        """
+        with self.__condition:
+            return self.__sent
+
+    @property
+    def failed_count(self) -> int:
+        """
+        Returns the number of messages which could not be sent.
+
+        Returns:
+            int: The number of messages.
+        """
+        with self.__condition:
+            return self.__failed
+
+    @property
+    def connection_count(self) -> int:
+        """
+        Returns the number of connections opened so far.
+
+        Returns:
+            int: The number of connections.
+        """
+        with self.__condition:
+            return self.__connections
+
+    def send(self, email_address: str, subject: str, message: str) -> None:
+        """
+        Queues a message to be sent. Returns immediately.
+
+        Args:
+            email_address (str): The email address to which the message is sent.
+            subject (str): The subject line of the message.
+            message (str): The message body.
+
+        Raises:
+            RuntimeError: If the transport has been closed.
+        """
+        if self.__closed:
+            raise RuntimeError("Transport is closed.")
+        email = EmailMessage()
+        email['From'] = self.__sender
+        email['To'] = email_address
+        email['Subject'] = subject
+        email.set_content(message)
+        with self.__condition:
+            self.__pending += 1
+        self.__queue.put(email)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued message has been sent or has failed.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the queue was emptied, False if the timeout expired.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__pending == 0, timeout)
+
+    def close(self) -> None:
+        """
+        Sends any queued messages, closes the connections and stops the workers.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        for _ in self.__workers:
+            self.__queue.put(self._STOP)
+        for worker in self.__workers:
+            worker.join()
+
+    def __connect(self):
+        """
+        Opens a connection to the server, upgrading it to TLS and logging in if configured.
+
+        Returns:
+            smtplib.SMTP: The connection.
+        """
+        connection = self.__smtp_class(self.__host, self.__port, timeout=self.__timeout)
+        try:
+            if self.__starttls:
+                connection.starttls(context=ssl.create_default_context())
+            if self.__username:
+                connection.login(self.__username, self.__password)
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+            raise
+        with self.__condition:
+            self.__connections += 1
+        return connection
+
+    @staticmethod
+    def __disconnect(connection) -> None:
+        """
+        Closes a connection, politely if the server is still there.
+
+        Args:
+            connection (smtplib.SMTP): The connection.
+        """
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def __deliver(self, connection, email: EmailMessage):
+        """
+        Sends one message, reopening the connection and retrying once if the server dropped it.
+
+        Args:
+            connection (smtplib.SMTP): The open connection, or None.
+            email (EmailMessage): The message.
+
+        Returns:
+            smtplib.SMTP: The connection to use for the next message, or None.
+        """
+        for attempt in range(2):
+            try:
+                if connection is None:
+                    connection = self.__connect()
+                connection.send_message(email)
+                with self.__condition:
+                    self.__sent += 1
+                return connection
+            except smtplib.SMTPException as e:
+                error = e
+                if not isinstance(e, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+                    # The server refused this message; the connection is still usable.
+                    break
+                if connection is not None:
+                    connection.close()
+                connection = None
+            except OSError as e:
+                error = e
+                if connection is not None:
+                    connection.close()
+                connection = None
+
+        logging.error(f"Unable to send message to {email['To']} via {self.__host}:{self.__port}: {error}")
+        with self.__condition:
+            self.__failed += 1
+        return connection
+
+    def __run(self) -> None:
+        """
+        Worker thread: sends batches of queued messages over one persistent connection.
+        """
+        connection = None
+        stopping = False
+
+        while not stopping:
+            batch = [self.__queue.get()]
+            # Each worker takes exactly one stop request, so that every worker receives one.
+            while batch[-1] is not self._STOP and len(batch) < self.__batch_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for email in batch:
+                if email is self._STOP:
+                    stopping = True
+                    continue
+                connection = self.__deliver(connection, email)
+                with self.__condition:
+                    self.__pending -= 1
+                    self.__condition.notify_all()
+
+        if connection is not None:
+            self.__disconnect(connection)